@@ -0,0 +1,22 @@
+from .controller import AdmissionController, Overloaded
+from .rate_limit import (
+    RATE_LIMIT_BACKENDS,
+    MemoryBucketStore,
+    RateLimiter,
+    RedisBucketStore,
+    SQLiteBucketStore,
+    create_rate_limiter,
+    retry_after_header
+)
+
+__all__ = [
+    'AdmissionController',
+    'Overloaded',
+    'RATE_LIMIT_BACKENDS',
+    'MemoryBucketStore',
+    'RateLimiter',
+    'RedisBucketStore',
+    'SQLiteBucketStore',
+    'create_rate_limiter',
+    'retry_after_header'
+]
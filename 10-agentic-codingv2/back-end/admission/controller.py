@@ -0,0 +1,145 @@
+"""Concurrency-based admission control with a bounded wait queue."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """The worker is saturated; the request should be retried after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bound the expected cost of the work running in this worker.
+
+    Work holds a share of ``capacity`` equal to its expected cost while it
+    runs. Work that does not fit waits in a FIFO queue (so heavy requests
+    are not starved by light ones) for at most ``max_wait`` seconds; when
+    ``max_queue`` requests are already waiting, new ones are rejected at
+    once. Rejecting early keeps the latency of admitted requests bounded
+    instead of letting the queue, and every request's wait, grow without
+    limit under overload.
+
+    Args:
+        capacity: Total cost of the work that may run at once
+        max_queue: Requests that may wait for capacity (0 rejects whenever full)
+        max_wait: Longest wait for capacity in seconds (0 waits indefinitely)
+    """
+
+    def __init__(self, capacity: float, max_queue: int, max_wait: float):
+        self.capacity = max(1.0, capacity)
+        self.max_queue = max(0, max_queue)
+        self.max_wait = max_wait
+        self.in_use = 0.0
+        self._waiters: Deque[List[Any]] = deque()
+        # Moving average of how long admitted work holds its share
+        self._hold_seconds = 1.0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def queued(self) -> int:
+        """Requests waiting for capacity."""
+        return len(self._waiters)
+
+    def retry_after(self) -> float:
+        """Estimate the seconds until a new request would be admitted."""
+        return self._hold_seconds * (len(self._waiters) + 1) / self.capacity
+
+    def check(self) -> None:
+        """
+        Reject a request up front if it could not even join the queue.
+
+        Raises:
+            Overloaded: If the worker is at capacity and the queue is full
+        """
+        if self.in_use >= self.capacity and len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded("Server is at capacity", self.retry_after())
+
+    async def acquire(self, cost: float = 1.0) -> float:
+        """
+        Wait for ``cost`` of the capacity.
+
+        Args:
+            cost: Expected cost of the work (capped at the capacity)
+
+        Returns:
+            The cost held, to pass to ``release``
+
+        Raises:
+            Overloaded: If the queue is full or the wait exceeds ``max_wait``
+        """
+        cost = min(cost, self.capacity)
+        if not self._waiters and self.in_use + cost <= self.capacity:
+            self.in_use += cost
+            self.admitted += 1
+            return cost
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded("Server is at capacity and its queue is full", self.retry_after())
+
+        waiter = [cost, asyncio.get_running_loop().create_future()]
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter[1], self.max_wait or None)
+        except BaseException as e:
+            if waiter[1].done() and not waiter[1].cancelled():
+                # Admitted just as the wait ended
+                self.release(cost)
+            else:
+                self._waiters.remove(waiter)
+                self._wake()
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise Overloaded(f"No capacity within {self.max_wait:g}s", self.retry_after()) from None
+            raise
+        self.admitted += 1
+        return cost
+
+    def release(self, cost: float) -> None:
+        """Return ``cost`` of the capacity and admit waiting requests that now fit."""
+        self.in_use = max(0.0, self.in_use - cost)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_use + self._waiters[0][0] <= self.capacity:
+            cost, future = self._waiters.popleft()
+            if future.done():
+                continue
+            self.in_use += cost
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, cost: float = 1.0) -> AsyncIterator[None]:
+        """Hold ``cost`` of the capacity for the duration of the block."""
+        held = await self.acquire(cost)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._hold_seconds += 0.1 * (time.perf_counter() - start - self._hold_seconds)
+            self.release(held)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the load and the admission counters."""
+        return {
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "utilization": self.in_use / self.capacity,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out
+        }
@@ -0,0 +1,260 @@
+"""Token-bucket rate limiting with in-process and shared bucket stores."""
+
+import asyncio
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from cache.lru import TTLCache
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_BACKENDS = ("memory", "sqlite", "redis")
+
+
+def _refill(tokens: float, updated: float, now: float, rate: float, capacity: float) -> float:
+    """Return the tokens of a bucket last updated at ``updated``, refilled up to ``now``."""
+    return min(capacity, tokens + max(0.0, now - updated) * rate)
+
+
+def _take(tokens: float, cost: float, rate: float) -> Tuple[float, float]:
+    """
+    Take ``cost`` tokens from a refilled bucket.
+
+    Returns:
+        ``(tokens left, retry_after)``; ``retry_after`` is 0 when the tokens
+        were taken, else the seconds until the bucket holds ``cost`` tokens
+    """
+    if tokens >= cost:
+        return tokens - cost, 0.0
+    return tokens, (cost - tokens) / rate
+
+
+class MemoryBucketStore:
+    """
+    Buckets held in this process.
+
+    Limits apply per worker. Idle buckets are dropped once they would have
+    refilled completely, since a new bucket is full anyway.
+
+    Args:
+        max_keys: Most clients tracked at once (least recently seen dropped first)
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self._buckets: TTLCache[Tuple[float, float]] = TTLCache(max_keys)
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, cost: float, rate: float, capacity: float) -> float:
+        """Take ``cost`` tokens from the bucket ``key``; returns the retry-after seconds (0 if taken)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.peek(key, (capacity, now))
+            tokens, retry_after = _take(_refill(tokens, updated, now, rate, capacity), cost, rate)
+            self._buckets.set(key, (tokens, now), ttl=(capacity - tokens) / rate + 1)
+        return retry_after
+
+    async def close(self) -> None:
+        """Nothing to release."""
+
+
+class SQLiteBucketStore:
+    """
+    Buckets in a SQLite database shared by all workers on the same host.
+
+    Every update runs in an immediate transaction, so concurrent workers
+    never both spend the same tokens. It also stands in for the Redis store
+    in tests and single-host deployments.
+
+    Args:
+        path: Path of the SQLite database file
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+        self._writes = 0
+
+    def _take(self, key: str, cost: float, rate: float, capacity: float) -> float:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT tokens, updated FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+                tokens = capacity if row is None else _refill(row[0], row[1], now, rate, capacity)
+                tokens, retry_after = _take(tokens, cost, rate)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                    (key, tokens, now)
+                )
+                self._writes += 1
+                if self._writes % 1000 == 0:
+                    # Buckets idle long enough to be full again
+                    self._conn.execute("DELETE FROM rate_buckets WHERE updated < ?", (now - capacity / rate,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return retry_after
+
+    async def take(self, key: str, cost: float, rate: float, capacity: float) -> float:
+        """Take ``cost`` tokens from the bucket ``key``; returns the retry-after seconds (0 if taken)."""
+        return await asyncio.to_thread(self._take, key, cost, rate, capacity)
+
+    async def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# Refill and take atomically on the Redis server, using its clock
+_REDIS_TAKE = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local cost, rate, capacity = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = capacity
+if bucket[1] then
+    tokens = math.min(capacity, tonumber(bucket[1]) + math.max(0, now - tonumber(bucket[2])) * rate)
+end
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class RedisBucketStore:
+    """
+    Buckets in Redis, shared by every worker of every pod.
+
+    Refill and take run as one Lua script on the server, so they are atomic
+    across clients and use a single clock. Requires the ``redis`` package.
+
+    Args:
+        url: Redis URL, e.g. ``redis://localhost:6379/0``
+        prefix: Prefix of the bucket keys
+    """
+
+    def __init__(self, url: str, prefix: str = "agentic_rag:rate:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires redis (pip install redis)") from e
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(_REDIS_TAKE)
+
+    async def take(self, key: str, cost: float, rate: float, capacity: float) -> float:
+        """Take ``cost`` tokens from the bucket ``key``; returns the retry-after seconds (0 if taken)."""
+        return float(await self._script(keys=[self.prefix + key], args=[cost, rate, capacity]))
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self._client.aclose()
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limit per client.
+
+    Each client's bucket holds up to ``capacity`` tokens (the allowed burst)
+    and refills at ``rate`` tokens per second. A request spends tokens equal
+    to its expected cost, so expensive requests use up a client's allowance
+    faster. If the store fails, requests are let through: the admission
+    controller still protects the worker.
+
+    Args:
+        store: Where buckets are kept (``MemoryBucketStore``, ``SQLiteBucketStore``
+            or ``RedisBucketStore``)
+        rate: Tokens added per second
+        capacity: Bucket size
+    """
+
+    def __init__(self, store, rate: float, capacity: float):
+        self.store = store
+        self.rate = rate
+        self.capacity = capacity
+        self.allowed = 0
+        self.limited = 0
+        self.errors = 0
+
+    async def acquire(self, key: str, cost: float = 1.0) -> float:
+        """
+        Spend ``cost`` tokens of client ``key``.
+
+        Args:
+            key: Client identifier
+            cost: Tokens to spend (capped at the bucket size, so any request can pass eventually)
+
+        Returns:
+            0 if the request may proceed, else seconds until it could
+        """
+        try:
+            retry_after = await self.store.take(key, min(cost, self.capacity), self.rate, self.capacity)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Rate limit store failed; allowing the request: {e!r}")
+            return 0.0
+        if retry_after > 0:
+            self.limited += 1
+            return retry_after
+        self.allowed += 1
+        return 0.0
+
+    async def close(self) -> None:
+        """Release the store's connections."""
+        await self.store.close()
+
+    def stats(self) -> dict:
+        """Return request counters."""
+        return {"allowed": self.allowed, "limited": self.limited, "store_errors": self.errors}
+
+
+def retry_after_header(seconds: float) -> str:
+    """Format a delay for the ``Retry-After`` header (whole seconds, at least 1)."""
+    return str(max(1, math.ceil(seconds)))
+
+
+def create_rate_limiter(backend: Optional[str] = None) -> RateLimiter:
+    """
+    Create the rate limiter configured in settings.
+
+    RATE_LIMIT_REQUESTS default-cost requests are allowed per RATE_LIMIT_PERIOD
+    seconds, in bursts of up to RATE_LIMIT_REQUESTS.
+
+    Args:
+        backend: One of ``RATE_LIMIT_BACKENDS`` (defaults to RATE_LIMIT_BACKEND)
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = backend or settings.RATE_LIMIT_BACKEND
+    if backend == "memory":
+        store = MemoryBucketStore()
+    elif backend == "sqlite":
+        store = SQLiteBucketStore(settings.RATE_LIMIT_SQLITE_PATH)
+    elif backend == "redis":
+        store = RedisBucketStore(settings.RATE_LIMIT_REDIS_URL)
+    else:
+        raise ValueError(f"Unknown rate limit backend {backend!r}; expected one of {', '.join(RATE_LIMIT_BACKENDS)}")
+    capacity = float(settings.RATE_LIMIT_REQUESTS)
+    return RateLimiter(store, rate=capacity / settings.RATE_LIMIT_PERIOD, capacity=capacity)
@@ -1,3 +1,23 @@
 from .agentic_rag import create_agent
+from .context import count_tokens, create_context_packer, load_tokenizer, pack_tool_messages
+from .memory import create_history_compactor, open_checkpointer, trim_history
+from .runner import build_agent_input, build_run_config, extract_answer, extract_tools_used
+from .streaming import astream_agent_events
+from .session import AgentSession
 
-__all__ = ['create_agent']
+__all__ = [
+    'create_agent',
+    'count_tokens',
+    'create_context_packer',
+    'load_tokenizer',
+    'pack_tool_messages',
+    'create_history_compactor',
+    'open_checkpointer',
+    'trim_history',
+    'build_agent_input',
+    'build_run_config',
+    'extract_answer',
+    'extract_tools_used',
+    'astream_agent_events',
+    'AgentSession'
+]
@@ -1,50 +1,87 @@
 """Agentic RAG agent implementation."""
 
-from langchain_openai import ChatOpenAI
+from typing import Optional, Sequence
+
+from langchain.chat_models import init_chat_model
+from langchain_core.tools import BaseTool
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.prebuilt import create_react_agent
 from config.settings import settings
-from tools import (
-    create_google_search_tool,
-    create_wikipedia_tool,
-    create_arxiv_tool,
-    create_retriever_tool
-)
+from tools import create_tool_registry, tool_timeouts
+from .context import create_context_packer
+from .memory import create_history_compactor
+from .runner import LLM_CONFIG_PREFIX
+from .tool_execution import create_tool_node
 
 
-def create_agent():
+def create_agent(
+    tools: Optional[Sequence[BaseTool]] = None,
+    checkpointer: Optional[BaseCheckpointSaver] = None
+):
     """
     Create and configure the Agentic RAG agent.
-    
-    This function initializes the LLM, creates all necessary tools,
-    and returns a configured React agent.
-    
+
+    This function initializes the LLM and returns a configured React agent
+    over the given tools. When no tools are passed, a fresh tool registry
+    is built; callers that already hold a registry should pass its tools
+    so the retriever index is not built twice. Tool calls of one model turn
+    run concurrently, each bounded by its configured timeout. The model,
+    temperature and max_tokens can be overridden per run through the run
+    config (see ``agents.runner.build_run_config``).
+
+    With a checkpointer, every run must name a conversation ``thread_id``;
+    the thread's earlier turns are loaded from the checkpointer and the
+    history sent to the LLM is compacted to HISTORY_MAX_TOKENS. The tool
+    results of the current turn are packed into TOOL_CONTEXT_MAX_TOKENS.
+
+    Args:
+        tools: Tools the agent may call (defaults to a new tool registry)
+        checkpointer: Store of conversation threads (None for a stateless agent)
+
     Returns:
         Configured React agent executor
     """
     # Validate settings
     settings.validate()
-    
-    # Initialize the LLM
-    llm = ChatOpenAI(
-        model=settings.OPENAI_MODEL,
+
+    # Initialize the LLM; these fields are configurable per run
+    llm = init_chat_model(
+        settings.OPENAI_MODEL,
+        model_provider="openai",
         max_tokens=settings.OPENAI_MAX_TOKENS,
         temperature=settings.OPENAI_TEMPERATURE,
-        openai_api_key=settings.OPENAI_API_KEY
+        openai_api_key=settings.OPENAI_API_KEY,
+        stream_usage=True,
+        configurable_fields=("model", "temperature", "max_tokens"),
+        config_prefix=LLM_CONFIG_PREFIX
     )
-    
+
     # Create all tools
-    google_search = create_google_search_tool()
-    wikipedia = create_wikipedia_tool()
-    arxiv = create_arxiv_tool()
-    retriever = create_retriever_tool()
-    
-    # Combine all tools
-    tools = [arxiv, google_search, wikipedia, retriever]
-    
+    if tools is None:
+        tools = create_tool_registry().tools
+
+    # Threads carry their history across runs, so bound what each LLM call sees
+    history = None
+    if checkpointer is not None:
+        history = create_history_compactor(
+            settings.HISTORY_MAX_TOKENS,
+            strategy=settings.HISTORY_COMPACTION,
+            llm=llm
+        )
+    pre_model_hook = history
+    if settings.TOOL_CONTEXT_MAX_TOKENS > 0:
+        pre_model_hook = create_context_packer(settings.TOOL_CONTEXT_MAX_TOKENS, history=history)
+
     # Create the React agent
     agent_executor = create_react_agent(
         llm,
-        tools=tools
+        tools=create_tool_node(
+            tools,
+            timeouts=tool_timeouts(),
+            default_timeout=settings.TOOL_TIMEOUT_DEFAULT
+        ),
+        pre_model_hook=pre_model_hook,
+        checkpointer=checkpointer
     )
-    
+
     return agent_executor
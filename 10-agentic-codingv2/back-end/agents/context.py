@@ -0,0 +1,178 @@
+"""Token-budget packing of tool observations into the model's prompt."""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import tiktoken
+from langchain_core.messages import BaseMessage, ToolMessage
+from langchain_core.runnables import Runnable, RunnableLambda
+from .runner import current_turn_start
+
+logger = logging.getLogger(__name__)
+
+# Separator between the documents of a retriever tool's output
+DOCUMENT_SEPARATOR = "\n\n"
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def load_tokenizer() -> bool:
+    """
+    Load the tokenizer ``count_tokens`` uses, once per process.
+
+    The tokenizer files are downloaded on first use, so the API calls this
+    at startup (in a worker thread) rather than from a request's pre-model
+    hook on the event loop.
+
+    Returns:
+        True if the tokenizer is available, False if token counts are estimated
+    """
+    global _encoding, _encoding_loaded
+    with _encoding_lock:
+        if not _encoding_loaded:
+            try:
+                _encoding = tiktoken.get_encoding("o200k_base")
+            except Exception as e:
+                logger.warning(f"Tokenizer unavailable ({e!r}); estimating tokens from text length")
+            _encoding_loaded = True
+    return _encoding is not None
+
+
+def count_tokens(text: str) -> int:
+    """Count a text's tokens, estimating from its length if no tokenizer is available."""
+    if not _encoding_loaded:
+        load_tokenizer()
+    if _encoding is None:
+        return len(text) // 4 + 1
+    return len(_encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut a text to at most ``max_tokens``, keeping its beginning.
+
+    Tool outputs put their most relevant content first (retriever chunks are
+    ranked, search results are in result order), so whole paragraphs are
+    kept from the start while they fit and the cut is marked.
+
+    Args:
+        text: Text to cut
+        max_tokens: Token budget
+
+    Returns:
+        The text, or its beginning followed by a truncation marker
+    """
+    total = count_tokens(text)
+    if total <= max_tokens:
+        return text
+
+    marker = f"\n[... {{}} more tokens omitted]"
+    budget = max(0, max_tokens - count_tokens(marker.format(total)))
+    kept: List[str] = []
+    used = 0
+    for paragraph in text.split(DOCUMENT_SEPARATOR):
+        cost = count_tokens(paragraph + DOCUMENT_SEPARATOR)
+        if used + cost > budget:
+            if not kept:
+                # A single oversized paragraph: cut it by characters in proportion
+                kept.append(paragraph[:int(len(paragraph) * budget / cost)])
+                used = budget
+            break
+        kept.append(paragraph)
+        used += cost
+    return DOCUMENT_SEPARATOR.join(kept) + marker.format(max(0, total - used))
+
+
+def allocate(sizes: List[int], budget: int) -> List[int]:
+    """
+    Split a token budget between observations of the given sizes.
+
+    Observations smaller than an equal share keep all their tokens and the
+    unused share goes to the larger ones, so a short error message never
+    costs a long search result its context.
+
+    Args:
+        sizes: Token count of every observation
+        budget: Tokens available for all of them
+
+    Returns:
+        Tokens allowed per observation, in order
+    """
+    allowed = [0] * len(sizes)
+    pending = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    remaining = budget
+    while pending:
+        share = remaining // len(pending)
+        index = pending[0]
+        if sizes[index] > share:
+            for index in pending:
+                allowed[index] = share
+            break
+        allowed[index] = sizes[index]
+        remaining -= sizes[index]
+        pending.pop(0)
+    return allowed
+
+
+def pack_tool_messages(messages: List[BaseMessage], max_tokens: int) -> List[BaseMessage]:
+    """
+    Fit the tool observations of the current turn into ``max_tokens``.
+
+    Every tool result since the latest question is sent with each LLM call
+    of the turn, so they share one budget (see ``allocate``); results over
+    their share are cut from the end (see ``truncate_to_tokens``). Earlier
+    turns and all other messages are passed through, and the stored
+    messages are never changed.
+
+    Args:
+        messages: Messages about to be sent to the LLM
+        max_tokens: Token budget of the current turn's tool results
+
+    Returns:
+        The messages with oversized tool results replaced by packed copies
+    """
+    start = current_turn_start(messages)
+    positions = [
+        i for i in range(start, len(messages))
+        if isinstance(messages[i], ToolMessage) and isinstance(messages[i].content, str)
+    ]
+    sizes = [count_tokens(messages[i].content) for i in positions]
+    if sum(sizes) <= max_tokens:
+        return messages
+
+    packed = list(messages)
+    for i, size, allowed in zip(positions, sizes, allocate(sizes, max_tokens)):
+        if size > allowed:
+            packed[i] = messages[i].model_copy(update={"content": truncate_to_tokens(messages[i].content, allowed)})
+    logger.info(f"Packed {len(positions)} tool results from {sum(sizes)} to at most {max_tokens} tokens")
+    return packed
+
+
+def create_context_packer(max_tokens: int, history: Optional[Runnable] = None) -> Runnable:
+    """
+    Create the agent's pre-model hook that bounds the prompt of every LLM call.
+
+    Args:
+        max_tokens: Token budget of the current turn's tool results (0 disables packing)
+        history: Optional history compactor (``create_history_compactor``) run first
+
+    Returns:
+        Runnable for ``create_react_agent(pre_model_hook=...)``
+    """
+    def pack(update: Dict[str, Any]) -> Dict[str, Any]:
+        if max_tokens > 0:
+            update["llm_input_messages"] = pack_tool_messages(update["llm_input_messages"], max_tokens)
+        return update
+
+    def prepare(state: Dict[str, Any]) -> Dict[str, Any]:
+        update = history.invoke(state) if history is not None else {"llm_input_messages": state["messages"]}
+        return pack(update)
+
+    async def aprepare(state: Dict[str, Any]) -> Dict[str, Any]:
+        update = await history.ainvoke(state) if history is not None else {"llm_input_messages": state["messages"]}
+        return pack(update)
+
+    return RunnableLambda(prepare, afunc=aprepare, name="prepare_context")
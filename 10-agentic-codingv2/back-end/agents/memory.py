@@ -0,0 +1,237 @@
+"""Conversation threads: checkpointers and history compaction."""
+
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, RemoveMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from langgraph.checkpoint.base import BaseCheckpointSaver, CheckpointTuple
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+from cache.lru import TTLCache
+from config.settings import settings
+from .runner import current_turn_start
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINTER_BACKENDS = ("none", "memory", "sqlite")
+COMPACTION_STRATEGIES = ("trim", "summarize")
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+SUMMARY_PROMPT = (
+    "Summarize the conversation below for an assistant that will continue it. "
+    "Keep the user's goals, facts and names established so far, answers already given "
+    "and the sources they came from. Be concise; omit pleasantries.\n\n{conversation}"
+)
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """
+    In-process checkpointer that keeps only the most recently used threads.
+
+    Clients may start a new thread with every request and ``InMemorySaver``
+    never forgets one, so without a bound a long-running worker's memory
+    grows with its traffic. Beyond ``max_threads``, the thread used least
+    recently is deleted with all its checkpoints.
+
+    Args:
+        max_threads: Threads kept
+    """
+
+    def __init__(self, max_threads: int):
+        super().__init__()
+        self._threads: TTLCache[bool] = TTLCache(max_threads, on_evict=lambda thread_id, _: self.delete_thread(thread_id))
+
+    def _touch(self, config: RunnableConfig) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        # set() would replace, and so delete, a thread already tracked
+        if self._threads.get(thread_id) is None:
+            self._threads.set(thread_id, True)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Return a checkpoint tuple, marking its thread recently used."""
+        self._threads.get(config["configurable"]["thread_id"])
+        return super().get_tuple(config)
+
+    def put(self, config: RunnableConfig, *args: Any, **kwargs: Any) -> RunnableConfig:
+        """Store a checkpoint, deleting the least recently used thread if over the limit."""
+        self._touch(config)
+        return super().put(config, *args, **kwargs)
+
+    @property
+    def evictions(self) -> int:
+        """Threads deleted to stay within the limit."""
+        return self._threads.evictions
+
+
+@asynccontextmanager
+async def open_checkpointer(
+    backend: Optional[str] = None,
+    path: Optional[str] = None
+) -> AsyncIterator[Optional[BaseCheckpointSaver]]:
+    """
+    Open the checkpointer that stores conversation threads.
+
+    ``memory`` keeps the CHECKPOINTER_MAX_THREADS most recently used
+    threads in this process until it exits (per worker, so it is meant for
+    development and single-worker use); ``sqlite`` keeps them in a database
+    file that survives restarts and is shared by the workers on a host (it
+    needs the ``langgraph-checkpoint-sqlite`` package and async agent runs).
+
+    Args:
+        backend: One of ``CHECKPOINTER_BACKENDS`` (defaults to CHECKPOINTER)
+        path: SQLite database file (defaults to CHECKPOINT_SQLITE_PATH)
+
+    Yields:
+        The checkpointer, or None when threads are disabled
+    """
+    backend = backend or settings.CHECKPOINTER
+    if backend == "none":
+        yield None
+    elif backend == "memory":
+        yield BoundedMemorySaver(settings.CHECKPOINTER_MAX_THREADS)
+    elif backend == "sqlite":
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        path = path or settings.CHECKPOINT_SQLITE_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        async with AsyncSqliteSaver.from_conn_string(path) as saver:
+            await saver.setup()
+            logger.info(f"Conversation threads stored in {path}")
+            yield saver
+    else:
+        raise ValueError(f"Unknown checkpointer {backend!r}; expected one of {', '.join(CHECKPOINTER_BACKENDS)}")
+
+
+def _turn_starts(messages: List[BaseMessage]) -> List[int]:
+    return [index for index, message in enumerate(messages) if isinstance(message, HumanMessage)]
+
+
+def trim_history(messages: List[BaseMessage], max_tokens: int) -> List[BaseMessage]:
+    """
+    Drop the oldest whole turns until the messages fit in ``max_tokens``.
+
+    The current turn (the latest question and the tool calls made for it)
+    is always kept, and turns are never split, so every tool result stays
+    next to the call that requested it. A leading conversation summary is
+    kept while it fits.
+
+    Args:
+        messages: Conversation history, oldest first
+        max_tokens: Token budget (approximate count)
+
+    Returns:
+        The newest messages that fit
+    """
+    if count_tokens_approximately(messages) <= max_tokens:
+        return messages
+
+    current = current_turn_start(messages)
+    kept = messages[current:]
+    budget = max_tokens - count_tokens_approximately(kept)
+
+    starts = [start for start in _turn_starts(messages) if start < current]
+    ends = starts[1:] + [current]
+    for start, end in reversed(list(zip(starts, ends))):
+        turn = messages[start:end]
+        cost = count_tokens_approximately(turn)
+        if cost > budget:
+            break
+        kept = turn + kept
+        budget -= cost
+
+    head = messages[:starts[0]] if starts else messages[:current]
+    if head and count_tokens_approximately(head) <= budget:
+        kept = head + kept
+    return kept
+
+
+def _render(messages: List[BaseMessage]) -> str:
+    lines = []
+    for message in messages:
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        if content:
+            lines.append(f"{message.type}: {content}")
+    return "\n".join(lines)
+
+
+def create_history_compactor(
+    max_tokens: int,
+    strategy: str = "trim",
+    llm: Optional[BaseChatModel] = None
+) -> Runnable:
+    """
+    Create the agent's pre-model hook that bounds the prompt of every LLM call.
+
+    While the conversation fits in ``max_tokens`` it is sent unchanged.
+    Beyond that, ``trim`` sends only the newest whole turns that fit (the
+    stored thread keeps the full history), and ``summarize`` replaces every
+    turn before the current one with an LLM-written summary, rewriting the
+    stored thread so the summary is computed once. If summarizing fails,
+    the history is trimmed instead. The current turn is never compacted.
+
+    Args:
+        max_tokens: Prompt token budget of the conversation history
+        strategy: One of ``COMPACTION_STRATEGIES``
+        llm: Model writing summaries (required for ``summarize``)
+
+    Returns:
+        Runnable for ``create_react_agent(pre_model_hook=...)``
+    """
+    if strategy not in COMPACTION_STRATEGIES:
+        raise ValueError(f"Unknown history compaction {strategy!r}; expected one of {', '.join(COMPACTION_STRATEGIES)}")
+    if strategy == "summarize" and llm is None:
+        raise ValueError("Summarizing the history requires an llm")
+
+    def older_turns(messages: List[BaseMessage]) -> Optional[int]:
+        """Return where the current turn starts if the history must be compacted."""
+        current = current_turn_start(messages)
+        # Only earlier turns are compacted, not a summary on its own
+        if not _turn_starts(messages[:current]) or count_tokens_approximately(messages) <= max_tokens:
+            return None
+        return current
+
+    def summarized(messages: List[BaseMessage], current: int, summary: Any) -> Dict[str, Any]:
+        text = summary.content if isinstance(summary.content, str) else str(summary.content)
+        compacted = [SystemMessage(content=SUMMARY_PREFIX + text), *messages[current:]]
+        logger.info(
+            f"Summarized {current} earlier messages: {count_tokens_approximately(messages)} -> "
+            f"{count_tokens_approximately(compacted)} tokens"
+        )
+        return {
+            "messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *compacted],
+            "llm_input_messages": compacted
+        }
+
+    def compact(state: Dict[str, Any]) -> Dict[str, Any]:
+        messages = state["messages"]
+        current = older_turns(messages)
+        if current is None:
+            return {"llm_input_messages": messages}
+        if strategy == "summarize":
+            try:
+                summary = llm.invoke(SUMMARY_PROMPT.format(conversation=_render(messages[:current])))
+                return summarized(messages, current, summary)
+            except Exception as e:
+                logger.warning(f"Summarizing the conversation failed ({e!r}); trimming it instead")
+        return {"llm_input_messages": trim_history(messages, max_tokens)}
+
+    async def acompact(state: Dict[str, Any]) -> Dict[str, Any]:
+        messages = state["messages"]
+        current = older_turns(messages)
+        if current is None:
+            return {"llm_input_messages": messages}
+        if strategy == "summarize":
+            try:
+                summary = await llm.ainvoke(SUMMARY_PROMPT.format(conversation=_render(messages[:current])))
+                return summarized(messages, current, summary)
+            except Exception as e:
+                logger.warning(f"Summarizing the conversation failed ({e!r}); trimming it instead")
+        return {"llm_input_messages": trim_history(messages, max_tokens)}
+
+    return RunnableLambda(compact, afunc=acompact, name="compact_history")
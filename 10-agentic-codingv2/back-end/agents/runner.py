@@ -0,0 +1,115 @@
+"""Helpers for invoking the agent and reading its results."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from config.settings import settings
+
+# Prefix of the LLM's configurable fields in a run config (e.g. "llm_max_tokens")
+LLM_CONFIG_PREFIX = "llm"
+
+
+def build_agent_input(question: str) -> Dict[str, Any]:
+    """
+    Build the agent input for a single question.
+
+    Args:
+        question: The question to ask the agent
+
+    Returns:
+        Agent input state with the question as a human message
+    """
+    return {"messages": [HumanMessage(content=question)]}
+
+
+def build_run_config(
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    thread_id: Optional[str] = None
+) -> RunnableConfig:
+    """
+    Build the runnable config for one agent run.
+
+    ``max_concurrency`` caps how many of the run's graph tasks, i.e. the
+    tool calls of a single model turn, execute at the same time. Model
+    parameters that are given override the agent's defaults for this run
+    only; the shared agent is not rebuilt.
+
+    Args:
+        model: Model to answer with (must be allowed by settings)
+        temperature: Sampling temperature
+        max_tokens: Cap on tokens generated per LLM call
+        thread_id: Conversation to continue (requires an agent with a checkpointer)
+
+    Returns:
+        Config to pass to ``invoke``/``ainvoke``/``astream_events``
+    """
+    config: RunnableConfig = {"max_concurrency": settings.TOOL_MAX_PARALLEL_CALLS}
+    overrides = {"model": model, "temperature": temperature, "max_tokens": max_tokens}
+    configurable = {
+        f"{LLM_CONFIG_PREFIX}_{name}": value
+        for name, value in overrides.items()
+        if value is not None
+    }
+    if thread_id is not None:
+        configurable["thread_id"] = thread_id
+    if configurable:
+        config["configurable"] = configurable
+    return config
+
+
+def current_turn_start(messages: List[BaseMessage]) -> int:
+    """Return the index of the last human message, where the current turn starts (0 if none)."""
+    for index in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[index], HumanMessage):
+            return index
+    return 0
+
+
+def extract_tools_used(messages: List[Any]) -> List[str]:
+    """
+    Collect the names of the tools the agent called, in first-use order.
+
+    Args:
+        messages: Messages produced by the agent run
+
+    Returns:
+        Unique tool names
+    """
+    tools_used = []
+    for msg in messages:
+        if hasattr(msg, "tool_calls") and msg.tool_calls:
+            for tool_call in msg.tool_calls:
+                tool_name = tool_call.get("name", "unknown")
+                if tool_name not in tools_used:
+                    tools_used.append(tool_name)
+    return tools_used
+
+
+def extract_answer(result: Any) -> Tuple[str, List[str]]:
+    """
+    Extract the final answer and the tools used from an agent result.
+
+    In a conversation thread the result holds the whole history; only the
+    tools called since the latest question are reported.
+
+    Args:
+        result: Final state returned by ``agent.invoke``/``agent.ainvoke``
+
+    Returns:
+        Tuple of (answer, tools_used)
+    """
+    if not isinstance(result, dict) or "messages" not in result:
+        # Fallback: convert entire result to string
+        return str(result), []
+
+    messages = result["messages"]
+    answer = ""
+    if messages:
+        # The last message should be the final answer
+        last_message = messages[-1]
+        answer = getattr(last_message, "content", str(last_message))
+
+    return answer, extract_tools_used(messages[current_turn_start(messages):])
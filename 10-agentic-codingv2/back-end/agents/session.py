@@ -0,0 +1,150 @@
+"""Reusable agent session for scripts and batch jobs."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence
+
+from langchain_core.tools import BaseTool
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from config.settings import settings
+from .agentic_rag import create_agent
+from .runner import build_agent_input, build_run_config
+
+
+class AgentSession:
+    """
+    An agent built once and reused for every question.
+
+    Building the agent validates settings, creates the LLM client and loads
+    (or builds) the retriever index, so it happens lazily on first use and
+    only once per session. The compiled agent holds no per-run state and is
+    safe to share across threads and event loops. With a checkpointer,
+    questions asked with the same ``thread_id`` continue one conversation.
+
+    Example:
+        >>> session = AgentSession()
+        >>> output = session.query("Tell me about LangSmith")
+        >>> outputs = session.batch(["What is LangChain?", "What is FAISS?"])
+        >>> chat = AgentSession(checkpointer=InMemorySaver())
+        >>> chat.query("What is LangSmith?", thread_id="t1")
+        >>> chat.query("How do I install it?", thread_id="t1")
+    """
+
+    def __init__(
+        self,
+        agent: Any = None,
+        tools: Optional[Sequence[BaseTool]] = None,
+        checkpointer: Optional[BaseCheckpointSaver] = None
+    ):
+        """
+        Initialize the session.
+
+        Args:
+            agent: A prebuilt agent to use instead of creating one
+            tools: Tools for the agent created on first use (defaults to a new tool registry)
+            checkpointer: Store of conversation threads for the agent created on first use
+        """
+        self._agent = agent
+        self._tools = tools
+        self._checkpointer = checkpointer
+        self._lock = threading.Lock()
+
+    @property
+    def agent(self) -> Any:
+        """The agent, created on first access."""
+        if self._agent is None:
+            with self._lock:
+                if self._agent is None:
+                    self._agent = create_agent(self._tools, checkpointer=self._checkpointer)
+        return self._agent
+
+    def query(self, question: str, thread_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Ask a question and return the agent's final state.
+
+        Args:
+            question: The question or prompt to send to the agent
+            thread_id: Conversation to continue (requires a checkpointer)
+
+        Returns:
+            Agent output with the full message history
+        """
+        return self.agent.invoke(build_agent_input(question), config=build_run_config(thread_id=thread_id))
+
+    async def aquery(self, question: str, thread_id: Optional[str] = None) -> Dict[str, Any]:
+        """Async version of :meth:`query`."""
+        return await self.agent.ainvoke(build_agent_input(question), config=build_run_config(thread_id=thread_id))
+
+    def stream(self, question: str, thread_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Ask a question and yield the agent's state updates as they happen.
+
+        Args:
+            question: The question or prompt to send to the agent
+            thread_id: Conversation to continue (requires a checkpointer)
+
+        Yields:
+            Dictionary chunks containing parts of the agent's response
+        """
+        yield from self.agent.stream(build_agent_input(question), config=build_run_config(thread_id=thread_id))
+
+    async def astream(self, question: str, thread_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Async version of :meth:`stream`."""
+        config = build_run_config(thread_id=thread_id)
+        async for chunk in self.agent.astream(build_agent_input(question), config=config):
+            yield chunk
+
+    def batch(
+        self,
+        questions: Sequence[str],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Answer several questions concurrently.
+
+        Args:
+            questions: Questions to send to the agent
+            max_concurrency: Questions answered at the same time (defaults to BATCH_MAX_CONCURRENCY)
+            return_exceptions: Return a failed question's exception in its slot instead of raising
+
+        Returns:
+            Agent outputs in the same order as the questions
+        """
+        if not questions:
+            return []
+        # Build the agent before fanning out so the workers share it
+        self.agent
+        max_concurrency = max_concurrency or settings.BATCH_MAX_CONCURRENCY
+
+        def run(question: str) -> Any:
+            try:
+                return self.query(question)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(questions))) as executor:
+            return list(executor.map(run, questions))
+
+    async def abatch(
+        self,
+        questions: Sequence[str],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """Async version of :meth:`batch`."""
+        # Build the agent before fanning out so concurrent questions share it
+        self.agent
+        semaphore = asyncio.Semaphore(max_concurrency or settings.BATCH_MAX_CONCURRENCY)
+
+        async def run(question: str) -> Any:
+            async with semaphore:
+                return await self.aquery(question)
+
+        return await asyncio.gather(
+            *(run(question) for question in questions),
+            return_exceptions=return_exceptions
+        )
@@ -0,0 +1,112 @@
+"""Incremental agent events for streaming clients."""
+
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from langchain_core.runnables import RunnableConfig
+from .runner import extract_answer
+
+# Node of the React agent graph that calls the LLM
+AGENT_NODE = "agent"
+
+# Tool outputs are truncated in stream events; the model still sees the full output
+MAX_TOOL_OUTPUT_CHARS = 2000
+
+
+def _tool_output_text(output: Any) -> str:
+    """Render a tool output (usually a ToolMessage) as text."""
+    content = getattr(output, "content", output)
+    text = content if isinstance(content, str) else str(content)
+    if len(text) > MAX_TOOL_OUTPUT_CHARS:
+        text = text[:MAX_TOOL_OUTPUT_CHARS] + "..."
+    return text
+
+
+async def astream_agent_events(
+    agent: Any,
+    inputs: Dict[str, Any],
+    config: Optional[RunnableConfig] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the agent and yield client-facing events as they happen.
+
+    Events are dictionaries with an ``event`` name and a ``data`` payload:
+
+    - ``token``: ``{"delta"}`` text produced by the LLM for the answer
+    - ``tool_start``: ``{"id", "name", "input"}`` when a tool call starts
+    - ``tool_end``: ``{"id", "name", "output"}`` when a tool call finishes
+    - ``tool_error``: ``{"id", "name", "message"}`` when a tool call fails
+    - ``done``: ``{"answer", "tools_used"}`` once the run has finished
+
+    The generator is pull-based: the agent only advances as fast as the
+    consumer reads events. Closing the generator (e.g. because the client
+    disconnected) cancels the run, including in-flight LLM and tool calls.
+
+    Args:
+        agent: Compiled agent graph
+        inputs: Agent input state
+        config: Optional runnable config for the run
+
+    Yields:
+        Event dictionaries
+    """
+    tools_used: List[str] = []
+    final_state = None
+
+    events = agent.astream_events(inputs, config=config, version="v2")
+    try:
+        async for event in events:
+            kind = event["event"]
+
+            if kind == "on_chat_model_stream":
+                if event.get("metadata", {}).get("langgraph_node") != AGENT_NODE:
+                    continue
+                chunk = event["data"].get("chunk")
+                content = getattr(chunk, "content", "")
+                if isinstance(content, str) and content:
+                    yield {"event": "token", "data": {"delta": content}}
+
+            elif kind == "on_tool_start":
+                name = event["name"]
+                if name not in tools_used:
+                    tools_used.append(name)
+                yield {
+                    "event": "tool_start",
+                    "data": {
+                        "id": event["run_id"],
+                        "name": name,
+                        "input": event["data"].get("input")
+                    }
+                }
+
+            elif kind == "on_tool_end":
+                yield {
+                    "event": "tool_end",
+                    "data": {
+                        "id": event["run_id"],
+                        "name": event["name"],
+                        "output": _tool_output_text(event["data"].get("output"))
+                    }
+                }
+
+            elif kind == "on_tool_error":
+                yield {
+                    "event": "tool_error",
+                    "data": {
+                        "id": event["run_id"],
+                        "name": event["name"],
+                        "message": str(event["data"].get("error"))
+                    }
+                }
+
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                # End of the root run carries the final agent state
+                final_state = event["data"].get("output")
+    finally:
+        await events.aclose()
+
+    answer, called_tools = extract_answer(final_state or {})
+    for name in called_tools:
+        if name not in tools_used:
+            tools_used.append(name)
+
+    yield {"event": "done", "data": {"answer": answer, "tools_used": tools_used}}
@@ -0,0 +1,100 @@
+"""Concurrent tool execution with per-tool timeouts."""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+from typing import Callable, Dict, Optional, Sequence
+
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool
+from langgraph.prebuilt import ToolNode
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Threads used to enforce timeouts on the synchronous execution path
+_timeout_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+
+def _get_timeout_pool() -> concurrent.futures.ThreadPoolExecutor:
+    global _timeout_pool
+    if _timeout_pool is None:
+        _timeout_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=settings.TOOL_THREAD_POOL_SIZE,
+            thread_name_prefix="tool-timeout"
+        )
+    return _timeout_pool
+
+
+def _timeout_message(request, timeout: float) -> ToolMessage:
+    name = request.tool_call["name"]
+    logger.warning(f"Tool {name} timed out after {timeout}s")
+    return ToolMessage(
+        content=f"Error: {name} did not respond within {timeout:g} seconds. Try another tool or answer with what you have.",
+        name=name,
+        tool_call_id=request.tool_call["id"],
+        status="error"
+    )
+
+
+def create_tool_node(
+    tools: Sequence[BaseTool],
+    timeouts: Optional[Dict[str, float]] = None,
+    default_timeout: Optional[float] = None
+) -> ToolNode:
+    """
+    Create the agent's tool node with per-tool timeouts.
+
+    The React agent dispatches every tool call of a model turn as its own
+    graph task, so independent calls (e.g. Wikipedia and ArXiv) already run
+    concurrently and their results are merged back in call order; the number
+    running at once per request is capped through the run config's
+    ``max_concurrency`` (see ``agents.runner.build_run_config``).
+
+    A call that exceeds its timeout is answered with an error ToolMessage
+    instead of failing the whole run, so the model can still answer from
+    the other tools' results.
+
+    Args:
+        tools: Tools the agent may call
+        timeouts: Timeout in seconds by tool name
+        default_timeout: Timeout for tools without an entry (None or 0 = no timeout)
+
+    Returns:
+        ToolNode to pass to ``create_react_agent``
+    """
+    timeouts = timeouts or {}
+
+    def timeout_for(request) -> Optional[float]:
+        timeout = timeouts.get(request.tool_call["name"], default_timeout)
+        return timeout if timeout and timeout > 0 else None
+
+    async def awrap_tool_call(request, execute: Callable):
+        timeout = timeout_for(request)
+        if timeout is None:
+            return await execute(request)
+        try:
+            return await asyncio.wait_for(execute(request), timeout)
+        except asyncio.TimeoutError:
+            return _timeout_message(request, timeout)
+
+    def wrap_tool_call(request, execute: Callable):
+        timeout = timeout_for(request)
+        if timeout is None:
+            return execute(request)
+        # Run in the caller's context so callbacks and config propagate
+        context = contextvars.copy_context()
+        future = _get_timeout_pool().submit(context.run, execute, request)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            # A blocked thread cannot be interrupted; its late result is discarded
+            future.cancel()
+            return _timeout_message(request, timeout)
+
+    return ToolNode(
+        list(tools),
+        wrap_tool_call=wrap_tool_call,
+        awrap_tool_call=awrap_tool_call
+    )
@@ -7,20 +7,38 @@ from typing import Dict, Any
 class AppState:
     """Application state container."""
     agent = None
+    thread_agent = None
+    tool_registry = None
     vector_db_initialized = False
     tools_info = []
+    admission = None
+    rate_limiter = None
+    answer_cache = None
+    live_index = None
+    index_refresher = None
 
 
 app_state = AppState()
 
 
-def get_agent():
-    """Get the initialized agent instance."""
+def get_agent(threaded: bool = False):
+    """Get the initialized agent instance (the checkpointed one for conversation threads)."""
+    if threaded:
+        if app_state.thread_agent is None:
+            raise RuntimeError("Conversation threads are disabled (CHECKPOINTER=none).")
+        return app_state.thread_agent
     if app_state.agent is None:
         raise RuntimeError("Agent not initialized. Server startup may have failed.")
     return app_state.agent
 
 
+def get_admission():
+    """Get the admission controller bounding the agent runs in this worker."""
+    if app_state.admission is None:
+        raise RuntimeError("Admission control not initialized. Server startup may have failed.")
+    return app_state.admission
+
+
 def get_app_state() -> AppState:
     """Get the application state."""
     return app_state
@@ -1,10 +1,15 @@
-from .request import QueryRequest
-from .response import QueryResponse, HealthResponse, ToolInfo, ToolsResponse, ErrorResponse
+from .request import QueryRequest, BatchQueryRequest
+from .response import QueryResponse, BatchQueryResult, HealthResponse, LivenessResponse, ReadinessCheck, ReadinessResponse, ToolInfo, ToolsResponse, ErrorResponse
 
 __all__ = [
     'QueryRequest',
+    'BatchQueryRequest',
     'QueryResponse',
+    'BatchQueryResult',
     'HealthResponse',
+    'LivenessResponse',
+    'ReadinessCheck',
+    'ReadinessResponse',
     'ToolInfo',
     'ToolsResponse',
     'ErrorResponse'
@@ -1,7 +1,8 @@
 """Request models for API endpoints."""
 
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
+from config.settings import settings
 
 
 class QueryRequest(BaseModel):
@@ -29,11 +30,84 @@ class QueryRequest(BaseModel):
         le=2.0
     )
     
+    model: Optional[str] = Field(
+        None,
+        description="Model to answer with (overrides default; must be in the server's allowlist)",
+        examples=["gpt-4o-mini"]
+    )
+    
+    include_timings: bool = Field(
+        False,
+        description="Include a per-stage timing breakdown in the response"
+    )
+    
+    thread_id: Optional[str] = Field(
+        None,
+        description="Conversation thread to continue (created on first use); answers in a thread are never cached",
+        min_length=1,
+        max_length=128,
+        pattern=r"^[A-Za-z0-9_.:-]+$",
+        examples=["user-42-session-1"]
+    )
+    
+    @field_validator("model")
+    @classmethod
+    def validate_model(cls, value: Optional[str]) -> Optional[str]:
+        """Reject models that are not allowed by the server."""
+        if value is not None and value not in settings.allowed_models():
+            raise ValueError(f"model must be one of: {', '.join(settings.allowed_models())}")
+        return value
+    
+    @field_validator("thread_id")
+    @classmethod
+    def validate_thread_id(cls, value: Optional[str]) -> Optional[str]:
+        """Reject thread ids when the server keeps no threads."""
+        if value is not None and settings.CHECKPOINTER == "none":
+            raise ValueError("conversation threads are disabled on this server")
+        return value
+    
     class Config:
         json_schema_extra = {
             "example": {
                 "question": "Tell me about LangSmith",
                 "max_tokens": 2000,
-                "temperature": 0.1
+                "temperature": 0.1,
+                "model": "gpt-4o-mini"
+            }
+        }
+
+
+class BatchQueryRequest(BaseModel):
+    """Request model for the batch query endpoint."""
+    
+    items: List[QueryRequest] = Field(
+        ...,
+        description="Questions to answer, each with its own optional parameters",
+        min_length=1,
+        max_length=1000
+    )
+    
+    max_concurrency: Optional[int] = Field(
+        None,
+        description="Items answered at the same time (capped by the server's BATCH_MAX_CONCURRENCY)",
+        ge=1
+    )
+    
+    @field_validator("items")
+    @classmethod
+    def validate_items(cls, items: List[QueryRequest]) -> List[QueryRequest]:
+        """Reject conversation threads, whose turns must run one after another."""
+        if any(item.thread_id is not None for item in items):
+            raise ValueError("thread_id is not supported in batch items")
+        return items
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [
+                    {"question": "What is LangSmith?"},
+                    {"question": "Tell me about quantum computing", "temperature": 0.1}
+                ],
+                "max_concurrency": 8
             }
         }
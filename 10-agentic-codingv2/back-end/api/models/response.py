@@ -1,7 +1,7 @@
 """Response models for API endpoints."""
 
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 
 
@@ -11,6 +11,9 @@ class QueryResponse(BaseModel):
     question: str = Field(..., description="The original question asked")
     answer: str = Field(..., description="The AI-generated answer")
     tools_used: List[str] = Field(default_factory=list, description="List of tools used to answer the question")
+    cached: bool = Field(False, description="Whether the answer was served from the answer cache")
+    thread_id: Optional[str] = Field(None, description="Conversation thread the answer belongs to")
+    timings: Optional[Dict[str, Union[int, float]]] = Field(None, description="Per-stage timing breakdown in milliseconds, plus call and token counts (only when requested)")
     timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat(), description="Timestamp of the response")
     
     class Config:
@@ -19,6 +22,33 @@ class QueryResponse(BaseModel):
                 "question": "What is LangSmith?",
                 "answer": "LangSmith is a platform for building production-grade LLM applications...",
                 "tools_used": ["langsmith_search"],
+                "cached": False,
+                "timestamp": "2025-11-13T12:00:00.000000"
+            }
+        }
+
+
+class BatchQueryResult(BaseModel):
+    """One NDJSON line of the batch query endpoint."""
+    
+    index: int = Field(..., description="Position of the item in the batch request")
+    question: str = Field(..., description="The original question asked")
+    answer: Optional[str] = Field(None, description="The AI-generated answer (absent on error)")
+    tools_used: List[str] = Field(default_factory=list, description="List of tools used to answer the question")
+    cached: bool = Field(False, description="Whether the answer was served from the answer cache")
+    error: Optional[str] = Field(None, description="Error message if the item failed")
+    timings: Optional[Dict[str, Union[int, float]]] = Field(None, description="Per-stage timing breakdown in milliseconds (only when requested)")
+    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat(), description="Timestamp of the result")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "index": 0,
+                "question": "What is LangSmith?",
+                "answer": "LangSmith is a platform for building production-grade LLM applications...",
+                "tools_used": ["langsmith_search"],
+                "cached": False,
+                "error": None,
                 "timestamp": "2025-11-13T12:00:00.000000"
             }
         }
@@ -31,6 +61,7 @@ class HealthResponse(BaseModel):
     timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat(), description="Timestamp of the health check")
     version: str = Field(..., description="API version")
     vector_db_initialized: bool = Field(..., description="Whether the vector database is initialized")
+    index_version: Optional[str] = Field(None, description="Version key of the vector index currently serving searches")
     
     class Config:
         json_schema_extra = {
@@ -38,7 +69,45 @@ class HealthResponse(BaseModel):
                 "status": "healthy",
                 "timestamp": "2025-11-13T12:00:00.000000",
                 "version": "1.0.0",
-                "vector_db_initialized": True
+                "vector_db_initialized": True,
+                "index_version": "8913a2c6b449c7d6"
+            }
+        }
+
+
+class LivenessResponse(BaseModel):
+    """Response model for the liveness probe."""
+    
+    status: str = Field("alive", description="Always alive while the process serves requests")
+    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat(), description="Timestamp of the check")
+
+
+class ReadinessCheck(BaseModel):
+    """Outcome of one readiness check."""
+    
+    ok: bool = Field(..., description="Whether the check passes")
+    critical: bool = Field(True, description="Whether a failure makes the worker not ready (otherwise it is only reported)")
+    detail: Dict[str, Any] = Field(default_factory=dict, description="Values the check was judged on")
+
+
+class ReadinessResponse(BaseModel):
+    """Response model for the readiness probe."""
+    
+    status: str = Field(..., description="ready or not_ready")
+    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat(), description="Timestamp of the check")
+    checks: Dict[str, ReadinessCheck] = Field(..., description="Individual checks by name")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "status": "ready",
+                "timestamp": "2025-11-13T12:00:00.000000",
+                "checks": {
+                    "index": {"ok": True, "critical": True, "detail": {"index_version": "8913a2c6b449c7d6"}},
+                    "agent": {"ok": True, "critical": True, "detail": {}},
+                    "load": {"ok": True, "critical": True, "detail": {"utilization": 0.25, "queued": 0, "max_queued": 128}},
+                    "llm": {"ok": True, "critical": True, "detail": {"calls": 42, "errors": 0, "error_rate": 0.0, "p95_seconds": 3.1}}
+                }
             }
         }
 
@@ -3,5 +3,6 @@
 from .health import router as health_router
 from .query import router as query_router
 from .tools import router as tools_router
+from .metrics import router as metrics_router
 
-__all__ = ['health_router', 'query_router', 'tools_router']
+__all__ = ['health_router', 'query_router', 'tools_router', 'metrics_router']
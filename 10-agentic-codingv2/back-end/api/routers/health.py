@@ -1,9 +1,12 @@
-"""Health check endpoint."""
+"""Health check, liveness and readiness endpoints."""
 
-from fastapi import APIRouter, Depends
-from api.models import HealthResponse
+from typing import Dict
+
+from fastapi import APIRouter, Depends, Response, status
+from api.models import HealthResponse, LivenessResponse, ReadinessCheck, ReadinessResponse
 from api.dependencies import get_app_state, AppState
 from config.settings import settings
+from metrics import DEPENDENCY_HEALTH
 
 router = APIRouter(tags=["Health"])
 
@@ -24,5 +27,101 @@ async def health_check(state: AppState = Depends(get_app_state)) -> HealthRespon
     return HealthResponse(
         status="healthy",
         version=settings.API_VERSION,
-        vector_db_initialized=state.vector_db_initialized
+        vector_db_initialized=state.vector_db_initialized,
+        index_version=state.live_index.key if state.live_index is not None else None
     )
+
+
+@router.get(
+    "/livez",
+    response_model=LivenessResponse,
+    summary="Liveness Probe",
+    description="Succeeds while the process is serving requests; restart the container when it fails"
+)
+async def liveness() -> LivenessResponse:
+    """
+    Liveness probe.
+
+    Checks nothing beyond the event loop answering, so a worker that is busy
+    or whose dependencies are failing is not restarted.
+
+    Returns:
+        LivenessResponse: Always ``alive``
+    """
+    return LivenessResponse()
+
+
+def _calls_ok(stats: Dict[str, float], max_p95: float = 0) -> bool:
+    """Judge a dependency's recent calls (too few calls always pass)."""
+    if stats["calls"] < settings.READINESS_MIN_CALLS:
+        return True
+    if stats["error_rate"] > settings.READINESS_MAX_ERROR_RATE:
+        return False
+    return not max_p95 or stats["p95_seconds"] <= max_p95
+
+
+def readiness_checks(state: AppState) -> Dict[str, ReadinessCheck]:
+    """
+    Evaluate whether this worker should receive traffic.
+
+    The index and the agent must be loaded, and the admission queue must be
+    less than READINESS_MAX_QUEUE_RATIO full. LLM calls of the last
+    READINESS_WINDOW seconds must stay within READINESS_MAX_ERROR_RATE and
+    READINESS_MAX_LLM_P95. Tool failures are reported but never make the
+    worker unready, since the agent answers without a failing tool.
+    Dependency statistics come from calls made by real requests, so the
+    probe sends no traffic of its own.
+    """
+    checks: Dict[str, ReadinessCheck] = {}
+
+    if state.live_index is not None:
+        checks["index"] = ReadinessCheck(ok=True, detail={"index_version": state.live_index.key})
+    else:
+        # Without a retriever tool there is no index to wait for
+        enabled = state.tool_registry is None or "langsmith_search" in state.tool_registry
+        checks["index"] = ReadinessCheck(ok=not enabled, detail={"loaded": False})
+
+    checks["agent"] = ReadinessCheck(ok=state.agent is not None)
+
+    if state.admission is not None:
+        load = state.admission.stats()
+        max_queued = int(settings.READINESS_MAX_QUEUE_RATIO * state.admission.max_queue)
+        ok = load["queued"] < max_queued if max_queued > 0 else load["in_use"] < load["capacity"]
+        checks["load"] = ReadinessCheck(
+            ok=ok,
+            detail={"utilization": round(load["utilization"], 3), "queued": load["queued"], "max_queued": max_queued}
+        )
+    else:
+        checks["load"] = ReadinessCheck(ok=False)
+
+    for dependency, stats in DEPENDENCY_HEALTH.summary().items():
+        detail = dict(stats, error_rate=round(stats["error_rate"], 3), p95_seconds=round(stats["p95_seconds"], 3))
+        if dependency == "llm":
+            checks["llm"] = ReadinessCheck(ok=_calls_ok(stats, settings.READINESS_MAX_LLM_P95), detail=detail)
+        else:
+            checks[dependency] = ReadinessCheck(ok=_calls_ok(stats), critical=False, detail=detail)
+    return checks
+
+
+@router.get(
+    "/readyz",
+    response_model=ReadinessResponse,
+    summary="Readiness Probe",
+    description=(
+        "Returns 200 when this worker should receive traffic and 503 while it is warming up, "
+        "saturated or seeing LLM failures"
+    ),
+    responses={503: {"model": ReadinessResponse, "description": "Not Ready"}}
+)
+async def readiness(response: Response, state: AppState = Depends(get_app_state)) -> ReadinessResponse:
+    """
+    Readiness probe for load balancers.
+
+    Returns:
+        ReadinessResponse: The overall status and every check (status code 503 when not ready)
+    """
+    checks = readiness_checks(state)
+    ready = all(check.ok for check in checks.values() if check.critical)
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessResponse(status="ready" if ready else "not_ready", checks=checks)
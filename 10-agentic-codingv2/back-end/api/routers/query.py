@@ -1,15 +1,217 @@
 """Query endpoint for AI agent."""
 
-from fastapi import APIRouter, HTTPException, Depends, status
-from langchain_core.messages import HumanMessage
-from api.models import QueryRequest, QueryResponse, ErrorResponse
-from api.dependencies import get_agent
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request, status
+from fastapi.responses import StreamingResponse
+from admission import Overloaded, retry_after_header
+from api.models import QueryRequest, QueryResponse, BatchQueryRequest, BatchQueryResult, ErrorResponse
+from api.dependencies import get_admission, get_agent, get_app_state
+from agents import build_agent_input, build_run_config, extract_answer, astream_agent_events
+from cache import normalize_question
+from metrics import QUERIES, REJECTED_REQUESTS, MetricsCallbackHandler, StageTimer
+from config.settings import settings
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import json
 import logging
+import time
+import weakref
 
 router = APIRouter(tags=["Query"])
 logger = logging.getLogger(__name__)
 
+# One lock per active conversation thread, dropped once no request holds it
+_thread_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def run_config(request: QueryRequest, handler: MetricsCallbackHandler) -> Dict[str, Any]:
+    """Build the agent run config, applying the request's model parameter overrides."""
+    config = build_run_config(
+        model=request.model,
+        temperature=request.temperature,
+        max_tokens=request.max_tokens,
+        thread_id=request.thread_id
+    )
+    config["callbacks"] = [handler]
+    return config
+
+
+def generation_params(request: QueryRequest) -> Dict[str, Any]:
+    """
+    Resolve the model parameters a request is answered with.
+
+    Request overrides take precedence over the configured defaults. The
+    result is part of the answer cache key.
+    """
+    return {
+        "model": request.model or settings.OPENAI_MODEL,
+        "temperature": request.temperature if request.temperature is not None else settings.OPENAI_TEMPERATURE,
+        "max_tokens": request.max_tokens if request.max_tokens is not None else settings.OPENAI_MAX_TOKENS
+    }
+
+
+async def lookup_cached_answer(request: QueryRequest) -> Optional[Dict[str, Any]]:
+    """Return the cached answer for a request, or None (cache errors count as misses)."""
+    cache = get_app_state().answer_cache
+    # Answers in a thread depend on its history
+    if cache is None or request.thread_id is not None:
+        return None
+    try:
+        return await cache.aget(request.question, generation_params(request))
+    except Exception as e:
+        logger.warning(f"Answer cache lookup failed: {str(e)}")
+        return None
+
+
+async def store_answer(request: QueryRequest, answer: str, tools_used: list) -> None:
+    """Store a freshly generated answer in the answer cache, if enabled."""
+    cache = get_app_state().answer_cache
+    if cache is None or not answer or request.thread_id is not None:
+        return
+    try:
+        await cache.aset(
+            request.question,
+            generation_params(request),
+            {"answer": answer, "tools_used": list(tools_used)}
+        )
+    except Exception as e:
+        logger.warning(f"Answer cache store failed: {str(e)}")
+
+
+def expected_cost(request: QueryRequest) -> float:
+    """
+    Estimate the cost of answering a request, in default-query units.
+
+    An agent run's LLM time grows with the completion budget, so a request
+    asking for more than the default OPENAI_MAX_TOKENS costs proportionally
+    more. The estimate weights both rate limiting and admission control.
+    """
+    max_tokens = request.max_tokens if request.max_tokens is not None else settings.OPENAI_MAX_TOKENS
+    return max(1.0, max_tokens / settings.OPENAI_MAX_TOKENS)
+
+
+def client_key(http_request: Request) -> str:
+    """Identify the client a request is rate limited as."""
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = http_request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return http_request.client.host if http_request.client else "unknown"
+
+
+def overloaded_error(e: Overloaded) -> HTTPException:
+    """Build the 503 response for a request the worker has no capacity for."""
+    REJECTED_REQUESTS.inc(reason="overloaded")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": retry_after_header(e.retry_after)}
+    )
+
+
+async def admit(http_request: Request, cost: float) -> None:
+    """
+    Apply the client's rate limit and shed load before any work starts.
+
+    Raises:
+        HTTPException: 429 when the client is over its rate limit, 503 when
+            this worker is at capacity and its queue is full; both carry a
+            ``Retry-After`` header
+    """
+    limiter = get_app_state().rate_limiter
+    if limiter is not None:
+        retry_after = await limiter.acquire(client_key(http_request), cost)
+        if retry_after > 0:
+            REJECTED_REQUESTS.inc(reason="rate_limited")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": retry_after_header(retry_after)}
+            )
+    try:
+        get_admission().check()
+    except Overloaded as e:
+        raise overloaded_error(e)
+
+
+@asynccontextmanager
+async def query_slot(timer: StageTimer, thread_id: Optional[str] = None, cost: float = 1.0) -> AsyncIterator[None]:
+    """
+    Hold ``cost`` of this worker's agent run capacity, timing the wait as ``queue_wait``.
+
+    Turns of one conversation thread also wait for each other, so each turn
+    sees the previous one's history. Raises ``Overloaded`` when no capacity
+    frees up within ADMISSION_MAX_WAIT or the queue is full.
+    """
+    async with AsyncExitStack() as stack:
+        with timer.stage("queue_wait"):
+            if thread_id is not None:
+                lock = _thread_locks.get(thread_id)
+                if lock is None:
+                    lock = _thread_locks[thread_id] = asyncio.Lock()
+                await lock.acquire()
+                stack.callback(lock.release)
+            await stack.enter_async_context(get_admission().slot(cost))
+        yield
+
+
+async def answer_query(agent: Any, request: QueryRequest) -> QueryResponse:
+    """
+    Answer one request from the answer cache or by running the agent.
+
+    The agent run holds its expected cost of the worker's admission
+    capacity, which bounds the agent work in flight across all endpoints.
+    Every stage is recorded in the metrics; the breakdown is returned in
+    ``timings`` when the request asks for it.
+
+    Args:
+        agent: The agent to run on a cache miss
+        request: The request to answer
+
+    Returns:
+        QueryResponse with the answer and the tools used
+    """
+    timer = StageTimer()
+    with timer.stage("cache_lookup"):
+        cached = await lookup_cached_answer(request)
+    if cached is not None:
+        logger.info(f"Answer served from cache: {request.question[:100]}")
+        QUERIES.inc(source="cache")
+        timer.finish()
+        return QueryResponse(
+            question=request.question,
+            answer=cached["answer"],
+            tools_used=cached["tools_used"],
+            cached=True,
+            timings=timer.breakdown() if request.include_timings else None
+        )
+
+    # Invoke the agent without blocking the event loop
+    logger.info(f"Processing query: {request.question[:100]}...")
+
+    handler = MetricsCallbackHandler()
+    async with query_slot(timer, request.thread_id, expected_cost(request)):
+        with timer.stage("agent"):
+            result = await agent.ainvoke(build_agent_input(request.question), config=run_config(request, handler))
+
+    # Extract the answer and the tools used from the result
+    answer, tools_used = extract_answer(result)
+
+    logger.info(f"Query processed successfully. Tools used: {tools_used}")
+
+    with timer.stage("cache_store"):
+        await store_answer(request, answer, tools_used)
+    QUERIES.inc(source="agent")
+    timer.finish()
+
+    return QueryResponse(
+        question=request.question,
+        answer=answer,
+        tools_used=tools_used,
+        thread_id=request.thread_id,
+        timings=timer.breakdown(handler) if request.include_timings else None
+    )
+
 
 @router.post(
     "/query",
@@ -18,71 +220,301 @@ logger = logging.getLogger(__name__)
     description="Send a question to the AI agent and receive an answer",
     responses={
         400: {"model": ErrorResponse, "description": "Bad Request"},
-        500: {"model": ErrorResponse, "description": "Internal Server Error"}
+        429: {"model": ErrorResponse, "description": "Rate Limit Exceeded"},
+        500: {"model": ErrorResponse, "description": "Internal Server Error"},
+        503: {"model": ErrorResponse, "description": "Server Overloaded"}
     }
 )
-async def query_agent(request: QueryRequest) -> QueryResponse:
+async def query_agent(request: QueryRequest, http_request: Request) -> QueryResponse:
     """
     Query the AI agent with a question.
-    
+
     The agent will automatically select and use appropriate tools based on the question:
     - Google Search: For real-time information
     - Wikipedia: For general knowledge
     - ArXiv: For academic papers
     - LangSmith Retriever: For LangSmith documentation
-    
+
+    Answers to identical (or, with the semantic tier, near-identical)
+    questions asked with the same model parameters are served from the
+    answer cache. With a ``thread_id`` the question continues that
+    conversation, and is never answered from the cache.
+
     Args:
         request: QueryRequest containing the question and optional parameters
-        
+        http_request: The HTTP request, identifying the client for rate limiting
+
     Returns:
         QueryResponse: The agent's answer along with metadata
-        
+
     Raises:
-        HTTPException: If the query fails
+        HTTPException: 429/503 when rate limited or overloaded, or if the query fails
     """
+    await admit(http_request, expected_cost(request))
     try:
-        agent = get_agent()
-        
-        # Invoke the agent
-        logger.info(f"Processing query: {request.question[:100]}...")
-        
-        result = agent.invoke({
-            "messages": [HumanMessage(content=request.question)]
-        })
-        
-        # Extract the answer from the result
-        answer = ""
-        tools_used = []
-        
-        if "messages" in result:
-            # Get the last message which should be the final answer
-            messages = result["messages"]
-            if messages:
-                last_message = messages[-1]
-                answer = getattr(last_message, "content", str(last_message))
-            
-            # Extract tools used from intermediate messages
-            for msg in messages:
-                if hasattr(msg, "tool_calls") and msg.tool_calls:
-                    for tool_call in msg.tool_calls:
-                        tool_name = tool_call.get("name", "unknown")
-                        if tool_name not in tools_used:
-                            tools_used.append(tool_name)
-        else:
-            # Fallback: convert entire result to string
-            answer = str(result)
-        
-        logger.info(f"Query processed successfully. Tools used: {tools_used}")
-        
-        return QueryResponse(
-            question=request.question,
-            answer=answer,
-            tools_used=tools_used
-        )
-        
+        agent = get_agent(threaded=request.thread_id is not None)
+        return await answer_query(agent, request)
+
+    except Overloaded as e:
+        raise overloaded_error(e)
     except Exception as e:
         logger.error(f"Error processing query: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to process query: {str(e)}"
         )
+
+
+def format_sse(event: Dict[str, Any], event_id: int) -> str:
+    """Format an agent event as a Server-Sent Events message."""
+    data = json.dumps(event["data"], default=str)
+    return f"id: {event_id}\nevent: {event['event']}\ndata: {data}\n\n"
+
+
+async def stream_query_events(agent: Any, request: QueryRequest) -> AsyncIterator[str]:
+    """
+    Run the agent for one question and yield SSE messages.
+
+    A cached answer is emitted as a single ``done`` event. Otherwise the run
+    holds a query concurrency slot until the stream ends; if no slot frees
+    up in time, the stream is a single ``error`` event carrying
+    ``retry_after``, since the response headers are already sent; any
+    other failure to get a slot also ends in an ``error`` event. If the
+    client disconnects, Starlette cancels this generator, which closes the agent
+    event stream and cancels in-flight LLM and tool calls.
+    """
+    question = request.question
+    timer = StageTimer()
+
+    with timer.stage("cache_lookup"):
+        cached = await lookup_cached_answer(request)
+    if cached is not None:
+        logger.info(f"Answer served from cache: {question[:100]}")
+        QUERIES.inc(source="cache")
+        timer.finish()
+        data = dict(cached, question=question, cached=True)
+        if request.include_timings:
+            data["timings"] = timer.breakdown()
+        yield format_sse({"event": "done", "data": data}, 1)
+        return
+
+    event_id = 0
+    handler = MetricsCallbackHandler()
+    slot = AsyncExitStack()
+    try:
+        await slot.enter_async_context(query_slot(timer, request.thread_id, expected_cost(request)))
+    except Overloaded as e:
+        REJECTED_REQUESTS.inc(reason="overloaded")
+        logger.info(f"Streamed query shed: {str(e)}")
+        yield format_sse(
+            {"event": "error", "data": {"message": str(e), "retry_after": e.retry_after}},
+            event_id + 1
+        )
+        return
+    except Exception as e:
+        logger.error(f"Error waiting for a query slot: {str(e)}", exc_info=True)
+        yield format_sse(
+            {"event": "error", "data": {"message": "Failed to start the query; please retry"}},
+            event_id + 1
+        )
+        return
+
+    async with slot:
+        agent_start = time.perf_counter()
+        events = astream_agent_events(agent, build_agent_input(question), config=run_config(request, handler))
+        try:
+            async for event in events:
+                event_id += 1
+                if event["event"] == "done":
+                    timer.record("agent", time.perf_counter() - agent_start)
+                    event["data"].update(question=question, cached=False, thread_id=request.thread_id)
+                    logger.info(f"Streamed query completed. Tools used: {event['data']['tools_used']}")
+                    with timer.stage("cache_store"):
+                        await store_answer(request, event["data"]["answer"], event["data"]["tools_used"])
+                    QUERIES.inc(source="agent")
+                    timer.finish()
+                    if request.include_timings:
+                        event["data"]["timings"] = timer.breakdown(handler)
+                yield format_sse(event, event_id)
+        except asyncio.CancelledError:
+            logger.info("Client disconnected; streamed query cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming query: {str(e)}", exc_info=True)
+            event_id += 1
+            yield format_sse(
+                {"event": "error", "data": {"message": f"Failed to process query: {str(e)}"}},
+                event_id
+            )
+        finally:
+            await events.aclose()
+
+
+@router.post(
+    "/query/stream",
+    summary="Query the AI Agent (streaming)",
+    description=(
+        "Send a question to the AI agent and receive Server-Sent Events as the answer is produced: "
+        "`token` deltas, `tool_start`/`tool_end` events and a final `done` event with the answer and `tools_used`"
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "Stream of agent events"},
+        400: {"model": ErrorResponse, "description": "Bad Request"},
+        429: {"model": ErrorResponse, "description": "Rate Limit Exceeded"},
+        500: {"model": ErrorResponse, "description": "Internal Server Error"},
+        503: {"model": ErrorResponse, "description": "Server Overloaded"}
+    }
+)
+async def query_agent_stream(request: QueryRequest, http_request: Request) -> StreamingResponse:
+    """
+    Query the AI agent and stream its progress as Server-Sent Events.
+
+    Rate limiting and load shedding apply before the stream starts; a run
+    that then waits longer than ADMISSION_MAX_WAIT ends with an ``error``
+    event whose ``retry_after`` gives the seconds to wait before retrying.
+
+    Args:
+        request: QueryRequest containing the question and optional parameters
+        http_request: The HTTP request, identifying the client for rate limiting
+
+    Returns:
+        StreamingResponse emitting ``text/event-stream`` messages
+
+    Raises:
+        HTTPException: 429/503 when rate limited or overloaded, or if the agent is not available
+    """
+    await admit(http_request, expected_cost(request))
+    try:
+        agent = get_agent(threaded=request.thread_id is not None)
+    except Exception as e:
+        logger.error(f"Error starting streamed query: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process query: {str(e)}"
+        )
+
+    logger.info(f"Streaming query: {request.question[:100]}...")
+
+    return StreamingResponse(
+        stream_query_events(agent, request),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+def batch_item_key(request: QueryRequest) -> Tuple[str, Tuple]:
+    """Key under which identical batch items are answered only once."""
+    return normalize_question(request.question), tuple(sorted(generation_params(request).items()))
+
+
+async def stream_batch_results(agent: Any, batch: BatchQueryRequest) -> AsyncIterator[str]:
+    """
+    Answer the items of a batch concurrently and yield NDJSON lines as they finish.
+
+    Items that ask the same question with the same parameters are answered
+    once and reported under each of their indices. Every item goes through
+    the answer cache, so repeated questions across batches are not re-run.
+    A failed item is reported with an ``error`` and does not stop the batch.
+    If the client disconnects, the outstanding items are cancelled.
+    """
+    limit = min(batch.max_concurrency or settings.BATCH_MAX_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY)
+    semaphore = asyncio.Semaphore(limit)
+
+    groups: Dict[Tuple[str, Tuple], List[int]] = {}
+    for index, item in enumerate(batch.items):
+        groups.setdefault(batch_item_key(item), []).append(index)
+
+    async def answer_group(indices: List[int]) -> Tuple[List[int], Optional[QueryResponse], Optional[str]]:
+        async with semaphore:
+            try:
+                return indices, await answer_query(agent, batch.items[indices[0]]), None
+            except Exception as e:
+                logger.error(f"Error processing batch item {indices[0]}: {str(e)}", exc_info=True)
+                return indices, None, f"Failed to process query: {str(e)}"
+
+    logger.info(f"Processing batch of {len(batch.items)} items ({len(groups)} unique) with concurrency {limit}")
+    tasks = [asyncio.create_task(answer_group(indices)) for indices in groups.values()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            indices, response, error = await next_done
+            for index in indices:
+                item = batch.items[index]
+                if response is None:
+                    result = BatchQueryResult(index=index, question=item.question, error=error)
+                else:
+                    result = BatchQueryResult(
+                        index=index,
+                        question=item.question,
+                        answer=response.answer,
+                        tools_used=response.tools_used,
+                        cached=response.cached or index != indices[0],
+                        timings=response.timings
+                    )
+                yield result.model_dump_json() + "\n"
+    except asyncio.CancelledError:
+        logger.info("Client disconnected; batch query cancelled")
+        raise
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@router.post(
+    "/query/batch",
+    summary="Query the AI Agent (batch)",
+    description=(
+        "Send a list of questions and receive newline-delimited JSON results in completion order. "
+        "Each line carries the item's `index` in the request, its answer or an `error`"
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"application/x-ndjson": {}}, "description": "One BatchQueryResult per line"},
+        400: {"model": ErrorResponse, "description": "Bad Request"},
+        429: {"model": ErrorResponse, "description": "Rate Limit Exceeded"},
+        500: {"model": ErrorResponse, "description": "Internal Server Error"},
+        503: {"model": ErrorResponse, "description": "Server Overloaded"}
+    }
+)
+async def query_agent_batch(batch: BatchQueryRequest, http_request: Request) -> StreamingResponse:
+    """
+    Answer many questions in one request.
+
+    Items are answered concurrently, at most ``max_concurrency`` at a time
+    (capped by BATCH_MAX_CONCURRENCY), and share the answer and tool result
+    caches. Results are streamed as soon as each item finishes. The batch
+    is rate limited at the summed cost of its distinct items.
+
+    Args:
+        batch: BatchQueryRequest with the items to answer
+        http_request: The HTTP request, identifying the client for rate limiting
+
+    Returns:
+        StreamingResponse emitting ``application/x-ndjson`` lines
+
+    Raises:
+        HTTPException: 429/503 when rate limited or overloaded, or if the agent is not available
+    """
+    unique = {batch_item_key(item): item for item in batch.items}
+    await admit(http_request, sum(expected_cost(item) for item in unique.values()))
+    try:
+        agent = get_agent()
+    except Exception as e:
+        logger.error(f"Error starting batch query: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process query: {str(e)}"
+        )
+
+    return StreamingResponse(
+        stream_batch_results(agent, batch),
+        media_type="application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -5,30 +5,28 @@ This module initializes and configures the FastAPI application,
 including startup events, middleware, and routing.
 """
 
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
 import colorama
 from colorama import Fore, Back, Style
 
 from config.settings import settings
-from api.routers import health_router, query_router, tools_router
+from admission import AdmissionController, create_rate_limiter
+from api.routers import health_router, query_router, tools_router, metrics_router
 from api.dependencies import app_state
 from api.models import ToolInfo
-from agents import create_agent
-from tools import (
-    create_google_search_tool,
-    create_wikipedia_tool,
-    create_arxiv_tool,
-    create_retriever_tool
-)
+from agents import create_agent, load_tokenizer, open_checkpointer
+from tools import create_tool_registry
+from tools.executor import install_tool_executor
+from tools.serper_client import close_serper_client
+from cache import AnswerCache
+from retrieval import IndexRefresher, create_embeddings, get_live_vectorstore, get_query_cache, refresh_live_vectorstore
+from metrics import DEPENDENCY_HEALTH, REGISTRY, MetricsMiddleware, stats_collector
 
 # Initialize colorama
 colorama.init(autoreset=True)
@@ -58,15 +56,29 @@ def print_config():
     print(f"{Fore.YELLOW}  OpenAI Model:     {Fore.WHITE}{settings.OPENAI_MODEL}")
     print(f"{Fore.YELLOW}  Max Tokens:       {Fore.WHITE}{settings.OPENAI_MAX_TOKENS}")
     print(f"{Fore.YELLOW}  Temperature:      {Fore.WHITE}{settings.OPENAI_TEMPERATURE}")
+    print(f"{Fore.YELLOW}  Max Concurrency:  {Fore.WHITE}{settings.MAX_CONCURRENT_QUERIES} queries / {settings.TOOL_THREAD_POOL_SIZE} tool threads")
+    print(f"{Fore.YELLOW}  Admission Queue:  {Fore.WHITE}{settings.ADMISSION_MAX_QUEUE} queries, {settings.ADMISSION_MAX_WAIT:g}s max wait")
+    print(f"{Fore.YELLOW}  Answer Cache:     {Fore.WHITE}{'Enabled' if settings.ANSWER_CACHE_ENABLED else 'Disabled'}")
+    print(f"{Fore.YELLOW}  Threads:          {Fore.WHITE}{'Disabled' if settings.CHECKPOINTER == 'none' else f'{settings.CHECKPOINTER} ({settings.HISTORY_COMPACTION} history to {settings.HISTORY_MAX_TOKENS} tokens)'}")
+    print(f"{Fore.YELLOW}  Metrics:          {Fore.WHITE}{'Enabled' if settings.METRICS_ENABLED else 'Disabled'}")
+    print(f"{Fore.YELLOW}  Index Refresh:    {Fore.WHITE}{f'Every {settings.INDEX_REFRESH_INTERVAL:g}s' if settings.INDEX_REFRESH_INTERVAL > 0 else 'Disabled'}")
     print(f"{Fore.YELLOW}  Rate Limiting:    {Fore.WHITE}{'Enabled' if settings.RATE_LIMIT_ENABLED else 'Disabled'}")
     if settings.RATE_LIMIT_ENABLED:
-        print(f"{Fore.YELLOW}    - Requests:     {Fore.WHITE}{settings.RATE_LIMIT_REQUESTS}/{settings.RATE_LIMIT_PERIOD}s")
+        print(f"{Fore.YELLOW}    - Requests:     {Fore.WHITE}{settings.RATE_LIMIT_REQUESTS}/{settings.RATE_LIMIT_PERIOD}s per client ({settings.RATE_LIMIT_BACKEND})")
     print(f"{Fore.YELLOW}  CORS:             {Fore.WHITE}{'Enabled' if settings.CORS_ENABLED else 'Disabled'}")
     print(f"{Fore.YELLOW}  Chunk Size:       {Fore.WHITE}{settings.CHUNK_SIZE}")
     print(f"{Fore.YELLOW}  Chunk Overlap:    {Fore.WHITE}{settings.CHUNK_OVERLAP}")
     print(f"{Fore.CYAN}{'=' * 80}\n")
 
 
+def index_stats() -> dict:
+    """Return the live index stats, plus refresh counters when refreshing."""
+    stats = app_state.live_index.stats()
+    if app_state.index_refresher is not None:
+        stats.update(app_state.index_refresher.stats())
+    return stats
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
@@ -76,47 +88,91 @@ async def lifespan(app: FastAPI):
     
     logger.info(f"{Fore.GREEN}🚀 Starting up Agentic RAG API...{Style.RESET_ALL}")
     
+    # Sync-only tools run on a bounded pool so they never block the event loop
+    tool_executor = install_tool_executor()
+    DEPENDENCY_HEALTH.window = settings.READINESS_WINDOW
+    # Agent runs beyond this worker's capacity queue briefly, then are shed with 503s
+    app_state.admission = AdmissionController(
+        settings.MAX_CONCURRENT_QUERIES,
+        max_queue=settings.ADMISSION_MAX_QUEUE,
+        max_wait=settings.ADMISSION_MAX_WAIT
+    )
+    # Released in reverse order at shutdown, and by a failed startup
+    resources = AsyncExitStack()
+    resources.callback(tool_executor.shutdown, wait=False, cancel_futures=True)
+    resources.push_async_callback(close_serper_client)
+    
     try:
         # Validate settings
         logger.info(f"{Fore.YELLOW}🔍 Validating configuration...{Style.RESET_ALL}")
         settings.validate()
         logger.info(f"{Fore.GREEN}✅ Configuration validated{Style.RESET_ALL}")
         
-        # Initialize vector database (this happens during retriever tool creation)
-        logger.info(f"{Fore.YELLOW}🔄 Initializing vector database...{Style.RESET_ALL}")
-        retriever_tool = create_retriever_tool()
+        if settings.RATE_LIMIT_ENABLED:
+            app_state.rate_limiter = create_rate_limiter()
+            resources.push_async_callback(app_state.rate_limiter.close)
+            logger.info(f"{Fore.GREEN}✅ Rate limiting enabled ({settings.RATE_LIMIT_BACKEND} buckets){Style.RESET_ALL}")
+        
+        # Create every tool once (the vector database is initialized with the retriever tool)
+        logger.info(f"{Fore.YELLOW}🔄 Initializing tools and vector database...{Style.RESET_ALL}")
+        registry = create_tool_registry()
+        app_state.tool_registry = registry
+        app_state.vector_db_initialized = "langsmith_search" in registry
+        if app_state.vector_db_initialized:
+            app_state.live_index = get_live_vectorstore()
         logger.info(f"{Fore.GREEN}✅ Vector database initialized{Style.RESET_ALL}")
-        app_state.vector_db_initialized = True
         
-        # Create agent
+        # Load the prompt packer's tokenizer now, not during the first query
+        if settings.TOOL_CONTEXT_MAX_TOKENS > 0:
+            await asyncio.to_thread(load_tokenizer)
+        
+        # Create agent over the shared tools
         logger.info(f"{Fore.YELLOW}🤖 Creating AI agent...{Style.RESET_ALL}")
-        agent = create_agent()
+        agent = create_agent(registry.tools)
         app_state.agent = agent
         logger.info(f"{Fore.GREEN}✅ AI agent created successfully{Style.RESET_ALL}")
         
-        # Store tools information
-        google_search = create_google_search_tool()
-        wikipedia = create_wikipedia_tool()
-        arxiv = create_arxiv_tool()
+        # Requests with a thread_id run on a second agent that keeps conversation history
+        checkpointer = await resources.enter_async_context(open_checkpointer())
+        if checkpointer is not None:
+            app_state.thread_agent = create_agent(registry.tools, checkpointer=checkpointer)
+            logger.info(f"{Fore.GREEN}✅ Conversation threads enabled ({settings.CHECKPOINTER}){Style.RESET_ALL}")
+        
+        # Keep the index up to date in the background, swapping new versions in live
+        if app_state.live_index is not None and settings.INDEX_REFRESH_INTERVAL > 0:
+            app_state.index_refresher = IndexRefresher(
+                lambda: refresh_live_vectorstore(app_state.live_index),
+                settings.INDEX_REFRESH_INTERVAL
+            )
+            app_state.index_refresher.start()
+            resources.push_async_callback(app_state.index_refresher.stop)
+        
+        # Store tools information derived from the tool objects
+        app_state.tools_info = [ToolInfo(**info) for info in registry.describe()]
         
-        app_state.tools_info = [
-            ToolInfo(
-                name="GoogleSearch",
-                description="Search the internet for real-time information using Google Search"
-            ),
-            ToolInfo(
-                name="WikipediaSearch",
-                description="Search Wikipedia for encyclopedic information on any topic"
-            ),
-            ToolInfo(
-                name="ArxivQueryRun",
-                description="Search ArXiv for academic and research papers"
-            ),
-            ToolInfo(
-                name="langsmith_search",
-                description="Search LangSmith documentation for specific information about LangSmith"
+        # Answer cache in front of the agent
+        if settings.ANSWER_CACHE_ENABLED:
+            app_state.answer_cache = AnswerCache(
+                max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+                ttl=settings.ANSWER_CACHE_TTL,
+                embeddings=create_embeddings() if settings.ANSWER_CACHE_SEMANTIC_ENABLED else None,
+                similarity_threshold=settings.ANSWER_CACHE_SIMILARITY_THRESHOLD
             )
-        ]
+            logger.info(f"{Fore.GREEN}✅ Answer cache enabled (semantic tier: {app_state.answer_cache.semantic_enabled}){Style.RESET_ALL}")
+        
+        # Export cache hit rates with the metrics
+        if app_state.answer_cache is not None:
+            REGISTRY.register_collector("answer_cache", stats_collector("agentic_rag_answer_cache", app_state.answer_cache.stats))
+        if registry.tool_cache is not None:
+            REGISTRY.register_collector("tool_cache", stats_collector("agentic_rag_tool_cache", registry.tool_cache.stats))
+        if app_state.live_index is not None:
+            REGISTRY.register_collector("index", stats_collector("agentic_rag_index", index_stats))
+        REGISTRY.register_collector("admission", stats_collector("agentic_rag_admission", app_state.admission.stats))
+        if app_state.rate_limiter is not None:
+            REGISTRY.register_collector("rate_limit", stats_collector("agentic_rag_rate_limit", app_state.rate_limiter.stats))
+        query_cache = get_query_cache()
+        if query_cache is not None:
+            REGISTRY.register_collector("query_embedding_cache", stats_collector("agentic_rag_query_embedding_cache", query_cache.stats))
         
         logger.info(f"{Fore.GREEN}✅ {len(app_state.tools_info)} tools loaded{Style.RESET_ALL}")
         
@@ -125,21 +181,31 @@ async def lifespan(app: FastAPI):
         print(f"{Fore.GREEN}{Style.BRIGHT}📖 API Documentation: http://{settings.API_HOST}:{settings.API_PORT}/api-docs")
         print(f"{Fore.GREEN}{Style.BRIGHT}📋 OpenAPI Schema: http://{settings.API_HOST}:{settings.API_PORT}/api-docs.json")
         print(f"{Fore.GREEN}{Style.BRIGHT}❤️  Health Check: http://{settings.API_HOST}:{settings.API_PORT}/health")
+        print(f"{Fore.GREEN}{Style.BRIGHT}🚦 Probes: http://{settings.API_HOST}:{settings.API_PORT}/livez, /readyz")
+        if settings.METRICS_ENABLED:
+            print(f"{Fore.GREEN}{Style.BRIGHT}📈 Metrics: http://{settings.API_HOST}:{settings.API_PORT}/metrics")
         print(f"{Fore.GREEN}{Style.BRIGHT}{'=' * 80}\n")
         
     except Exception as e:
         logger.error(f"{Fore.RED}❌ Startup failed: {str(e)}{Style.RESET_ALL}")
+        await resources.aclose()
         raise
     
     yield
     
     # Shutdown
     logger.info(f"{Fore.YELLOW}🛑 Shutting down Agentic RAG API...{Style.RESET_ALL}")
+    if app_state.answer_cache is not None:
+        logger.info(f"Answer cache stats: {app_state.answer_cache.stats()}")
+    REGISTRY.register_collector("answer_cache", None)
+    REGISTRY.register_collector("tool_cache", None)
+    REGISTRY.register_collector("index", None)
+    REGISTRY.register_collector("query_embedding_cache", None)
+    REGISTRY.register_collector("admission", None)
+    REGISTRY.register_collector("rate_limit", None)
+    await resources.aclose()
 
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
-
 # Create FastAPI app
 app = FastAPI(
     title=settings.API_TITLE,
@@ -151,12 +217,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Add rate limiting middleware if enabled
-if settings.RATE_LIMIT_ENABLED:
-    app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-    app.add_middleware(SlowAPIMiddleware)
-    logger.info("Rate limiting enabled")
+# Time every request for the metrics endpoint
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 # Add CORS middleware if enabled
 if settings.CORS_ENABLED:
@@ -202,6 +265,8 @@ async def general_exception_handler(request: Request, exc: Exception):
 app.include_router(health_router)
 app.include_router(query_router)
 app.include_router(tools_router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
 
 
 # Root endpoint
@@ -212,7 +277,9 @@ async def root():
         "message": "Welcome to Agentic RAG API",
         "version": settings.API_VERSION,
         "docs": "/api-docs",
-        "health": "/health"
+        "health": "/health",
+        "liveness": "/livez",
+        "readiness": "/readyz"
     }
 
 
@@ -0,0 +1 @@
+"""Offline benchmarks for the Agentic RAG API (run with ``python -m benchmarks.run``)."""
@@ -0,0 +1,166 @@
+"""
+Recall-vs-latency benchmark of the search index types against exact search.
+
+Builds every index type from the same vectors, the way ``build_index`` does,
+and measures single-query latency and recall@k against the flat baseline
+over a sweep of ``nprobe``/``efSearch`` values. Uses clustered synthetic
+vectors by default, or the exact vectors of the newest stored index:
+
+    python -m benchmarks.ann
+    python -m benchmarks.ann --vectors 500000 --dim 1536 --queries 500
+    python -m benchmarks.ann --index-dir ./data/index --json ann.json
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+import faiss
+import numpy as np
+
+from retrieval.ann import build_search_index, describe_index, set_search_params
+from retrieval.index_store import INDEX_FILE, VECTORS_FILE, IndexStore
+from .loadgen import percentile
+
+# Query-time parameter sweep per index type
+SWEEPS = {
+    "flat": [{}],
+    "ivf": [{"nprobe": n} for n in (1, 4, 16, 64)],
+    "hnsw": [{"ef_search": ef} for ef in (16, 32, 64, 128)],
+    "ivfpq": [{"nprobe": n} for n in (4, 16, 64)]
+}
+
+
+def synthetic_vectors(n: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    """Return ``n`` unit vectors drawn around ``clusters`` random centers."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype("float32")
+    vectors = centers[rng.integers(0, clusters, n)] + 0.5 * rng.standard_normal((n, dim)).astype("float32")
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def stored_vectors(index_dir: str) -> np.ndarray:
+    """Return the exact vectors of the newest stored index version."""
+    store = IndexStore(index_dir)
+    manifests = store.manifests()
+    if not manifests:
+        raise SystemExit(f"No index versions in {index_dir}")
+    path = store.path_for(manifests[0]["key"])
+    exact_path = os.path.join(path, VECTORS_FILE)
+    index = faiss.read_index(exact_path if os.path.isfile(exact_path) else os.path.join(path, INDEX_FILE))
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def measure(index: faiss.Index, queries: np.ndarray, truth: np.ndarray, k: int) -> Tuple[float, List[float]]:
+    """Search one query at a time, as the retriever does; return (recall@k, latencies in seconds)."""
+    latencies = []
+    hits = 0
+    for i in range(len(queries)):
+        start = time.perf_counter()
+        _, ids = index.search(queries[i:i + 1], k)
+        latencies.append(time.perf_counter() - start)
+        hits += len(set(ids[0]) & set(truth[i]))
+    return hits / (len(queries) * k), latencies
+
+
+def run(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    k: int,
+    types: List[str],
+    params: Dict[str, int],
+    threads: int = 1
+) -> List[Dict[str, Any]]:
+    """Build each index type (on all cores) and measure every point of its sweep (on ``threads``)."""
+    build_threads = faiss.omp_get_max_threads()
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+
+    rows = []
+    for index_type in types:
+        faiss.omp_set_num_threads(build_threads)
+        start = time.perf_counter()
+        index = build_search_index(exact, index_type, **params)
+        build_s = time.perf_counter() - start
+        size_mib = faiss.serialize_index(index).nbytes / (1024 * 1024)
+        faiss.omp_set_num_threads(threads)
+
+        for sweep in SWEEPS[index_type]:
+            applied = set_search_params(index, **sweep)
+            recall, latencies = measure(index, queries, truth, k)
+            rows.append({
+                "index_type": index_type,
+                "index": describe_index(index),
+                "params": applied,
+                "build_s": round(build_s, 2),
+                "size_mib": round(size_mib, 1),
+                f"recall_at_{k}": round(recall, 4),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+                "qps": round(len(latencies) / sum(latencies), 1)
+            })
+    return rows
+
+
+def print_report(rows: List[Dict[str, Any]], k: int, n: int, dim: int) -> None:
+    """Print the results as a table."""
+    print()
+    print(f"{n} vectors x {dim} dims, recall@{k} against exact search, single-query latency")
+    print("-" * 104)
+    print(f"{'Index':<26}{'Params':<18}{'Build s':>9}{'MiB':>9}{'Recall':>9}{'p50 ms':>10}{'p99 ms':>10}{'QPS':>11}")
+    print("-" * 104)
+    for row in rows:
+        params = ", ".join(f"{name}={value}" for name, value in row["params"].items()) or "-"
+        print(
+            f"{row['index']:<26}{params:<18}{row['build_s']:>9.2f}{row['size_mib']:>9.1f}"
+            f"{row[f'recall_at_{k}']:>9.3f}{row['p50_ms']:>10.3f}{row['p99_ms']:>10.3f}{row['qps']:>11.1f}"
+        )
+    print("-" * 104)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Search index recall-vs-latency benchmark")
+    parser.add_argument("--vectors", type=int, default=100_000, help="Synthetic corpus size")
+    parser.add_argument("--dim", type=int, default=384, help="Synthetic vector dimensions")
+    parser.add_argument("--clusters", type=int, default=200, help="Synthetic topic clusters")
+    parser.add_argument("--index-dir", help="Benchmark the newest stored index's vectors instead")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=4, help="Neighbours per query (RETRIEVER_K)")
+    parser.add_argument("--types", default="flat,ivf,hnsw,ivfpq", help="Comma-separated index types")
+    parser.add_argument("--nlist", type=int, default=0, help="IVF lists (0 = auto)")
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    parser.add_argument("--pq-m", type=int, default=0, help="PQ sub-quantizers (0 = auto)")
+    parser.add_argument("--threads", type=int, default=1, help="FAISS threads (1 matches a busy server)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this JSON file")
+    options = parser.parse_args()
+
+    if options.index_dir:
+        corpus = stored_vectors(options.index_dir)
+        # Queries are held-out copies of stored vectors with a little noise
+        rng = np.random.default_rng(options.seed)
+        queries = corpus[rng.integers(0, len(corpus), options.queries)]
+        queries = queries + 0.05 * rng.standard_normal(queries.shape).astype("float32")
+    else:
+        data = synthetic_vectors(options.vectors + options.queries, options.dim, options.clusters, options.seed)
+        corpus, queries = data[:options.vectors], data[options.vectors:]
+    queries = np.ascontiguousarray(queries, dtype="float32")
+
+    types = [t.strip() for t in options.types.split(",") if t.strip()]
+    params = {"nlist": options.nlist, "hnsw_m": options.hnsw_m, "pq_m": options.pq_m}
+    rows = run(corpus, queries, options.k, types, params, options.threads)
+
+    print_report(rows, options.k, len(corpus), corpus.shape[1])
+    if options.json_path:
+        with open(options.json_path, "w") as f:
+            json.dump({"options": vars(options), "vectors": len(corpus), "dim": int(corpus.shape[1]), "results": rows}, f, indent=2)
+        print(f"Results written to {options.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Deterministic stand-ins for the LLM, embeddings and external tools.
+
+``install_fakes`` patches the application's seams so ``app:app`` boots and
+answers queries with no network access. It must be called before ``app``
+is imported, after the benchmark environment variables are set.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Iterator, List
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.documents import Document
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# Keywords that make the fake model call a tool (first match wins per tool)
+TOOL_KEYWORDS = {
+    "langsmith_search": ("langsmith", "tracing", "evaluation"),
+    "arxiv": ("paper", "research", "arxiv"),
+    "GoogleSearch": ("latest", "news", "today"),
+    "WikipediaSearch": ("history", "what is", "who")
+}
+
+# Question templates cycling through every tool and a two-tool turn
+QUESTION_TEMPLATES = (
+    "What is LangSmith tracing? ({n})",
+    "Find a research paper on retrieval augmented generation ({n})",
+    "What is the latest news about vector databases? ({n})",
+    "Tell me the history of the printing press ({n})",
+    "Who wrote the LangSmith evaluation paper? ({n})"
+)
+
+
+def make_question(n: int) -> str:
+    """Return the ``n``-th benchmark question."""
+    return QUESTION_TEMPLATES[n % len(QUESTION_TEMPLATES)].format(n=n)
+
+
+def _count_tokens(text: str) -> int:
+    return max(1, len(text.split()))
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model that picks tools by keyword and answers from tool results.
+
+    On a user turn it requests every tool whose keywords appear in the
+    question (or answers directly if none match); once tool results are in,
+    it answers with a short summary of them. Each call sleeps for
+    ``latency`` seconds (``time.sleep`` on the sync path, ``asyncio.sleep``
+    on the async path) and reports usage metadata.
+    """
+
+    latency: float = 0.0
+    answer_words: int = 40
+
+    @property
+    def _llm_type(self) -> str:
+        return "benchmark-fake"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "FakeChatModel":
+        return self
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        prompt_tokens = sum(_count_tokens(str(m.content)) for m in messages)
+        last = messages[-1]
+        if isinstance(last, HumanMessage):
+            question = str(last.content).lower()
+            tool_calls = [
+                {"name": name, "args": {"query": str(last.content)[:100]}, "id": f"call_{i}_{name}"}
+                for i, name in enumerate(
+                    name for name, keywords in TOOL_KEYWORDS.items()
+                    if any(keyword in question for keyword in keywords)
+                )
+            ]
+            if tool_calls:
+                return AIMessage(
+                    content="",
+                    tool_calls=tool_calls,
+                    usage_metadata={"input_tokens": prompt_tokens, "output_tokens": 10 * len(tool_calls), "total_tokens": prompt_tokens + 10 * len(tool_calls)}
+                )
+
+        sources = [m.name or "tool" for m in messages if isinstance(m, ToolMessage)]
+        words = ["Benchmark", "answer", "based", "on"] + (sources or ["no", "tools"])
+        words += ["lorem"] * max(0, self.answer_words - len(words))
+        content = " ".join(words)
+        completion_tokens = _count_tokens(content)
+        return AIMessage(
+            content=content,
+            usage_metadata={"input_tokens": prompt_tokens, "output_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    def _chunks(self, message: AIMessage) -> List[AIMessageChunk]:
+        if message.tool_calls:
+            return [AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+                    for i, call in enumerate(message.tool_calls)
+                ],
+                usage_metadata=message.usage_metadata
+            )]
+        words = message.content.split(" ")
+        chunks = [AIMessageChunk(content=word if i == 0 else " " + word) for i, word in enumerate(words)]
+        chunks[-1].usage_metadata = message.usage_metadata
+        return chunks
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        chunks = self._chunks(self._respond(messages))
+        for chunk in chunks:
+            time.sleep(self.latency / len(chunks))
+            if run_manager and chunk.content:
+                run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        chunks = self._chunks(self._respond(messages))
+        for chunk in chunks:
+            await asyncio.sleep(self.latency / len(chunks))
+            if run_manager and chunk.content:
+                await run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+
+def synthetic_documents(count: int = 50) -> List[Document]:
+    """Return ``count`` deterministic documentation pages for the retriever index."""
+    topics = ("tracing", "evaluation", "datasets", "prompts", "monitoring")
+    return [
+        Document(
+            page_content=" ".join(
+                f"LangSmith {topics[i % len(topics)]} page {i} paragraph {p}: "
+                "how to instrument, inspect and debug LLM applications."
+                for p in range(20)
+            ),
+            metadata={"source": f"https://docs.example.com/page-{i}"}
+        )
+        for i in range(count)
+    ]
+
+
+def install_fakes(llm_latency: float = 0.0, tool_latency: float = 0.0, embedding_size: int = 256) -> None:
+    """
+    Replace the LLM, embeddings, documentation pages and Wikipedia/ArXiv APIs.
+
+    Google Search is not patched: point SERPER_BASE_URL at
+    ``tools.serper_stub`` so searches still go through the pooled client.
+
+    Args:
+        llm_latency: Seconds each LLM call takes
+        tool_latency: Seconds each Wikipedia/ArXiv call blocks its thread
+        embedding_size: Dimension of the fake embeddings
+    """
+    from langchain_community.utilities import ArxivAPIWrapper, WikipediaAPIWrapper
+
+    import agents.agentic_rag as agentic_rag
+    import retrieval.vectorstore as vectorstore
+    from retrieval import StaticSource
+
+    def create_embeddings():
+        return DeterministicFakeEmbedding(size=embedding_size)
+
+    def fake_api_run(source: str):
+        def run(self, query: str) -> str:
+            time.sleep(tool_latency)
+            return f"{source} result for {query}: " + "content " * 50
+        return run
+
+    vectorstore.create_embeddings = create_embeddings
+    vectorstore.create_page_source = lambda: StaticSource(synthetic_documents())
+    WikipediaAPIWrapper.run = fake_api_run("Wikipedia")
+    ArxivAPIWrapper.run = fake_api_run("ArXiv")
+    agentic_rag.init_chat_model = lambda *args, **kwargs: FakeChatModel(latency=llm_latency)
+
+    import retrieval
+    retrieval.create_embeddings = create_embeddings
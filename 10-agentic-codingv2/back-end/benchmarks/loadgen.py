@@ -0,0 +1,178 @@
+"""Closed-loop load generator and latency statistics."""
+
+import asyncio
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Return the nearest-rank percentile of ``values`` (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class ScenarioResult:
+    """Outcome of one benchmark scenario."""
+
+    name: str
+    concurrency: int
+    requests: int = 0
+    errors: int = 0
+    items: int = 0
+    duration_s: float = 0.0
+    latencies_s: List[float] = field(default_factory=list)
+    first_event_s: List[float] = field(default_factory=list)
+    memory: Dict[str, Any] = field(default_factory=dict)
+    error_samples: List[str] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return throughput, latency percentiles (ms) and memory."""
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 1) if value is not None else None
+
+        summary = {
+            "scenario": self.name,
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput_rps": round(self.requests / self.duration_s, 2) if self.duration_s else None,
+            "p50_ms": ms(percentile(self.latencies_s, 50)),
+            "p95_ms": ms(percentile(self.latencies_s, 95)),
+            "p99_ms": ms(percentile(self.latencies_s, 99)),
+            "max_ms": ms(max(self.latencies_s) if self.latencies_s else None)
+        }
+        if self.items:
+            summary["items_per_s"] = round(self.items / self.duration_s, 2) if self.duration_s else None
+        if self.first_event_s:
+            summary["first_event_p50_ms"] = ms(percentile(self.first_event_s, 50))
+            summary["first_event_p95_ms"] = ms(percentile(self.first_event_s, 95))
+        summary.update(self.memory)
+        if self.error_samples:
+            summary["error_samples"] = self.error_samples
+        return summary
+
+
+# A request function performs one request and returns (ok, first_event_s or None, items)
+RequestFn = Callable[[httpx.AsyncClient, int], Awaitable[tuple]]
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    name: str,
+    request_fn: RequestFn,
+    total: int,
+    concurrency: int
+) -> ScenarioResult:
+    """
+    Issue ``total`` requests from ``concurrency`` closed-loop workers.
+
+    Each worker sends its next request as soon as the previous one finishes,
+    so throughput reflects how fast the server completes requests rather
+    than an offered arrival rate.
+
+    Args:
+        client: HTTP client pointed at the server
+        name: Scenario name for the report
+        request_fn: Coroutine issuing request number ``i``
+        total: Number of requests
+        concurrency: Number of concurrent workers
+
+    Returns:
+        ScenarioResult with per-request latencies
+    """
+    result = ScenarioResult(name=name, concurrency=concurrency)
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                ok, first_event, items = await request_fn(client, i)
+            except Exception as e:
+                ok, first_event, items = False, None, 0
+                if len(result.error_samples) < 5:
+                    result.error_samples.append(f"{type(e).__name__}: {e}")
+            result.latencies_s.append(time.perf_counter() - start)
+            result.requests += 1
+            result.items += items
+            if not ok:
+                result.errors += 1
+            if first_event is not None:
+                result.first_event_s.append(first_event - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, total)))))
+    result.duration_s = time.perf_counter() - start
+    return result
+
+
+async def probe_during(
+    client: httpx.AsyncClient,
+    path: str,
+    load: Awaitable[ScenarioResult],
+    interval: float = 0.01
+) -> tuple:
+    """
+    Poll ``path`` sequentially while ``load`` runs.
+
+    A cheap endpoint that slows down under load means the event loop is
+    being blocked (e.g. by sync work on the loop thread), so the probe's tail
+    latency is the loop-blocking signal.
+
+    Returns:
+        Tuple of (load result, probe ScenarioResult)
+    """
+    probe = ScenarioResult(name=f"{path} during load", concurrency=1)
+    task = asyncio.ensure_future(load)
+    start = time.perf_counter()
+    while not task.done():
+        request_start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            ok = response.status_code == 200
+        except Exception:
+            ok = False
+        probe.latencies_s.append(time.perf_counter() - request_start)
+        probe.requests += 1
+        if not ok:
+            probe.errors += 1
+        await asyncio.sleep(interval)
+    probe.duration_s = time.perf_counter() - start
+    return await task, probe
+
+
+async def read_sse_stream(response: httpx.Response) -> tuple:
+    """Consume an SSE response; return (saw_done, first_event_time)."""
+    first_event = None
+    saw_done = False
+    async for line in response.aiter_lines():
+        if line.startswith("event:"):
+            if first_event is None:
+                first_event = time.perf_counter()
+            if line.split(":", 1)[1].strip() == "done":
+                saw_done = True
+    return saw_done, first_event
+
+
+async def read_ndjson_stream(response: httpx.Response) -> tuple:
+    """Consume an NDJSON response; return (error_count, first_line_time, line_count)."""
+    first_line = None
+    errors = lines = 0
+    async for line in response.aiter_lines():
+        if not line.strip():
+            continue
+        if first_line is None:
+            first_line = time.perf_counter()
+        lines += 1
+        if json.loads(line).get("error"):
+            errors += 1
+    return errors, first_line, lines
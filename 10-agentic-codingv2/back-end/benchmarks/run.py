@@ -0,0 +1,253 @@
+"""
+Offline benchmark for the Agentic RAG API.
+
+Starts the Serper stub and ``app:app`` with a fake LLM, fake embeddings and
+stubbed tools in subprocesses, then drives the endpoints at a controlled
+concurrency and reports startup time, throughput, p50/p95/p99 latency and
+server memory. No network access or API keys are needed:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --requests 500 --concurrency 64 --llm-latency 0.5 --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .fakes import make_question
+from .loadgen import (
+    ScenarioResult,
+    probe_during,
+    read_ndjson_stream,
+    read_sse_stream,
+    run_load
+)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = ("health", "query", "query_repeat", "stream", "batch")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start(args: List[str], log_path: str, env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    with open(log_path, "w") as log:
+        return subprocess.Popen(
+            [sys.executable, "-m"] + args,
+            cwd=BACKEND_DIR,
+            env=dict(os.environ, **(env or {})),
+            stdout=log,
+            stderr=subprocess.STDOUT
+        )
+
+
+def _wait_until_ready(url: str, process: subprocess.Popen, timeout: float, log_path: str) -> float:
+    """Poll ``url`` until it answers 200; return the seconds it took."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"Process exited with code {process.returncode}; see {log_path}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return time.perf_counter() - start
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    raise RuntimeError(f"{url} not ready after {timeout}s; see {log_path}")
+
+
+def _stop(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def _query(client: httpx.AsyncClient, i: int, offset: int = 0) -> tuple:
+    response = await client.post("/query", json={"question": make_question(offset + i)})
+    return response.status_code == 200, None, 0
+
+
+async def _stream(client: httpx.AsyncClient, i: int, offset: int = 0) -> tuple:
+    async with client.stream("POST", "/query/stream", json={"question": make_question(offset + i)}) as response:
+        if response.status_code != 200:
+            return False, None, 0
+        saw_done, first_event = await read_sse_stream(response)
+        return saw_done, first_event, 0
+
+
+async def run_scenarios(base_url: str, options: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Run the selected scenarios against a running server."""
+    limits = httpx.Limits(max_connections=options.concurrency + 8, max_keepalive_connections=options.concurrency + 8)
+    timeout = httpx.Timeout(options.timeout)
+    results: List[ScenarioResult] = []
+    # Every scenario gets fresh questions so answer cache hits are deliberate
+    offset = 0
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        async def memory() -> Dict[str, Any]:
+            return (await client.get("/__bench/memory")).json()
+
+        async def health(c, i):
+            response = await c.get("/health")
+            return response.status_code == 200, None, 0
+
+        for name in options.scenarios:
+            if name == "health":
+                result = await run_load(client, "health", health, options.requests, options.concurrency)
+                results.append(result)
+
+            elif name == "query":
+                load = run_load(client, "query", lambda c, i, o=offset: _query(c, i, o), options.requests, options.concurrency)
+                result, probe = await probe_during(client, "/health", load)
+                offset += options.requests
+                results.extend([result, probe])
+
+            elif name == "query_repeat":
+                # Same small question set over and over: exercises the answer cache
+                pool = max(1, options.requests // 20)
+                load = run_load(
+                    client, "query (repeated)",
+                    lambda c, i, o=offset: _query(c, i % pool, o),
+                    options.requests, options.concurrency
+                )
+                result = await load
+                offset += pool
+                results.append(result)
+
+            elif name == "stream":
+                load = run_load(client, "stream", lambda c, i, o=offset: _stream(c, i, o), options.requests, options.concurrency)
+                result, probe = await probe_during(client, "/health", load)
+                offset += options.requests
+                results.extend([result, probe])
+
+            elif name == "batch":
+                size = options.batch_size
+                batches = max(1, options.requests // size)
+
+                async def batch(c, i, o=offset):
+                    items = [{"question": make_question(o + i * size + j)} for j in range(size)]
+                    async with c.stream("POST", "/query/batch", json={"items": items}) as response:
+                        if response.status_code != 200:
+                            return False, None, 0
+                        errors, first_line, lines = await read_ndjson_stream(response)
+                        return errors == 0 and lines == size, first_line, lines
+
+                concurrency = max(1, options.concurrency // size)
+                result = await run_load(client, f"batch x{size}", batch, batches, concurrency)
+                offset += batches * size
+                results.append(result)
+
+            else:
+                raise ValueError(f"Unknown scenario: {name}")
+
+            result.memory = await memory()
+
+    return [result.summary() for result in results]
+
+
+def print_report(startup: Dict[str, float], summaries: List[Dict[str, Any]]) -> None:
+    """Print the results as a table."""
+    print()
+    print("=" * 112)
+    print(f"Startup: cold {startup['cold_s']:.2f}s (index build)   warm {startup['warm_s']:.2f}s (index load)")
+    print("=" * 112)
+    header = f"{'Scenario':<24}{'Conc':>6}{'Reqs':>7}{'Err':>5}{'RPS':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'1st ev p50':>12}{'RSS MiB':>10}{'Peak':>9}"
+    print(header)
+    print("-" * 112)
+    for s in summaries:
+        def fmt(value, width, spec=".1f"):
+            return f"{'-' if value is None else format(value, spec):>{width}}"
+        print(
+            f"{s['scenario']:<24}{s['concurrency']:>6}{s['requests']:>7}{s['errors']:>5}"
+            f"{fmt(s.get('items_per_s') or s['throughput_rps'], 9, '.2f')}"
+            f"{fmt(s['p50_ms'], 10)}{fmt(s['p95_ms'], 10)}{fmt(s['p99_ms'], 10)}"
+            f"{fmt(s.get('first_event_p50_ms'), 12)}{fmt(s.get('rss_mib'), 10)}{fmt(s.get('peak_rss_mib'), 9)}"
+        )
+        for sample in s.get("error_samples", []):
+            print(f"    ! {sample}")
+    print("-" * 112)
+    print("Batch rows report items/s as RPS. A slow '/health during load' row means the event loop is being blocked.")
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Offline Agentic RAG API benchmark")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--batch-size", type=int, default=10, help="Items per /query/batch request")
+    parser.add_argument("--llm-latency", type=float, default=0.1, help="Seconds per fake LLM call")
+    parser.add_argument("--tool-latency", type=float, default=0.2, help="Seconds per fake Wikipedia/ArXiv call")
+    parser.add_argument("--search-latency", type=float, default=0.1, help="Seconds per Serper stub response")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this JSON file")
+    parser.add_argument(
+        "--env", action="append", default=[], metavar="KEY=VALUE",
+        help="Extra environment for the server, e.g. --env TOOL_CACHE_ENABLED=false"
+    )
+    options = parser.parse_args()
+    options.scenarios = [s.strip() for s in options.scenarios.split(",") if s.strip()]
+
+    workdir = tempfile.mkdtemp(prefix="agentic-rag-bench-")
+    serper_port, api_port = _free_port(), _free_port()
+    serper_url = f"http://127.0.0.1:{serper_port}"
+    base_url = f"http://127.0.0.1:{api_port}"
+    server_env = dict(item.split("=", 1) for item in options.env)
+    server_args = [
+        "benchmarks.server", "--port", str(api_port),
+        "--llm-latency", str(options.llm_latency),
+        "--tool-latency", str(options.tool_latency),
+        "--serper-url", serper_url,
+        "--index-dir", os.path.join(workdir, "index")
+    ]
+    print(f"Logs: {workdir}")
+
+    serper_log = os.path.join(workdir, "serper.log")
+    serper = _start(
+        ["tools.serper_stub", "--port", str(serper_port), "--latency", str(options.search_latency)],
+        serper_log
+    )
+    server = None
+    try:
+        _wait_until_ready(f"{serper_url}/docs", serper, options.startup_timeout, serper_log)
+
+        # Cold start builds the index; the warm start loads it from disk
+        startup = {}
+        for phase in ("cold", "warm"):
+            server_log = os.path.join(workdir, f"server-{phase}.log")
+            server = _start(server_args, server_log, server_env)
+            startup[f"{phase}_s"] = _wait_until_ready(f"{base_url}/health", server, options.startup_timeout, server_log)
+            if phase == "cold":
+                _stop(server)
+
+        summaries = asyncio.run(run_scenarios(base_url, options))
+    finally:
+        if server is not None:
+            _stop(server)
+        _stop(serper)
+
+    print_report(startup, summaries)
+    if options.json_path:
+        with open(options.json_path, "w") as f:
+            json.dump({"options": vars(options), "startup": startup, "scenarios": summaries}, f, indent=2)
+        print(f"Results written to {options.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Run ``app:app`` with the benchmark fakes installed.
+
+Started by ``benchmarks.run``; can also be run by hand to poke at the fake
+deployment:
+
+    python -m benchmarks.server --port 9393 --llm-latency 0.2 --tool-latency 0.3
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+
+
+def _memory_usage() -> dict:
+    """Return current and peak resident memory of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB on Linux
+    peak_mib = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    rss_mib = None
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss_mib = int(line.split()[1]) / 1024
+                    break
+    except OSError:
+        pass
+    return {"rss_mib": rss_mib, "peak_rss_mib": peak_mib}
+
+
+def main():
+    """Configure the environment, install the fakes and serve the app."""
+    parser = argparse.ArgumentParser(description="Agentic RAG API with fake LLM, embeddings and tools")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9393)
+    parser.add_argument("--llm-latency", type=float, default=0.1, help="Seconds per LLM call")
+    parser.add_argument("--tool-latency", type=float, default=0.2, help="Seconds per Wikipedia/ArXiv call")
+    parser.add_argument("--serper-url", default="http://127.0.0.1:9191", help="Base URL of tools.serper_stub")
+    parser.add_argument("--index-dir", default=None, help="Vector index directory (default: a new temp dir)")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so the environment comes first
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ.setdefault("SERPER_API_KEY", "benchmark")
+    os.environ["SERPER_BASE_URL"] = args.serper_url
+    os.environ["INDEX_DIR"] = args.index_dir or tempfile.mkdtemp(prefix="bench-index-")
+    os.environ.setdefault("USER_AGENT", "agentic-rag-benchmark")
+
+    from benchmarks.fakes import install_fakes
+    install_fakes(llm_latency=args.llm_latency, tool_latency=args.tool_latency)
+
+    import uvicorn
+    from app import app
+
+    @app.get("/__bench/memory", include_in_schema=False)
+    async def memory():
+        return _memory_usage()
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Agentic RAG - Index Builder
+
+Prebuilds the LangSmith documentation vector index into INDEX_DIR so the
+API can memory-map it at startup instead of crawling and embedding.
+Later runs only re-embed pages that changed since the newest stored version.
+Run it at image-build time or from a cron job:
+
+    python build_index.py [--force] [--index-dir DIR]
+"""
+
+import argparse
+import logging
+import sys
+
+from config.settings import settings
+from retrieval import IndexStore, build_index, create_embeddings
+
+
+def main() -> int:
+    """Parse arguments and build the index. Returns the process exit code."""
+    parser = argparse.ArgumentParser(description="Prebuild the LangSmith documentation index")
+    parser.add_argument(
+        "--index-dir",
+        default=settings.INDEX_DIR,
+        help=f"Directory of the index store (default: {settings.INDEX_DIR})"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-embed every page, ignoring stored versions"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    try:
+        settings.validate()
+        store = IndexStore(args.index_dir)
+        key = build_index(store, create_embeddings(), force=args.force)
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Index build failed: {e}", exc_info=True)
+        return 1
+
+    print(f"Index version {key} available at {store.path_for(key)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
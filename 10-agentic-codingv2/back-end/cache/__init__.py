@@ -0,0 +1,17 @@
+from .lru import TTLCache
+from .answer_cache import AnswerCache, normalize_question
+from .tool_cache import SQLiteResultStore, ToolResultCache, cached_tool
+from .embedding_cache import QueryEmbeddingCache, SQLiteEmbeddingStore, embedding_key, normalize_query
+
+__all__ = [
+    'TTLCache',
+    'AnswerCache',
+    'normalize_question',
+    'SQLiteResultStore',
+    'ToolResultCache',
+    'cached_tool',
+    'SQLiteEmbeddingStore',
+    'embedding_key',
+    'QueryEmbeddingCache',
+    'normalize_query'
+]
@@ -0,0 +1,205 @@
+"""Exact and semantic cache for agent answers."""
+
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import faiss
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from .lru import TTLCache
+
+# Number of nearest neighbours inspected by the semantic tier
+SEMANTIC_CANDIDATES = 8
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalize a question for exact cache lookups.
+
+    Applies Unicode NFKC folding, case folding, whitespace collapsing and
+    strips surrounding punctuation, so "What is LangSmith?" and
+    "what is  langsmith" share a key.
+    """
+    text = unicodedata.normalize("NFKC", question).casefold()
+    text = _WHITESPACE.sub(" ", text).strip()
+    return text.strip(" ?!.,;:'\"")
+
+
+def _params_key(params: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    return tuple(sorted(params.items()))
+
+
+class AnswerCache:
+    """
+    Answer cache keyed by normalized question plus generation parameters.
+
+    The exact tier is a TTL/LRU mapping from ``(normalized question, params)``
+    to the cached answer. When ``embeddings`` are given, a semantic tier
+    keeps a FAISS inner-product index over the normalized question vectors of
+    the cached entries; a lookup that misses the exact tier returns the entry
+    of the most similar question with identical parameters if its cosine
+    similarity is at least ``similarity_threshold``. Evicted or expired
+    entries are removed from both tiers.
+
+    Args:
+        max_entries: Maximum number of cached answers
+        ttl: Time-to-live of an answer in seconds
+        embeddings: Embeddings for the semantic tier (None disables it)
+        similarity_threshold: Minimum cosine similarity for a semantic hit
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: Optional[float],
+        embeddings: Optional[Embeddings] = None,
+        similarity_threshold: float = 0.95
+    ):
+        self._entries: TTLCache[Any] = TTLCache(max_entries, ttl, on_evict=self._on_evict)
+        self._embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+
+        self._lock = threading.Lock()
+        self._index = None
+        self._next_id = 0
+        self._ids: Dict[Hashable, int] = {}
+        self._keys: Dict[int, Hashable] = {}
+        # Query vectors computed during a missed lookup, reused when the answer is stored
+        self._pending_vectors: TTLCache[np.ndarray] = TTLCache(max_entries, ttl=600)
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        """Whether the embedding-similarity tier is active."""
+        return self._embeddings is not None
+
+    async def aget(self, question: str, params: Dict[str, Any]) -> Optional[Any]:
+        """
+        Look up a cached answer.
+
+        Args:
+            question: The question as asked
+            params: Generation parameters the answer must have been produced with
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        normalized = normalize_question(question)
+        key = (normalized, _params_key(params))
+
+        value = self._entries.get(key)
+        if value is not None:
+            self.exact_hits += 1
+            return value
+
+        if self.semantic_enabled and len(self._ids) > 0:
+            vector = await self._embed(normalized)
+            value = self._search(vector, key[1])
+            if value is not None:
+                self.semantic_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def aset(self, question: str, params: Dict[str, Any], value: Any) -> None:
+        """
+        Store an answer.
+
+        Args:
+            question: The question as asked
+            params: Generation parameters the answer was produced with
+            value: Value to cache
+        """
+        normalized = normalize_question(question)
+        key = (normalized, _params_key(params))
+        self._entries.set(key, value)
+
+        if self.semantic_enabled:
+            vector = self._pending_vectors.peek(normalized)
+            if vector is None:
+                vector = await self._embed(normalized)
+            self._pending_vectors.delete(normalized)
+            self._add_vector(key, vector)
+
+    async def _embed(self, normalized: str) -> np.ndarray:
+        vector = self._pending_vectors.peek(normalized)
+        if vector is None:
+            embedding = await self._embeddings.aembed_query(normalized)
+            vector = np.asarray([embedding], dtype="float32")
+            faiss.normalize_L2(vector)
+            self._pending_vectors.set(normalized, vector)
+        return vector
+
+    def _search(self, vector: np.ndarray, params_key: Tuple) -> Optional[Any]:
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                return None
+            k = min(SEMANTIC_CANDIDATES, self._index.ntotal)
+            scores, ids = self._index.search(vector, k)
+            candidates: List[Hashable] = []
+            for score, vector_id in zip(scores[0], ids[0]):
+                if vector_id < 0 or score < self.similarity_threshold:
+                    break
+                key = self._keys.get(int(vector_id))
+                if key is not None and key[1] == params_key:
+                    candidates.append(key)
+
+        for key in candidates:
+            value = self._entries.get(key)
+            if value is not None:
+                return value
+        return None
+
+    def _add_vector(self, key: Hashable, vector: np.ndarray) -> None:
+        # The entry may already have been evicted by a concurrent store
+        if key not in self._entries:
+            return
+        with self._lock:
+            if self._index is None:
+                self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(vector.shape[1]))
+            old_id = self._ids.pop(key, None)
+            if old_id is not None:
+                self._keys.pop(old_id, None)
+                self._index.remove_ids(np.asarray([old_id], dtype="int64"))
+            vector_id = self._next_id
+            self._next_id += 1
+            self._index.add_with_ids(vector, np.asarray([vector_id], dtype="int64"))
+            self._ids[key] = vector_id
+            self._keys[vector_id] = key
+
+    def _on_evict(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            vector_id = self._ids.pop(key, None)
+            if vector_id is None:
+                return
+            self._keys.pop(vector_id, None)
+            if self._index is not None:
+                self._index.remove_ids(np.asarray([vector_id], dtype="int64"))
+
+    def clear(self) -> None:
+        """Drop all cached answers."""
+        self._entries.clear()
+        self._pending_vectors.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for both tiers."""
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        entry_stats = self._entries.stats()
+        return {
+            "lookups": lookups,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+            "size": entry_stats["size"],
+            "evictions": entry_stats["evictions"],
+            "expirations": entry_stats["expirations"]
+        }
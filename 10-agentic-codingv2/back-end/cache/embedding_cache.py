@@ -0,0 +1,238 @@
+"""On-disk cache of document embedding vectors and LRU cache of query vectors."""
+
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+from .lru import TTLCache
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Query vectors are pruned down to their row limit once per this many writes
+QUERY_PRUNE_INTERVAL = 100
+
+
+def embedding_key(model: str, dimensions: Optional[int], text: str) -> str:
+    """
+    Build the cache key of one text's embedding.
+
+    Args:
+        model: Embedding model name
+        dimensions: Requested output dimensions (None for the model default)
+        text: The embedded text
+
+    Returns:
+        Hex digest identifying the vector
+    """
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model}:{dimensions or 'default'}:{text_hash}"
+
+
+class SQLiteEmbeddingStore:
+    """
+    Embedding vectors keyed by model, dimensions and text hash.
+
+    A text's embedding never changes for a given model and output size, so
+    entries do not expire: re-embedding unchanged text is a local lookup.
+    The file can be shared by ingestion jobs and API workers on one host.
+
+    Query vectors live in a separate table. Unlike document chunks, search
+    queries are unbounded user input, so that table keeps only the
+    ``max_queries`` most recently stored rows.
+
+    Args:
+        path: Path of the SQLite database file
+        max_queries: Query vectors kept (0 keeps all)
+    """
+
+    def __init__(self, path: str, max_queries: int = 0):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_queries = max(0, max_queries)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._query_writes = 0
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, stored REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS query_embeddings_stored ON query_embeddings (stored)"
+            )
+            # Query vectors of older versions were kept with the documents, without a limit
+            self._conn.execute("DELETE FROM embeddings WHERE key >= 'query:' AND key < 'query;'")
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """Return the stored vectors of ``keys`` that are present."""
+        found: Dict[str, List[float]] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            batch = list(keys[start:start + 500])
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+            for key, blob in rows:
+                found[key] = array("d", blob).tolist()
+        return found
+
+    def set_many(self, items: Dict[str, List[float]]) -> None:
+        """Store vectors by key."""
+        if not items:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, array("d", vector).tobytes()) for key, vector in items.items()]
+            )
+
+    def get_query(self, key: str) -> Optional[List[float]]:
+        """Return the stored query vector of ``key``, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT vector FROM query_embeddings WHERE key = ?", (key,)).fetchone()
+        return array("d", row[0]).tolist() if row else None
+
+    def set_query(self, key: str, vector: List[float]) -> None:
+        """Store a query vector, dropping the oldest ones beyond ``max_queries``."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO query_embeddings (key, vector, stored) VALUES (?, ?, ?)",
+                (key, array("d", vector).tobytes(), time.time())
+            )
+            self._query_writes += 1
+            if self.max_queries and self._query_writes % QUERY_PRUNE_INTERVAL == 0:
+                self._conn.execute(
+                    "DELETE FROM query_embeddings WHERE stored < "
+                    "(SELECT stored FROM query_embeddings ORDER BY stored DESC LIMIT 1 OFFSET ?)",
+                    (self.max_queries - 1,)
+                )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize a search query for query embedding lookups.
+
+    Applies Unicode NFKC folding and collapses whitespace. Case and
+    punctuation are kept because they change the embedding.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+class QueryEmbeddingCache:
+    """
+    LRU cache of query embeddings with an optional on-disk tier.
+
+    Agents issue the same search queries over and over; a hit skips the
+    embedding request entirely. Keys are built from the model, output
+    dimensions and normalized query text, and are kept apart from document
+    keys so models that embed queries differently from documents are safe.
+    Entries do not expire; the on-disk tier is bounded by the store's
+    ``max_queries``. The async methods read and write the on-disk tier in
+    a worker thread, so lookups never block the event loop.
+
+    Args:
+        max_entries: Capacity of the in-process tier
+        store: Optional on-disk tier shared with other processes on the host
+    """
+
+    def __init__(self, max_entries: int, store: Optional[SQLiteEmbeddingStore] = None):
+        self._memory: TTLCache[List[float]] = TTLCache(max_entries)
+        self._store = store
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, dimensions: Optional[int], text: str) -> str:
+        """Build the cache key of a query's embedding."""
+        return "query:" + embedding_key(model, dimensions, normalize_query(text))
+
+    def _from_memory(self, key: str) -> Optional[List[float]]:
+        vector = self._memory.get(key)
+        if vector is not None:
+            self.hits += 1
+            return list(vector)
+        return None
+
+    def _from_store(self, key: str, vector: Optional[List[float]]) -> Optional[List[float]]:
+        if vector is None:
+            self.misses += 1
+            return None
+        self._memory.set(key, vector)
+        self.store_hits += 1
+        return list(vector)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Return the cached vector for ``key``, or None."""
+        vector = self._from_memory(key)
+        if vector is not None:
+            return vector
+        return self._from_store(key, self._store.get_query(key) if self._store is not None else None)
+
+    async def aget(self, key: str) -> Optional[List[float]]:
+        """Async variant of ``get``."""
+        vector = self._from_memory(key)
+        if vector is not None:
+            return vector
+        stored = await asyncio.to_thread(self._store.get_query, key) if self._store is not None else None
+        return self._from_store(key, stored)
+
+    def set(self, key: str, vector: List[float]) -> None:
+        """Store the vector of a query in both tiers."""
+        self._memory.set(key, list(vector))
+        if self._store is not None:
+            self._store.set_query(key, vector)
+
+    async def aset(self, key: str, vector: List[float]) -> None:
+        """Async variant of ``set``."""
+        self._memory.set(key, list(vector))
+        if self._store is not None:
+            await asyncio.to_thread(self._store.set_query, key, vector)
+
+    def get_or_embed(self, key: str, embed: Callable[[], List[float]]) -> List[float]:
+        """Return the cached vector for ``key`` or compute and store it with ``embed``."""
+        vector = self.get(key)
+        if vector is None:
+            vector = embed()
+            self.set(key, vector)
+        return vector
+
+    async def aget_or_embed(self, key: str, embed: Callable[[], Awaitable[List[float]]]) -> List[float]:
+        """Async variant of ``get_or_embed``."""
+        vector = await self.aget(key)
+        if vector is None:
+            vector = await embed()
+            await self.aset(key, vector)
+        return vector
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for both tiers."""
+        lookups = self.hits + self.store_hits + self.misses
+        memory_stats = self._memory.stats()
+        return {
+            "lookups": lookups,
+            "hits": self.hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.store_hits) / lookups if lookups else 0.0,
+            "size": memory_stats["size"],
+            "evictions": memory_stats["evictions"]
+        }
@@ -0,0 +1,270 @@
+"""Result cache for external tool calls."""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from langchain_core.tools import BaseTool, StructuredTool
+from .lru import TTLCache
+
+# Config for the wrapped tool's own run: it is traced as part of the
+# wrapper's run, so it must not emit a second set of tool callbacks
+_UNTRACED = {"callbacks": []}
+
+
+class SQLiteResultStore:
+    """
+    Local on-disk tier for cached tool results.
+
+    Entries survive process restarts and are shared by all workers on the
+    same host. Expired rows are ignored on read and purged on write.
+
+    Args:
+        path: Path of the SQLite database file
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tool_results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        self._writes = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return ``(value, remaining_ttl)`` for a live entry, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM tool_results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        remaining = row[1] - time.time()
+        if remaining <= 0:
+            return None
+        return row[0], remaining
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_results (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl)
+            )
+            self._writes += 1
+            if self._writes % 500 == 0:
+                self._conn.execute("DELETE FROM tool_results WHERE expires_at <= ?", (now,))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class ToolResultCache:
+    """
+    Two-tier cache for tool results with single-flight de-duplication.
+
+    Lookups go to an in-process TTL/LRU cache first and then to the optional
+    on-disk store. Concurrent misses for the same key share one computation:
+    the first caller runs the tool while the others wait for its result.
+    Failed calls are never cached.
+
+    Args:
+        max_entries: Capacity of the in-process tier
+        store: Optional on-disk tier
+    """
+
+    def __init__(self, max_entries: int, store: Optional[SQLiteResultStore] = None):
+        self._memory: TTLCache[str] = TTLCache(max_entries)
+        self._store = store
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._sync_inflight: Dict[str, concurrent.futures.Future] = {}
+        self._sync_lock = threading.Lock()
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def make_key(tool_name: str, tool_input: Dict[str, Any]) -> str:
+        """Build the cache key for a tool call."""
+        payload = json.dumps(tool_input, sort_keys=True, default=str)
+        return f"{tool_name}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def _lookup(self, key: str) -> Optional[str]:
+        value = self._memory.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        if self._store is not None:
+            stored = self._store.get(key)
+            if stored is not None:
+                value, remaining = stored
+                self._memory.set(key, value, ttl=remaining)
+                self.store_hits += 1
+                return value
+        return None
+
+    def _save(self, key: str, value: Any, ttl: float) -> None:
+        if not isinstance(value, str):
+            return
+        self._memory.set(key, value, ttl=ttl)
+        if self._store is not None:
+            self._store.set(key, value, ttl)
+
+    async def aget_or_compute(
+        self,
+        key: str,
+        ttl: float,
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the cached result for ``key`` or compute it once.
+
+        Args:
+            key: Cache key from ``make_key``
+            ttl: Time-to-live of a computed result in seconds
+            compute: Coroutine function producing the result on a miss
+
+        Returns:
+            The cached or computed result
+        """
+        value = self._memory.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leading call was cancelled; compute again unless we were too
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    return await self.aget_or_compute(key, ttl, compute)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await asyncio.to_thread(self._lookup, key) if self._store else None
+            if value is None:
+                self.misses += 1
+                value = await compute()
+                if self._store is not None:
+                    await asyncio.to_thread(self._save, key, value, ttl)
+                else:
+                    self._save(key, value, ttl)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_or_compute(self, key: str, ttl: float, compute: Callable[[], Any]) -> Any:
+        """
+        Synchronous variant of ``aget_or_compute`` for thread-based callers.
+
+        Args:
+            key: Cache key from ``make_key``
+            ttl: Time-to-live of a computed result in seconds
+            compute: Function producing the result on a miss
+
+        Returns:
+            The cached or computed result
+        """
+        value = self._lookup(key)
+        if value is not None:
+            return value
+
+        with self._sync_lock:
+            future = self._sync_inflight.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._sync_inflight[key] = future
+
+        if not leader:
+            self.coalesced += 1
+            return future.result()
+
+        try:
+            self.misses += 1
+            value = compute()
+            self._save(key, value, ttl)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._sync_lock:
+                self._sync_inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for both tiers."""
+        lookups = self.hits + self.store_hits + self.misses
+        return {
+            "lookups": lookups,
+            "hits": self.hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.store_hits) / lookups if lookups else 0.0,
+            "size": len(self._memory)
+        }
+
+
+def cached_tool(tool: BaseTool, cache: ToolResultCache, ttl: float) -> BaseTool:
+    """
+    Wrap a tool so that its results are served from ``cache``.
+
+    The wrapper keeps the tool's name, description and argument schema, so
+    the model sees exactly the same tool.
+
+    Args:
+        tool: Tool to wrap
+        cache: Shared tool result cache
+        ttl: Time-to-live of this tool's results in seconds
+
+    Returns:
+        Caching tool with sync and async implementations
+    """
+    def _run(**kwargs: Any) -> Any:
+        key = cache.make_key(tool.name, kwargs)
+        return cache.get_or_compute(key, ttl, lambda: tool.invoke(kwargs, config=_UNTRACED))
+
+    async def _arun(**kwargs: Any) -> Any:
+        key = cache.make_key(tool.name, kwargs)
+        return await cache.aget_or_compute(key, ttl, lambda: tool.ainvoke(kwargs, config=_UNTRACED))
+
+    return StructuredTool.from_function(
+        func=_run,
+        coroutine=_arun,
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        return_direct=tool.return_direct
+    )
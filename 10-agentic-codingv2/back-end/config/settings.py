@@ -15,9 +15,18 @@ class Settings:
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o")
     OPENAI_MAX_TOKENS: int = int(os.getenv("OPENAI_MAX_TOKENS", "2000"))
     OPENAI_TEMPERATURE: float = float(os.getenv("OPENAI_TEMPERATURE", "0.1"))
+    # Models a request may select besides OPENAI_MODEL
+    OPENAI_ALLOWED_MODELS: list = [m.strip() for m in os.getenv("OPENAI_ALLOWED_MODELS", "gpt-4o-mini").split(",") if m.strip()]
     
     # Google Serper API Configuration
     SERPER_API_KEY: str = os.getenv("SERPER_API_KEY", "")
+    SERPER_BASE_URL: str = os.getenv("SERPER_BASE_URL", "https://google.serper.dev")
+    SERPER_TIMEOUT: float = float(os.getenv("SERPER_TIMEOUT", "10"))  # seconds
+    SERPER_CONNECT_TIMEOUT: float = float(os.getenv("SERPER_CONNECT_TIMEOUT", "3"))
+    SERPER_MAX_CONNECTIONS: int = int(os.getenv("SERPER_MAX_CONNECTIONS", "100"))
+    SERPER_MAX_KEEPALIVE: int = int(os.getenv("SERPER_MAX_KEEPALIVE", "20"))
+    SERPER_MAX_RETRIES: int = int(os.getenv("SERPER_MAX_RETRIES", "2"))
+    SERPER_RETRY_BACKOFF: float = float(os.getenv("SERPER_RETRY_BACKOFF", "0.25"))  # seconds
     
     # Document Processing Configuration
     CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "1000"))
@@ -33,18 +42,118 @@ class Settings:
     
     # LangSmith Document Source
     LANGSMITH_DOCS_URL: str = os.getenv("LANGSMITH_DOCS_URL", "https://docs.smith.langchain.com")
+    LANGSMITH_SITEMAP_URL: str = os.getenv("LANGSMITH_SITEMAP_URL", LANGSMITH_DOCS_URL.rstrip("/") + "/sitemap.xml")
+    INGEST_MAX_PAGES: int = int(os.getenv("INGEST_MAX_PAGES", "500"))
+    INGEST_CONCURRENCY: int = int(os.getenv("INGEST_CONCURRENCY", "8"))
+    INGEST_TIMEOUT: float = float(os.getenv("INGEST_TIMEOUT", "15"))  # seconds
+
+    # Vector Index Configuration
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "openai").lower()  # openai, local or fake
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", {
+        "local": "BAAI/bge-small-en-v1.5",
+        "fake": "fake"
+    }.get(EMBEDDING_BACKEND, "text-embedding-ada-002"))
+    EMBEDDING_DEVICE: str = os.getenv("EMBEDDING_DEVICE", "cpu")  # local backend
+    EMBEDDING_LOCAL_BATCH_SIZE: int = int(os.getenv("EMBEDDING_LOCAL_BATCH_SIZE", "32"))  # texts per forward pass
+    EMBEDDING_LOCAL_THREADS: int = int(os.getenv("EMBEDDING_LOCAL_THREADS", "0"))  # torch threads, 0 = default
+    EMBEDDING_LOCAL_WORKERS: int = int(os.getenv("EMBEDDING_LOCAL_WORKERS", "2"))  # threads serving async calls
+    EMBEDDING_QUERY_PREFIX: str = os.getenv("EMBEDDING_QUERY_PREFIX", "")  # e.g. "query: " for E5 models
+    EMBEDDING_DOCUMENT_PREFIX: str = os.getenv("EMBEDDING_DOCUMENT_PREFIX", "")  # e.g. "passage: " for E5 models
+    EMBEDDING_FAKE_SIZE: int = int(os.getenv("EMBEDDING_FAKE_SIZE", "384"))  # fake backend dimensions
+    EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", "./data/embeddings.sqlite")  # empty disables the cache
+    EMBEDDING_BATCH_MAX_TOKENS: int = int(os.getenv("EMBEDDING_BATCH_MAX_TOKENS", "100000"))  # per request
+    EMBEDDING_BATCH_MAX_TEXTS: int = int(os.getenv("EMBEDDING_BATCH_MAX_TEXTS", "512"))  # per request
+    EMBEDDING_CONCURRENCY: int = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))  # requests in flight
+    EMBEDDING_MAX_RETRIES: int = int(os.getenv("EMBEDDING_MAX_RETRIES", "5"))
+    QUERY_EMBEDDING_CACHE_SIZE: int = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "4096"))  # 0 disables
+    QUERY_EMBEDDING_CACHE_PERSIST: bool = os.getenv("QUERY_EMBEDDING_CACHE_PERSIST", "true").lower() == "true"  # in EMBEDDING_CACHE_PATH
+    QUERY_EMBEDDING_CACHE_MAX_STORED: int = int(os.getenv("QUERY_EMBEDDING_CACHE_MAX_STORED", "100000"))  # on disk, 0 = no limit
+    INDEX_DIR: str = os.getenv("INDEX_DIR", "./data/index")
+    INDEX_MMAP: bool = os.getenv("INDEX_MMAP", "true").lower() == "true"
+    INDEX_VERIFY_SOURCE: bool = os.getenv("INDEX_VERIFY_SOURCE", "false").lower() == "true"
+    INDEX_KEEP_VERSIONS: int = int(os.getenv("INDEX_KEEP_VERSIONS", "3"))
+    INDEX_REFRESH_INTERVAL: float = float(os.getenv("INDEX_REFRESH_INTERVAL", "0"))  # seconds, 0 disables
+    INDEX_REFRESH_MODE: str = os.getenv("INDEX_REFRESH_MODE", "build").lower()  # build, or follow versions built elsewhere
+    INDEX_VERSION: str = os.getenv("INDEX_VERSION", "")  # serve this stored version at startup (empty = newest match)
     
+    # Search Index Configuration
+    INDEX_TYPE: str = os.getenv("INDEX_TYPE", "flat").lower()  # flat, ivf, hnsw or ivfpq
+    INDEX_IVF_NLIST: int = int(os.getenv("INDEX_IVF_NLIST", "0"))  # 0 picks ~4*sqrt(vectors)
+    INDEX_HNSW_M: int = int(os.getenv("INDEX_HNSW_M", "32"))
+    INDEX_PQ_M: int = int(os.getenv("INDEX_PQ_M", "0"))  # 0 picks dimensions/4 (or the nearest divisor)
+    INDEX_NPROBE: int = int(os.getenv("INDEX_NPROBE", "16"))  # IVF lists searched per query
+    INDEX_EF_SEARCH: int = int(os.getenv("INDEX_EF_SEARCH", "64"))  # HNSW search breadth
+    RETRIEVER_K: int = int(os.getenv("RETRIEVER_K", "4"))
+    RETRIEVER_SCORE_THRESHOLD: float = float(os.getenv("RETRIEVER_SCORE_THRESHOLD", "0"))  # min relevance, 0 disables
+    RETRIEVER_MODE: str = os.getenv("RETRIEVER_MODE", "hybrid").lower()  # hybrid (BM25 + vectors) or dense
+    RETRIEVER_FETCH_K: int = int(os.getenv("RETRIEVER_FETCH_K", "20"))  # candidates per retriever before fusion
+    RETRIEVER_RRF_K: int = int(os.getenv("RETRIEVER_RRF_K", "60"))  # reciprocal rank fusion constant
+    RETRIEVER_DEDUPE: bool = os.getenv("RETRIEVER_DEDUPE", "true").lower() == "true"  # drop overlapping chunk text
+
     # API Configuration
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
     API_PORT: int = int(os.getenv("API_PORT", "9090"))
+    API_WORKERS: int = int(os.getenv("API_WORKERS", "1"))  # worker processes started by serve.py
     API_TITLE: str = os.getenv("API_TITLE", "Agentic RAG API")
     API_VERSION: str = os.getenv("API_VERSION", "1.0.0")
     API_DESCRIPTION: str = os.getenv("API_DESCRIPTION", "AI-powered Retrieval-Augmented Generation API with multiple search tools")
     
+    # Concurrency Configuration
+    MAX_CONCURRENT_QUERIES: int = int(os.getenv("MAX_CONCURRENT_QUERIES", "256"))  # per worker, in default-query costs
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "256"))  # queries waiting per worker before 503s
+    ADMISSION_MAX_WAIT: float = float(os.getenv("ADMISSION_MAX_WAIT", "30"))  # seconds, 0 waits indefinitely
+    TOOL_THREAD_POOL_SIZE: int = int(os.getenv("TOOL_THREAD_POOL_SIZE", "64"))
+    TOOL_MAX_PARALLEL_CALLS: int = int(os.getenv("TOOL_MAX_PARALLEL_CALLS", "4"))  # per request
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))  # questions per batch
+    
+    # Tool Timeout Configuration (seconds, 0 disables the timeout)
+    TOOL_TIMEOUT_DEFAULT: float = float(os.getenv("TOOL_TIMEOUT_DEFAULT", "30"))
+    TOOL_TIMEOUT_GOOGLE: float = float(os.getenv("TOOL_TIMEOUT_GOOGLE", "15"))
+    TOOL_TIMEOUT_WIKIPEDIA: float = float(os.getenv("TOOL_TIMEOUT_WIKIPEDIA", "15"))
+    TOOL_TIMEOUT_ARXIV: float = float(os.getenv("TOOL_TIMEOUT_ARXIV", "20"))
+    TOOL_TIMEOUT_RETRIEVER: float = float(os.getenv("TOOL_TIMEOUT_RETRIEVER", "10"))
+    
+    # Conversation Thread Configuration
+    CHECKPOINTER: str = os.getenv("CHECKPOINTER", "memory").lower()  # none, memory or sqlite
+    CHECKPOINTER_MAX_THREADS: int = int(os.getenv("CHECKPOINTER_MAX_THREADS", "1000"))  # memory backend, per worker
+    CHECKPOINT_SQLITE_PATH: str = os.getenv("CHECKPOINT_SQLITE_PATH", "./data/checkpoints.sqlite")
+    HISTORY_MAX_TOKENS: int = int(os.getenv("HISTORY_MAX_TOKENS", "4000"))  # conversation history per LLM call
+    HISTORY_COMPACTION: str = os.getenv("HISTORY_COMPACTION", "trim").lower()  # trim or summarize
+    TOOL_CONTEXT_MAX_TOKENS: int = int(os.getenv("TOOL_CONTEXT_MAX_TOKENS", "6000"))  # tool results per turn, 0 disables
+    
+    # Answer Cache Configuration
+    ANSWER_CACHE_ENABLED: bool = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+    ANSWER_CACHE_MAX_ENTRIES: int = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1000"))
+    ANSWER_CACHE_TTL: int = int(os.getenv("ANSWER_CACHE_TTL", "3600"))  # seconds
+    ANSWER_CACHE_SEMANTIC_ENABLED: bool = os.getenv("ANSWER_CACHE_SEMANTIC_ENABLED", "false").lower() == "true"
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = float(os.getenv("ANSWER_CACHE_SIMILARITY_THRESHOLD", "0.95"))
+    
+    # Tool Result Cache Configuration
+    TOOL_CACHE_ENABLED: bool = os.getenv("TOOL_CACHE_ENABLED", "true").lower() == "true"
+    TOOL_CACHE_MAX_ENTRIES: int = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "2048"))
+    TOOL_CACHE_SQLITE_PATH: str = os.getenv("TOOL_CACHE_SQLITE_PATH", "")  # empty disables the disk tier
+    TOOL_CACHE_TTL_GOOGLE: int = int(os.getenv("TOOL_CACHE_TTL_GOOGLE", "300"))  # seconds
+    TOOL_CACHE_TTL_WIKIPEDIA: int = int(os.getenv("TOOL_CACHE_TTL_WIKIPEDIA", "86400"))
+    TOOL_CACHE_TTL_ARXIV: int = int(os.getenv("TOOL_CACHE_TTL_ARXIV", "604800"))
+    
+    # Metrics Configuration
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    
+    # Readiness Probe Configuration (/readyz)
+    READINESS_WINDOW: float = float(os.getenv("READINESS_WINDOW", "60"))  # seconds of LLM/tool calls considered
+    READINESS_MIN_CALLS: int = int(os.getenv("READINESS_MIN_CALLS", "5"))  # calls needed before error rates count
+    READINESS_MAX_ERROR_RATE: float = float(os.getenv("READINESS_MAX_ERROR_RATE", "0.5"))  # of LLM (or tool) calls
+    READINESS_MAX_LLM_P95: float = float(os.getenv("READINESS_MAX_LLM_P95", "60"))  # seconds, 0 disables
+    READINESS_MAX_QUEUE_RATIO: float = float(os.getenv("READINESS_MAX_QUEUE_RATIO", "0.5"))  # of ADMISSION_MAX_QUEUE
+    
     # Rate Limiting Configuration
     RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "false").lower() == "true"
     RATE_LIMIT_REQUESTS: int = int(os.getenv("RATE_LIMIT_REQUESTS", "10"))
     RATE_LIMIT_PERIOD: int = int(os.getenv("RATE_LIMIT_PERIOD", "60"))  # seconds
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()  # memory, sqlite or redis
+    RATE_LIMIT_SQLITE_PATH: str = os.getenv("RATE_LIMIT_SQLITE_PATH", "./data/rate_limits.sqlite")
+    RATE_LIMIT_REDIS_URL: str = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_TRUST_FORWARDED: bool = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"  # key by X-Forwarded-For
     
     # CORS Configuration
     CORS_ENABLED: bool = os.getenv("CORS_ENABLED", "true").lower() == "true"
@@ -55,7 +164,28 @@ class Settings:
         """Validate that required settings are present."""
         if not cls.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY is required")
+        if cls.EMBEDDING_BACKEND not in ("openai", "local", "fake"):
+            raise ValueError(f"EMBEDDING_BACKEND must be openai, local or fake, not {cls.EMBEDDING_BACKEND!r}")
+        if cls.CHECKPOINTER not in ("none", "memory", "sqlite"):
+            raise ValueError(f"CHECKPOINTER must be none, memory or sqlite, not {cls.CHECKPOINTER!r}")
+        # Imported here: the retrieval package imports these settings
+        from retrieval.ann import INDEX_TYPES
+        if cls.INDEX_TYPE not in INDEX_TYPES:
+            raise ValueError(f"INDEX_TYPE must be one of {', '.join(INDEX_TYPES)}, not {cls.INDEX_TYPE!r}")
+        if cls.RETRIEVER_MODE not in ("hybrid", "dense"):
+            raise ValueError(f"RETRIEVER_MODE must be hybrid or dense, not {cls.RETRIEVER_MODE!r}")
+        if cls.INDEX_REFRESH_MODE not in ("build", "follow"):
+            raise ValueError(f"INDEX_REFRESH_MODE must be build or follow, not {cls.INDEX_REFRESH_MODE!r}")
+        if cls.RATE_LIMIT_BACKEND not in ("memory", "sqlite", "redis"):
+            raise ValueError(f"RATE_LIMIT_BACKEND must be memory, sqlite or redis, not {cls.RATE_LIMIT_BACKEND!r}")
+        if cls.HISTORY_COMPACTION not in ("trim", "summarize"):
+            raise ValueError(f"HISTORY_COMPACTION must be trim or summarize, not {cls.HISTORY_COMPACTION!r}")
         return True
+    
+    @classmethod
+    def allowed_models(cls) -> list:
+        """Models a request may select: the default model and the allowlist."""
+        return [cls.OPENAI_MODEL] + [m for m in cls.OPENAI_ALLOWED_MODELS if m != cls.OPENAI_MODEL]
 
 
 # Create a singleton instance
@@ -2,19 +2,35 @@
 Agentic RAG - Main Entry Point
 
 This module provides the main interface for the Agentic RAG system.
-It includes functions for both direct and streaming responses.
+It includes functions for both direct and streaming responses. All of them
+share one AgentSession, so the agent and its retriever index are built once
+per process rather than once per question.
 """
 
-from typing import Dict, Generator, Any
-from langchain_core.messages import HumanMessage
-from agents import create_agent
+from typing import Dict, Generator, Any, List, Optional
+from agents import AgentSession
+
+_session: Optional[AgentSession] = None
+
+
+def get_session() -> AgentSession:
+    """
+    Get the process-wide agent session, creating it on first use.
+
+    Returns:
+        The shared AgentSession
+    """
+    global _session
+    if _session is None:
+        _session = AgentSession()
+    return _session
 
 
 def query_agent_direct(question: str) -> Dict[str, Any]:
     """
     Query the agent and get a direct response.
     
-    This function creates an agent, sends a question, and returns
+    This function sends a question to the shared agent and returns
     the complete response in one go.
     
     Args:
@@ -27,24 +43,14 @@ def query_agent_direct(question: str) -> Dict[str, Any]:
         >>> response = query_agent_direct("Tell me about LangSmith")
         >>> print(response)
     """
-    # Create the agent
-    agent = create_agent()
-    
-    # Invoke the agent with the question
-    output = agent.invoke({
-        "messages": [
-            HumanMessage(content=question)
-        ]
-    })
-    
-    return output
+    return get_session().query(question)
 
 
 def query_agent_streaming(question: str) -> Generator[Dict[str, Any], None, None]:
     """
     Query the agent and get a streaming response.
     
-    This function creates an agent, sends a question, and yields
+    This function sends a question to the shared agent and yields
     response chunks as they are generated.
     
     Args:
@@ -58,16 +64,23 @@ def query_agent_streaming(question: str) -> Generator[Dict[str, Any], None, None
         ...     print(chunk)
         ...     print("***********")
     """
-    # Create the agent
-    agent = create_agent()
+    yield from get_session().stream(question)
+
+
+def query_agent_batch(questions: List[str]) -> List[Dict[str, Any]]:
+    """
+    Query the agent with several questions concurrently.
     
-    # Stream the agent's response
-    for stream_chunk in agent.stream({
-        "messages": [
-            HumanMessage(content=question)
-        ]
-    }):
-        yield stream_chunk
+    Args:
+        questions: The questions to send to the agent
+        
+    Returns:
+        The agent's responses, in the same order as the questions
+        
+    Example:
+        >>> responses = query_agent_batch(["What is LangSmith?", "What is FAISS?"])
+    """
+    return get_session().batch(questions)
 
 
 def main():
@@ -0,0 +1,41 @@
+from .registry import Counter, Histogram, MetricsRegistry
+from .health import DependencyHealth
+from .instruments import (
+    REGISTRY,
+    HTTP_REQUEST_DURATION,
+    QUERY_STAGE_DURATION,
+    QUERIES,
+    REJECTED_REQUESTS,
+    LLM_CALL_DURATION,
+    LLM_TOKENS,
+    TOOL_CALL_DURATION,
+    TOOL_CALLS,
+    RETRIEVER_DURATION,
+    DEPENDENCY_HEALTH,
+    stats_collector
+)
+from .callbacks import MetricsCallbackHandler
+from .middleware import MetricsMiddleware
+from .timing import StageTimer
+
+__all__ = [
+    'Counter',
+    'Histogram',
+    'MetricsRegistry',
+    'DependencyHealth',
+    'REGISTRY',
+    'HTTP_REQUEST_DURATION',
+    'QUERY_STAGE_DURATION',
+    'QUERIES',
+    'REJECTED_REQUESTS',
+    'LLM_CALL_DURATION',
+    'LLM_TOKENS',
+    'TOOL_CALL_DURATION',
+    'TOOL_CALLS',
+    'RETRIEVER_DURATION',
+    'DEPENDENCY_HEALTH',
+    'stats_collector',
+    'MetricsCallbackHandler',
+    'MetricsMiddleware',
+    'StageTimer'
+]
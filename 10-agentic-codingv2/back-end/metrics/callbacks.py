@@ -0,0 +1,154 @@
+"""Callback handler timing LLM, tool and retriever calls of an agent run."""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from .instruments import (
+    DEPENDENCY_HEALTH,
+    LLM_CALL_DURATION,
+    LLM_TOKENS,
+    RETRIEVER_DURATION,
+    TOOL_CALL_DURATION,
+    TOOL_CALLS
+)
+
+
+def _model_name(metadata: Optional[Dict[str, Any]], kwargs: Dict[str, Any]) -> str:
+    params = kwargs.get("invocation_params") or {}
+    return (
+        params.get("model")
+        or params.get("model_name")
+        or (metadata or {}).get("ls_model_name")
+        or "unknown"
+    )
+
+
+def _token_usage(response: LLMResult) -> Tuple[int, int]:
+    """Return (prompt_tokens, completion_tokens) reported for an LLM call."""
+    prompt_tokens = completion_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+    if not (prompt_tokens or completion_tokens):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+    return prompt_tokens, completion_tokens
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Record the LLM, tool and retriever calls of one agent run.
+
+    Every call is observed in the process-wide metrics. The handler also
+    sums the time spent per stage for this run only, which is what the
+    per-request ``timings`` breakdown reports. Tool calls of one model turn
+    run concurrently, so the ``tools`` total can exceed the wall time.
+
+    Pass a fresh instance per run in the run config's ``callbacks``.
+    """
+
+    # Bookkeeping only; never worth a thread hop in async runs
+    run_inline = True
+
+    def __init__(self):
+        self._starts: Dict[UUID, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self.totals: Dict[str, float] = {"llm": 0.0, "tools": 0.0, "retrieval": 0.0}
+        self.counts: Dict[str, int] = {"llm_calls": 0, "tool_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def _start(self, run_id: UUID, label: str) -> None:
+        with self._lock:
+            self._starts[run_id] = (label, time.perf_counter())
+
+    def _finish(self, run_id: UUID, stage: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            started = self._starts.pop(run_id, None)
+            if started is None:
+                return None
+            label, start = started
+            elapsed = time.perf_counter() - start
+            self.totals[stage] += elapsed
+            return label, elapsed
+
+    # LLM calls
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        self._start(run_id, _model_name(metadata, kwargs))
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        self._start(run_id, _model_name(metadata, kwargs))
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        finished = self._finish(run_id, "llm")
+        if finished is None:
+            return
+        model, elapsed = finished
+        LLM_CALL_DURATION.observe(elapsed, model=model)
+        DEPENDENCY_HEALTH.record("llm", elapsed, ok=True)
+        prompt_tokens, completion_tokens = _token_usage(response)
+        LLM_TOKENS.inc(prompt_tokens, model=model, type="prompt")
+        LLM_TOKENS.inc(completion_tokens, model=model, type="completion")
+        with self._lock:
+            self.counts["llm_calls"] += 1
+            self.counts["prompt_tokens"] += prompt_tokens
+            self.counts["completion_tokens"] += completion_tokens
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        finished = self._finish(run_id, "llm")
+        if finished is not None:
+            LLM_CALL_DURATION.observe(finished[1], model=finished[0])
+            DEPENDENCY_HEALTH.record("llm", finished[1], ok=False)
+
+    # Tool calls
+
+    def on_tool_start(self, serialized, input_str, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, kwargs.get("name") or (serialized or {}).get("name") or "unknown")
+
+    def _tool_finished(self, run_id: UUID, status: str) -> None:
+        finished = self._finish(run_id, "tools")
+        if finished is None:
+            return
+        tool, elapsed = finished
+        TOOL_CALL_DURATION.observe(elapsed, tool=tool, status=status)
+        TOOL_CALLS.inc(tool=tool, status=status)
+        DEPENDENCY_HEALTH.record(f"tool:{tool}", elapsed, ok=status == "success")
+        with self._lock:
+            self.counts["tool_calls"] += 1
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        status = "error" if getattr(output, "status", "success") == "error" else "success"
+        self._tool_finished(run_id, status)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._tool_finished(run_id, "error")
+
+    # Vector store searches
+
+    def on_retriever_start(self, serialized, query, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, "retriever")
+
+    def on_retriever_end(self, documents, *, run_id: UUID, **kwargs: Any) -> None:
+        finished = self._finish(run_id, "retrieval")
+        if finished is not None:
+            RETRIEVER_DURATION.observe(finished[1], status="success")
+
+    def on_retriever_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        finished = self._finish(run_id, "retrieval")
+        if finished is not None:
+            RETRIEVER_DURATION.observe(finished[1], status="error")
+
+    def timings(self) -> Dict[str, float]:
+        """Return this run's stage totals in milliseconds, plus call and token counts."""
+        with self._lock:
+            breakdown = {f"{stage}_ms": round(seconds * 1000, 3) for stage, seconds in self.totals.items()}
+            breakdown.update(self.counts)
+        return breakdown
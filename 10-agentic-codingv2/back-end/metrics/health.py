@@ -0,0 +1,68 @@
+"""Rolling error and latency statistics of the LLM and tool calls."""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+
+class DependencyHealth:
+    """
+    Outcomes of recent calls to each dependency (the LLM, every tool).
+
+    Calls are recorded as they finish during normal traffic, so readiness
+    is judged from what requests actually experienced; nothing is probed.
+    Only calls of the last ``window`` seconds count, and the summary is
+    cached for ``cache_ttl`` seconds so frequent probes stay cheap.
+
+    Args:
+        window: Seconds of history the statistics cover
+        max_samples: Most calls kept per dependency
+        cache_ttl: Seconds a computed summary is reused
+    """
+
+    def __init__(self, window: float = 60.0, max_samples: int = 1000, cache_ttl: float = 1.0):
+        self.window = window
+        self.max_samples = max_samples
+        self.cache_ttl = cache_ttl
+        self._calls: Dict[str, Deque[Tuple[float, float, bool]]] = {}
+        self._lock = threading.Lock()
+        self._summary: Dict[str, Dict[str, Any]] = {}
+        self._summary_at = float("-inf")
+
+    def record(self, dependency: str, elapsed: float, ok: bool) -> None:
+        """Record one finished call of ``dependency``."""
+        with self._lock:
+            calls = self._calls.get(dependency)
+            if calls is None:
+                calls = self._calls[dependency] = deque(maxlen=self.max_samples)
+            calls.append((time.monotonic(), elapsed, ok))
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return per-dependency call count, error rate and p95 latency over the window.
+
+        Returns:
+            ``{dependency: {"calls", "errors", "error_rate", "p95_seconds"}}``
+            for every dependency called within the window
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._summary_at < self.cache_ttl:
+                return self._summary
+            summary = {}
+            for dependency, calls in self._calls.items():
+                while calls and calls[0][0] < now - self.window:
+                    calls.popleft()
+                if not calls:
+                    continue
+                latencies = sorted(elapsed for _, elapsed, _ in calls)
+                errors = sum(1 for _, _, ok in calls if not ok)
+                summary[dependency] = {
+                    "calls": len(calls),
+                    "errors": errors,
+                    "error_rate": errors / len(calls),
+                    "p95_seconds": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+                }
+            self._summary, self._summary_at = summary, now
+            return summary
@@ -0,0 +1,91 @@
+"""Metrics recorded by the API and the agent."""
+
+from typing import Any, Callable, Dict, Iterable
+
+from .health import DependencyHealth
+from .registry import MetricsRegistry
+
+# Process-wide registry rendered by GET /metrics
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "agentic_rag_http_request_duration_seconds",
+    "Time to handle an HTTP request, including response serialization",
+    ("method", "route", "status")
+)
+
+QUERY_STAGE_DURATION = REGISTRY.histogram(
+    "agentic_rag_query_stage_duration_seconds",
+    "Time spent in each stage of answering a query (cache_lookup, agent, total)",
+    ("stage",)
+)
+
+QUERIES = REGISTRY.counter(
+    "agentic_rag_queries_total",
+    "Queries answered, by where the answer came from (cache or agent)",
+    ("source",)
+)
+
+REJECTED_REQUESTS = REGISTRY.counter(
+    "agentic_rag_rejected_requests_total",
+    "Query requests turned away, by reason (rate_limited or overloaded)",
+    ("reason",)
+)
+
+LLM_CALL_DURATION = REGISTRY.histogram(
+    "agentic_rag_llm_call_duration_seconds",
+    "Duration of a single LLM call",
+    ("model",)
+)
+
+LLM_TOKENS = REGISTRY.counter(
+    "agentic_rag_llm_tokens_total",
+    "Tokens consumed by LLM calls, by type (prompt or completion)",
+    ("model", "type")
+)
+
+TOOL_CALL_DURATION = REGISTRY.histogram(
+    "agentic_rag_tool_call_duration_seconds",
+    "Duration of a single tool call",
+    ("tool", "status")
+)
+
+TOOL_CALLS = REGISTRY.counter(
+    "agentic_rag_tool_calls_total",
+    "Tool calls made by the agent",
+    ("tool", "status")
+)
+
+RETRIEVER_DURATION = REGISTRY.histogram(
+    "agentic_rag_retriever_duration_seconds",
+    "Duration of a vector store search",
+    ("status",)
+)
+
+# Recent LLM and tool call outcomes, for the readiness probe
+DEPENDENCY_HEALTH = DependencyHealth()
+
+
+def stats_collector(prefix: str, stats: Callable[[], Dict[str, Any]]) -> Callable[[], Iterable[str]]:
+    """
+    Build a collector exporting a component's ``stats()`` as gauges.
+
+    Each numeric entry of the stats dictionary becomes a gauge named
+    ``<prefix>_<key>``, e.g. ``agentic_rag_answer_cache_hit_rate``.
+
+    Args:
+        prefix: Metric name prefix
+        stats: Callable returning the current stats
+
+    Returns:
+        Collector for ``MetricsRegistry.register_collector``
+    """
+    def collect() -> Iterable[str]:
+        for key, value in stats().items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"{prefix}_{key}"
+            yield f"# TYPE {name} gauge"
+            yield f"{name} {value}"
+
+    return collect
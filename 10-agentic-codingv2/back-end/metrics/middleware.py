@@ -0,0 +1,54 @@
+"""ASGI middleware timing HTTP requests."""
+
+import time
+
+from .instruments import HTTP_REQUEST_DURATION
+
+
+class MetricsMiddleware:
+    """
+    Observe the duration of every HTTP request.
+
+    The timer stops when the last body chunk has been sent, so it covers
+    response serialization and, for streaming endpoints, the whole stream.
+    Requests are labelled by route template (``/query``), not raw path, to
+    keep label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        observed = False
+
+        def observe() -> None:
+            nonlocal observed
+            if observed:
+                return
+            observed = True
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code)
+            )
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                observe()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            observe()
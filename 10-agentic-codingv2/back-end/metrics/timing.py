@@ -0,0 +1,63 @@
+"""Per-request stage timer."""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from .callbacks import MetricsCallbackHandler
+from .instruments import QUERY_STAGE_DURATION
+
+
+class StageTimer:
+    """
+    Time the stages of answering one query.
+
+    Each stage is observed in the ``agentic_rag_query_stage_duration_seconds``
+    histogram and kept for the request's own timing breakdown.
+
+    Example:
+        >>> timer = StageTimer()
+        >>> with timer.stage("cache_lookup"):
+        ...     ...
+        >>> timer.finish()
+        >>> timer.breakdown()
+        {'cache_lookup_ms': 0.012, 'total_ms': 0.02}
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as stage ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record ``seconds`` spent in stage ``name``."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        QUERY_STAGE_DURATION.observe(seconds, stage=name)
+
+    def finish(self) -> None:
+        """Record the total time since the timer was created."""
+        self.record("total", time.perf_counter() - self._start)
+
+    def breakdown(self, handler: Optional[MetricsCallbackHandler] = None) -> Dict[str, float]:
+        """
+        Return the stage times in milliseconds.
+
+        Args:
+            handler: The run's callback handler, whose LLM/tool/retrieval
+                totals and counts are merged in
+
+        Returns:
+            Mapping such as ``{"cache_lookup_ms": ..., "agent_ms": ..., "llm_ms": ...}``
+        """
+        breakdown = {f"{name}_ms": round(seconds * 1000, 3) for name, seconds in self.stages.items()}
+        if handler is not None:
+            breakdown.update(handler.timings())
+        return breakdown
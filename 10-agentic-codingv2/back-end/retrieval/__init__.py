@@ -0,0 +1,54 @@
+from .ann import INDEX_TYPES, build_search_index, index_factory_string, set_search_params
+from .dedupe import remove_overlaps
+from .embedding_backends import EMBEDDING_BACKENDS, LocalEmbeddings, create_backend_embeddings, embedding_model_id
+from .embedding_pipeline import EmbeddingPipeline
+from .index_store import IndexStore, compute_index_key, hash_documents
+from .ingestion import SitemapSource, StaticSource, hash_pages, ingest
+from .keyword import BM25Index, reciprocal_rank_fusion, tokenize
+from .live import IndexVersion, LiveRetriever, LiveVectorStore
+from .refresh import IndexRefresher
+from .vectorstore import (
+    build_index,
+    create_embeddings,
+    create_page_source,
+    get_live_vectorstore,
+    get_query_cache,
+    load_or_build_vectorstore,
+    prepare_index,
+    refresh_live_vectorstore
+)
+
+__all__ = [
+    'INDEX_TYPES',
+    'build_search_index',
+    'index_factory_string',
+    'set_search_params',
+    'remove_overlaps',
+    'EMBEDDING_BACKENDS',
+    'LocalEmbeddings',
+    'create_backend_embeddings',
+    'embedding_model_id',
+    'EmbeddingPipeline',
+    'IndexStore',
+    'compute_index_key',
+    'hash_documents',
+    'SitemapSource',
+    'StaticSource',
+    'hash_pages',
+    'ingest',
+    'BM25Index',
+    'reciprocal_rank_fusion',
+    'tokenize',
+    'IndexVersion',
+    'LiveRetriever',
+    'LiveVectorStore',
+    'IndexRefresher',
+    'build_index',
+    'create_embeddings',
+    'create_page_source',
+    'get_live_vectorstore',
+    'get_query_cache',
+    'load_or_build_vectorstore',
+    'prepare_index',
+    'refresh_live_vectorstore'
+]
@@ -0,0 +1,145 @@
+"""Approximate nearest neighbour (ANN) search indexes built from exact FAISS vectors."""
+
+import logging
+import math
+from typing import Any, Dict, Optional
+
+import faiss
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_TYPES = ("flat", "ivf", "hnsw", "ivfpq")
+
+# k-means wants at least this many training points per centroid
+_MIN_POINTS_PER_CENTROID = 39
+# PQ sub-quantizers use 8-bit codes, i.e. 256 centroids each
+_PQ_CENTROIDS = 256
+
+
+def auto_nlist(n: int) -> int:
+    """Return a number of IVF lists suited to ``n`` vectors (about 4 * sqrt(n))."""
+    return max(1, min(int(4 * math.sqrt(n)), n // _MIN_POINTS_PER_CENTROID))
+
+
+def auto_pq_m(dim: int) -> int:
+    """Return the largest PQ sub-quantizer count dividing ``dim`` with at least 4 dimensions each."""
+    for m in range(max(1, dim // 4), 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+def index_factory_string(
+    index_type: str,
+    n: int,
+    dim: int,
+    nlist: int = 0,
+    hnsw_m: int = 32,
+    pq_m: int = 0
+) -> str:
+    """
+    Return the FAISS index factory description for an index type.
+
+    Args:
+        index_type: One of ``INDEX_TYPES``
+        n: Number of vectors the index is trained on and holds
+        dim: Vector dimensions
+        nlist: IVF lists (0 picks ``auto_nlist(n)``)
+        hnsw_m: HNSW graph degree
+        pq_m: PQ sub-quantizers (0 picks ``auto_pq_m(dim)``)
+
+    Returns:
+        Factory string such as ``"IVF256,Flat"``
+
+    Raises:
+        ValueError: If the index type is unknown or ``pq_m`` does not divide ``dim``
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type {index_type!r}; expected one of {', '.join(INDEX_TYPES)}")
+
+    if index_type == "ivfpq" and n < _PQ_CENTROIDS:
+        logger.warning(f"{n} vectors are too few to train product quantization; using an IVF index")
+        index_type = "ivf"
+
+    if index_type == "flat":
+        return "Flat"
+    if index_type == "hnsw":
+        return f"HNSW{hnsw_m}"
+
+    nlist = min(nlist or auto_nlist(n), n)
+    if index_type == "ivf":
+        return f"IVF{nlist},Flat"
+
+    pq_m = pq_m or auto_pq_m(dim)
+    if dim % pq_m:
+        raise ValueError(f"INDEX_PQ_M={pq_m} must divide the embedding dimensions ({dim})")
+    return f"IVF{nlist},PQ{pq_m}"
+
+
+def build_search_index(exact_index: faiss.Index, index_type: str, **params: Any) -> faiss.Index:
+    """
+    Build a search index holding the same vectors as an exact index.
+
+    The vectors are added in the exact index's order, so positions (and
+    therefore the vector store's ``index_to_docstore_id`` mapping) are
+    identical in both. IVF and PQ indexes are trained on all the vectors.
+
+    Args:
+        exact_index: Flat index with the vectors
+        index_type: One of ``INDEX_TYPES``
+        **params: ``nlist``, ``hnsw_m`` and ``pq_m`` for ``index_factory_string``
+
+    Returns:
+        The trained and filled index
+    """
+    n, dim = exact_index.ntotal, exact_index.d
+    description = index_factory_string(index_type, n, dim, **params)
+    if description == "Flat":
+        return exact_index
+
+    vectors = exact_index.reconstruct_n(0, n) if n else np.zeros((0, dim), dtype="float32")
+    index = faiss.index_factory(dim, description, exact_index.metric_type)
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    logger.info(f"Built {description} search index over {n} vectors")
+    return index
+
+
+def describe_index(index: faiss.Index) -> str:
+    """Return a short description of an index, e.g. ``IndexIVFPQ(nlist=256)``."""
+    ivf = _ivf(index)
+    if ivf is not None:
+        return f"{type(index).__name__}(nlist={ivf.nlist})"
+    return type(index).__name__
+
+
+def _ivf(index: faiss.Index) -> Optional[Any]:
+    try:
+        return faiss.extract_index_ivf(index)
+    except RuntimeError:
+        return None
+
+
+def set_search_params(index: faiss.Index, nprobe: int = 0, ef_search: int = 0) -> Dict[str, int]:
+    """
+    Apply query-time parameters to an index; those it does not have are skipped.
+
+    Args:
+        index: FAISS index
+        nprobe: IVF lists visited per query (0 keeps the index default)
+        ef_search: HNSW candidate list size (0 keeps the index default)
+
+    Returns:
+        The parameters that were applied
+    """
+    applied: Dict[str, int] = {}
+    ivf = _ivf(index)
+    if nprobe and ivf is not None:
+        ivf.nprobe = min(nprobe, ivf.nlist)
+        applied["nprobe"] = ivf.nprobe
+    if ef_search and isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = ef_search
+        applied["efSearch"] = ef_search
+    return applied
@@ -0,0 +1,60 @@
+"""Removal of text repeated across retrieved chunks."""
+
+from typing import List
+
+from langchain_core.documents import Document
+
+# Shortest repeated text treated as chunk overlap rather than coincidence
+MIN_OVERLAP_CHARS = 40
+
+
+def _strip_overlap(text: str, kept: str) -> str:
+    """Remove from ``text`` the part that repeats the start or end of ``kept``."""
+    # text starts where kept ends (kept came first on the page)
+    position = kept.find(text[:MIN_OVERLAP_CHARS])
+    if position >= 0 and text.startswith(kept[position:]):
+        return text[len(kept) - position:]
+    # text ends where kept starts (text came first on the page)
+    position = text.find(kept[:MIN_OVERLAP_CHARS])
+    if position >= 0 and kept.startswith(text[position:]):
+        return text[:position]
+    return text
+
+
+def remove_overlaps(documents: List[Document]) -> List[Document]:
+    """
+    Drop repeated and overlapping text from ranked chunks.
+
+    Neighbouring chunks of a page share up to CHUNK_OVERLAP characters, and
+    the same chunk text can appear under several pages. Chunks keep their
+    rank; a chunk contained in a better-ranked one of the same page (or an
+    identical chunk of any page) is dropped, and text it shares with a
+    better-ranked neighbour is cut from it. The returned chunks are copies;
+    the stored documents are never changed.
+
+    Args:
+        documents: Chunks, most relevant first
+
+    Returns:
+        The chunks with repeated text removed, most relevant first
+    """
+    kept: List[Document] = []
+    seen = set()
+    for document in documents:
+        text = document.page_content.strip()
+        if not text or text in seen:
+            continue
+        source = document.metadata.get("source")
+        for other in kept:
+            if other.metadata.get("source") != source:
+                continue
+            if text in other.page_content:
+                text = ""
+                break
+            if len(text) >= MIN_OVERLAP_CHARS and len(other.page_content) >= MIN_OVERLAP_CHARS:
+                text = _strip_overlap(text, other.page_content).strip()
+        if not text:
+            continue
+        seen.add(document.page_content.strip())
+        kept.append(document if text == document.page_content else document.model_copy(update={"page_content": text}))
+    return kept
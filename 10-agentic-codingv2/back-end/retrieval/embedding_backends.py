@@ -0,0 +1,167 @@
+"""Embedding model backends selectable with EMBEDDING_BACKEND."""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+from langchain_openai import OpenAIEmbeddings
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_BACKENDS = ("openai", "local", "fake")
+
+
+class LocalEmbeddings(Embeddings):
+    """
+    CPU sentence-embedding model running in-process.
+
+    Uses ``sentence-transformers``, imported when the model is first needed
+    so the OpenAI backend does not require it. Texts are encoded in batches
+    of ``batch_size`` as one vectorized forward pass each; the model's
+    intra-op thread count is capped at ``threads``. Async calls run on a
+    small dedicated thread pool, so a query embedding never waits behind
+    blocking tool calls on the event loop's default executor. No request
+    leaves the process, so queries embed in milliseconds and indexes can be
+    built without network access once the model files are available locally.
+
+    Args:
+        model_name: Hugging Face model name or local model directory
+        device: Torch device, e.g. ``"cpu"``
+        batch_size: Texts per forward pass
+        threads: Torch intra-op threads (0 keeps the torch default)
+        workers: Threads of the pool serving async calls
+        normalize: L2-normalize vectors, so inner product is cosine similarity
+        query_prefix: Instruction prepended to queries (e.g. for E5 or BGE models)
+        document_prefix: Instruction prepended to documents
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        device: str = "cpu",
+        batch_size: int = 32,
+        threads: int = 0,
+        workers: int = 2,
+        normalize: bool = True,
+        query_prefix: str = "",
+        document_prefix: str = ""
+    ):
+        self.model_name = model_name
+        self.device = device
+        self.batch_size = max(1, batch_size)
+        self.threads = threads
+        self.normalize = normalize
+        self.query_prefix = query_prefix
+        self.document_prefix = document_prefix
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="embedding-worker")
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    @property
+    def model(self) -> str:
+        """Backend-qualified model name, used in cache keys."""
+        return f"local:{self.model_name}"
+
+    def _load(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    try:
+                        from sentence_transformers import SentenceTransformer
+                    except ImportError as e:
+                        raise RuntimeError(
+                            "EMBEDDING_BACKEND=local requires sentence-transformers "
+                            "(pip install sentence-transformers)"
+                        ) from e
+                    if self.threads > 0:
+                        import torch
+                        torch.set_num_threads(self.threads)
+                    self._model = SentenceTransformer(self.model_name, device=self.device)
+                    logger.info(
+                        f"Loaded local embedding model {self.model_name} on {self.device} "
+                        f"({self._model.get_sentence_embedding_dimension()} dimensions)"
+                    )
+        return self._model
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        vectors = self._load().encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=self.normalize,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return vectors.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents in batches."""
+        return self._encode([self.document_prefix + text for text in texts])
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query."""
+        return self._encode([self.query_prefix + text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents on the embedding thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Embed a query on the embedding thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.embed_query, text)
+
+
+def embedding_model_id(backend: Optional[str] = None, model: Optional[str] = None) -> str:
+    """
+    Return the name identifying an embedding model across backends.
+
+    OpenAI models keep their plain name, so existing index versions and
+    cached vectors stay valid; local models are prefixed with the backend
+    name and fake embeddings are named by their size.
+
+    Args:
+        backend: Embedding backend (defaults to EMBEDDING_BACKEND)
+        model: Model name (defaults to EMBEDDING_MODEL)
+    """
+    backend = backend or settings.EMBEDDING_BACKEND
+    model = model or settings.EMBEDDING_MODEL
+    if backend == "fake":
+        return f"fake:{settings.EMBEDDING_FAKE_SIZE}"
+    return model if backend == "openai" else f"{backend}:{model}"
+
+
+def create_backend_embeddings(backend: Optional[str] = None) -> Embeddings:
+    """
+    Create the raw embeddings of a backend, configured from settings.
+
+    Args:
+        backend: One of ``EMBEDDING_BACKENDS`` (defaults to EMBEDDING_BACKEND)
+
+    Returns:
+        OpenAIEmbeddings, LocalEmbeddings or a DeterministicFakeEmbedding
+        (hash-based vectors for tests and offline builds; not semantic)
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = backend or settings.EMBEDDING_BACKEND
+    if backend == "openai":
+        return OpenAIEmbeddings(model=settings.EMBEDDING_MODEL)
+    if backend == "local":
+        return LocalEmbeddings(
+            settings.EMBEDDING_MODEL,
+            device=settings.EMBEDDING_DEVICE,
+            batch_size=settings.EMBEDDING_LOCAL_BATCH_SIZE,
+            threads=settings.EMBEDDING_LOCAL_THREADS,
+            workers=settings.EMBEDDING_LOCAL_WORKERS,
+            query_prefix=settings.EMBEDDING_QUERY_PREFIX,
+            document_prefix=settings.EMBEDDING_DOCUMENT_PREFIX
+        )
+    if backend == "fake":
+        return DeterministicFakeEmbedding(size=settings.EMBEDDING_FAKE_SIZE)
+    raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {', '.join(EMBEDDING_BACKENDS)}")
@@ -0,0 +1,179 @@
+"""Batched, concurrent and cached document embedding."""
+
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import openai
+import tiktoken
+from langchain_core.embeddings import Embeddings
+from cache.embedding_cache import QueryEmbeddingCache, SQLiteEmbeddingStore, embedding_key, normalize_query
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying: rate limiting and transient server or network failures
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+
+class EmbeddingPipeline(Embeddings):
+    """
+    Embeddings wrapper that makes document ingestion cheap to repeat.
+
+    ``embed_documents`` de-duplicates its texts, serves every text already
+    in the on-disk store without a request, packs the rest into batches of
+    at most ``max_batch_tokens`` tokens and ``max_batch_texts`` texts, and
+    sends up to ``concurrency`` batches at once. Rate-limited or transient
+    failures are retried with exponential backoff and full jitter. Vectors
+    are stored as soon as their batch returns, so an interrupted run keeps
+    its progress. Queries are embedded one at a time by the wrapped
+    embeddings, through ``query_cache`` when one is given.
+
+    Args:
+        embeddings: The embeddings that make the requests
+        model: Model name used in cache keys (defaults to ``embeddings.model``)
+        dimensions: Output dimensions used in cache keys (defaults to ``embeddings.dimensions``)
+        store: Optional on-disk vector store
+        query_cache: Optional cache of query vectors
+        max_batch_tokens: Token budget of one request
+        max_batch_texts: Maximum number of texts in one request
+        concurrency: Requests in flight at the same time
+        max_retries: Retries of a failed batch
+        backoff: Base backoff delay in seconds
+        exact_tokens: Count tokens with tiktoken (OpenAI models); otherwise
+            estimate them from text length, which needs no tokenizer download
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: Optional[str] = None,
+        dimensions: Optional[int] = None,
+        store: Optional[SQLiteEmbeddingStore] = None,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+        max_batch_tokens: int = 100_000,
+        max_batch_texts: int = 512,
+        concurrency: int = 4,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        exact_tokens: bool = True
+    ):
+        self.embeddings = embeddings
+        self.model = model or getattr(embeddings, "model", type(embeddings).__name__)
+        self.dimensions = dimensions if dimensions is not None else getattr(embeddings, "dimensions", None)
+        self.store = store
+        self.query_cache = query_cache
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_texts = max_batch_texts
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._encoding = None
+        self._encoding_loaded = not exact_tokens
+
+    def _count_tokens(self, text: str) -> int:
+        """Count a text's tokens, estimating from its length if no tokenizer is available."""
+        if not self._encoding_loaded:
+            self._encoding_loaded = True
+            try:
+                try:
+                    self._encoding = tiktoken.encoding_for_model(self.model)
+                except KeyError:
+                    self._encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                # The tokenizer files are downloaded on first use
+                logger.warning(f"Tokenizer unavailable ({e!r}); estimating tokens from text length")
+        if self._encoding is None:
+            return len(text) // 4 + 1
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        """Pack texts into batches within the token and size budgets."""
+        batches: List[List[str]] = []
+        batch: List[str] = []
+        batch_tokens = 0
+        for text in texts:
+            tokens = self._count_tokens(text)
+            if batch and (batch_tokens + tokens > self.max_batch_tokens or len(batch) >= self.max_batch_texts):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(text)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        response = getattr(error, "response", None)
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return min(float(retry_after), 60.0)
+                except ValueError:
+                    pass
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        attempt = 0
+        while True:
+            try:
+                return self.embeddings.embed_documents(texts)
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt, e)
+                logger.warning(f"Embedding batch of {len(texts)} texts failed ({e!r}); retrying in {delay:.2f}s")
+                time.sleep(delay)
+                attempt += 1
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed documents, requesting only texts not embedded before.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, in order
+        """
+        keys = {text: embedding_key(self.model, self.dimensions, text) for text in texts}
+        vectors: Dict[str, List[float]] = {}
+        if self.store is not None:
+            stored = self.store.get_many(list(keys.values()))
+            vectors = {text: stored[key] for text, key in keys.items() if key in stored}
+
+        missing = [text for text in keys if text not in vectors]
+        batches = self._batches(missing)
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches))) as executor:
+                futures = {executor.submit(self._embed_batch, batch): batch for batch in batches}
+                for future in as_completed(futures):
+                    batch_vectors = dict(zip(futures[future], future.result()))
+                    vectors.update(batch_vectors)
+                    if self.store is not None:
+                        self.store.set_many({keys[text]: vector for text, vector in batch_vectors.items()})
+
+        logger.info(
+            f"Embedded {len(texts)} texts: {len(keys) - len(missing)} cached, "
+            f"{len(missing)} requested in {len(batches)} batches"
+        )
+        return [vectors[text] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query with the wrapped embeddings, unless its vector is cached."""
+        if self.query_cache is None:
+            return self.embeddings.embed_query(text)
+        # Whitespace variants of a query share one vector
+        text = normalize_query(text)
+        key = self.query_cache.make_key(self.model, self.dimensions, text)
+        return self.query_cache.get_or_embed(key, lambda: self.embeddings.embed_query(text))
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Embed a query with the wrapped embeddings, unless its vector is cached."""
+        if self.query_cache is None:
+            return await self.embeddings.aembed_query(text)
+        text = normalize_query(text)
+        key = self.query_cache.make_key(self.model, self.dimensions, text)
+        return await self.query_cache.aget_or_embed(key, lambda: self.embeddings.aembed_query(text))
@@ -0,0 +1,318 @@
+"""Versioned on-disk store for FAISS vector indexes."""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import faiss
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.faiss"
+VECTORS_FILE = "vectors.faiss"
+DOCSTORE_FILE = "docstore.json"
+MANIFEST_FILE = "manifest.json"
+PAGES_FILE = "pages.json"
+
+# Manifest fields that must match for a version's vectors to be reusable
+VECTOR_FIELDS = ("source", "chunk_size", "chunk_overlap", "embedding_model")
+# Manifest fields that must match for a stored index to be served as is
+CONFIG_FIELDS = VECTOR_FIELDS + ("index_type", "index_params")
+
+
+def compute_index_key(
+    source_hash: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    embedding_model: str,
+    index_type: str = "flat",
+    index_params: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Compute the version key of an index.
+
+    The key changes whenever the source content, the chunking settings
+    or the embedding model change, which are exactly the inputs that
+    invalidate the stored vectors, and when the search index type or its
+    build parameters change.
+
+    Args:
+        source_hash: Content hash of the loaded source documents
+        chunk_size: Chunk size used by the text splitter
+        chunk_overlap: Chunk overlap used by the text splitter
+        embedding_model: Name of the embedding model
+        index_type: Search index type (see ``retrieval.ann.INDEX_TYPES``)
+        index_params: Build parameters of the search index
+
+    Returns:
+        Hex digest identifying the index version
+    """
+    payload = json.dumps(
+        {
+            "source_hash": source_hash,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "embedding_model": embedding_model,
+            "index_type": index_type,
+            "index_params": index_params or {}
+        },
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def hash_documents(documents: List[Document]) -> str:
+    """
+    Compute a content hash over a list of source documents.
+
+    Args:
+        documents: Documents as returned by the loader
+
+    Returns:
+        SHA-256 hex digest of the documents' sources and contents
+    """
+    digest = hashlib.sha256()
+    for doc in documents:
+        digest.update(str(doc.metadata.get("source", "")).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(doc.page_content.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class IndexStore:
+    """
+    Directory of versioned FAISS indexes.
+
+    Each version lives in its own sub-directory named after its key and
+    contains the raw FAISS search index, a JSON docstore, a manifest and, for
+    incrementally ingested indexes, the per-page ingestion state. Versions
+    served by an approximate index also keep the exact vectors in a flat
+    index, which later versions are updated from. Versions
+    are written to a temporary directory and renamed into place, so readers
+    never observe a partially written index.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+    def path_for(self, key: str) -> str:
+        """Return the directory holding the index version ``key``."""
+        return os.path.join(self.root_dir, key)
+
+    def exists(self, key: str) -> bool:
+        """Check whether a complete index version is stored under ``key``."""
+        return os.path.isfile(os.path.join(self.path_for(key), MANIFEST_FILE))
+
+    def manifests(self) -> List[Dict[str, Any]]:
+        """
+        List the manifests of all stored index versions.
+
+        Returns:
+            Manifests sorted from newest to oldest
+        """
+        if not os.path.isdir(self.root_dir):
+            return []
+
+        manifests = []
+        for name in os.listdir(self.root_dir):
+            manifest_path = os.path.join(self.root_dir, name, MANIFEST_FILE)
+            if not os.path.isfile(manifest_path):
+                continue
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    manifests.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable index manifest {manifest_path}: {e}")
+
+        manifests.sort(key=lambda m: m.get("created_at", 0), reverse=True)
+        return manifests
+
+    def find(self, fields: Sequence[str] = CONFIG_FIELDS, **config: Any) -> Optional[Dict[str, Any]]:
+        """
+        Find the newest stored index built with the given configuration.
+
+        Args:
+            fields: Manifest fields that must match (``VECTOR_FIELDS`` to
+                find reusable vectors regardless of the search index type)
+            **config: Values for ``fields``
+
+        Returns:
+            The matching manifest, or None if no version matches
+        """
+        for manifest in self.manifests():
+            if all(manifest.get(field) == config.get(field) for field in fields):
+                return manifest
+        return None
+
+    def save(
+        self,
+        key: str,
+        vectorstore: FAISS,
+        manifest: Dict[str, Any],
+        pages: Optional[Dict[str, Any]] = None,
+        search_index: Optional[faiss.Index] = None
+    ) -> Dict[str, Any]:
+        """
+        Persist a FAISS vector store as index version ``key``.
+
+        Args:
+            key: Version key from ``compute_index_key``
+            vectorstore: The vector store to persist, holding the exact vectors
+            manifest: Metadata describing how the index was built
+            pages: Per-page ingestion state to store alongside the index
+            search_index: Approximate index over the same vectors to serve
+                searches from; the exact vectors are then kept alongside it
+
+        Returns:
+            The manifest as written to disk
+        """
+        os.makedirs(self.root_dir, exist_ok=True)
+        final_dir = self.path_for(key)
+        tmp_dir = f"{final_dir}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        if search_index is not None and search_index is not vectorstore.index:
+            faiss.write_index(search_index, os.path.join(tmp_dir, INDEX_FILE))
+            faiss.write_index(vectorstore.index, os.path.join(tmp_dir, VECTORS_FILE))
+        else:
+            faiss.write_index(vectorstore.index, os.path.join(tmp_dir, INDEX_FILE))
+
+        docstore = {
+            "index_to_docstore_id": {
+                str(i): doc_id for i, doc_id in vectorstore.index_to_docstore_id.items()
+            },
+            "documents": {
+                doc_id: {
+                    "page_content": doc.page_content,
+                    "metadata": doc.metadata
+                }
+                for doc_id, doc in vectorstore.docstore._dict.items()
+            }
+        }
+        with open(os.path.join(tmp_dir, DOCSTORE_FILE), "w", encoding="utf-8") as f:
+            json.dump(docstore, f)
+
+        if pages is not None:
+            with open(os.path.join(tmp_dir, PAGES_FILE), "w", encoding="utf-8") as f:
+                json.dump(pages, f)
+
+        manifest = dict(
+            manifest,
+            key=key,
+            vectors=vectorstore.index.ntotal,
+            distance_strategy=str(vectorstore.distance_strategy.value),
+            created_at=time.time()
+        )
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        # Another process may have published the same version concurrently
+        if self.exists(key):
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        else:
+            shutil.rmtree(final_dir, ignore_errors=True)
+            os.replace(tmp_dir, final_dir)
+
+        logger.info(f"Saved index version {key} ({manifest['vectors']} vectors) to {final_dir}")
+        return manifest
+
+    def load(self, key: str, embeddings: Embeddings, mmap: bool = True, exact: bool = False) -> FAISS:
+        """
+        Load index version ``key`` as a LangChain FAISS vector store.
+
+        Args:
+            key: Version key of a stored index
+            embeddings: Embeddings used to embed queries against the index
+            mmap: Memory-map the index file read-only instead of copying it into RAM
+            exact: Load the exact flat vectors instead of the search index
+                (the same file unless the version has an approximate index)
+
+        Returns:
+            FAISS vector store backed by the stored index
+        """
+        index_dir = self.path_for(key)
+
+        flags = 0
+        if mmap:
+            flags = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+        index_path = os.path.join(index_dir, INDEX_FILE)
+        if exact and os.path.isfile(os.path.join(index_dir, VECTORS_FILE)):
+            index_path = os.path.join(index_dir, VECTORS_FILE)
+        index = faiss.read_index(index_path, flags)
+
+        with open(os.path.join(index_dir, DOCSTORE_FILE), "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        docstore = InMemoryDocstore({
+            doc_id: Document(id=doc_id, page_content=doc["page_content"], metadata=doc["metadata"])
+            for doc_id, doc in data["documents"].items()
+        })
+        index_to_docstore_id = {
+            int(i): doc_id for i, doc_id in data["index_to_docstore_id"].items()
+        }
+
+        return FAISS(embeddings, index, docstore, index_to_docstore_id)
+
+    def preload(self, key: str) -> int:
+        """
+        Read the files of index version ``key`` into the OS page cache.
+
+        Processes that memory-map the version afterwards share these cached
+        pages instead of each reading the files from disk.
+
+        Returns:
+            Number of bytes read
+        """
+        total = 0
+        for name in (INDEX_FILE, DOCSTORE_FILE):
+            path = os.path.join(self.path_for(key), name)
+            with open(path, "rb") as f:
+                while chunk := f.read(1 << 20):
+                    total += len(chunk)
+        logger.info(f"Preloaded index version {key} ({total / (1 << 20):.1f} MiB) into the page cache")
+        return total
+
+    def load_pages(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the per-page ingestion state of index version ``key``.
+
+        Returns:
+            Page state by URL, or None if the version was not built incrementally
+        """
+        pages_path = os.path.join(self.path_for(key), PAGES_FILE)
+        if not os.path.isfile(pages_path):
+            return None
+        with open(pages_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def prune(self, keep: int, protect: Sequence[str] = ()) -> List[str]:
+        """
+        Delete all but the ``keep`` newest index versions.
+
+        Args:
+            keep: Number of versions to retain
+            protect: Keys of versions that must never be deleted
+
+        Returns:
+            Keys of the deleted versions
+        """
+        removed = []
+        for manifest in self.manifests()[max(keep, 1):]:
+            key = manifest.get("key")
+            if not key or key in protect:
+                continue
+            shutil.rmtree(self.path_for(key), ignore_errors=True)
+            removed.append(key)
+        if removed:
+            logger.info(f"Pruned old index versions: {removed}")
+        return removed
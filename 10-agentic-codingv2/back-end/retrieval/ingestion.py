@@ -0,0 +1,327 @@
+"""Incremental ingestion of a documentation site into a FAISS vector store."""
+
+import hashlib
+import logging
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+from bs4 import BeautifulSoup
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+_SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+# Page state recorded per URL with every index version:
+# {"etag", "last_modified", "content_hash", "chunk_ids"}
+PageState = Dict[str, Any]
+
+
+def hash_text(text: str) -> str:
+    """Return the SHA-256 hex digest of a page's text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_pages(pages: Dict[str, PageState]) -> str:
+    """
+    Compute a content hash over the ingested pages.
+
+    Args:
+        pages: Page state by URL
+
+    Returns:
+        SHA-256 hex digest of the pages' URLs and content hashes
+    """
+    digest = hashlib.sha256()
+    for url in sorted(pages):
+        digest.update(url.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(pages[url]["content_hash"].encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def chunk_ids_for(url: str, count: int) -> List[str]:
+    """Return stable docstore ids for the ``count`` chunks of a page."""
+    prefix = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+    return [f"{prefix}-{i}" for i in range(count)]
+
+
+class SitemapSource:
+    """
+    Documentation pages listed in a sitemap, fetched with conditional GETs.
+
+    Sitemap indexes are followed recursively. Pages are requested with
+    ``If-None-Match``/``If-Modified-Since`` from their previous state, so an
+    unchanged page costs a ``304`` and no download. If the sitemap cannot be
+    read or lists no pages under ``url_prefix``, the source falls back to
+    ``fallback_url`` alone and clears ``listing_complete``, so ``ingest``
+    keeps the pages it did not list.
+
+    Args:
+        sitemap_url: URL of the sitemap (or sitemap index)
+        fallback_url: Page to ingest when the sitemap is unavailable
+        url_prefix: Only pages whose URL starts with this prefix are ingested
+        max_pages: Maximum number of pages taken from the sitemap
+        timeout: Per-request timeout in seconds
+        concurrency: Pages fetched at the same time
+    """
+
+    def __init__(
+        self,
+        sitemap_url: str,
+        fallback_url: Optional[str] = None,
+        url_prefix: Optional[str] = None,
+        max_pages: int = 500,
+        timeout: float = 15.0,
+        concurrency: int = 8
+    ):
+        self.sitemap_url = sitemap_url
+        self.fallback_url = fallback_url
+        self.url_prefix = url_prefix
+        self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+        # False after list_urls fell back: the listing is not the full set of pages
+        self.listing_complete = True
+        self._client = httpx.Client(
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.concurrency)
+        )
+
+    def _sitemap_urls(self, url: str, depth: int = 0) -> List[str]:
+        response = self._client.get(url)
+        response.raise_for_status()
+        root = ElementTree.fromstring(response.content)
+
+        if root.tag == f"{_SITEMAP_NS}sitemapindex" and depth < 3:
+            urls: List[str] = []
+            for loc in root.iter(f"{_SITEMAP_NS}loc"):
+                urls.extend(self._sitemap_urls(loc.text.strip(), depth + 1))
+            return urls
+        return [loc.text.strip() for loc in root.iter(f"{_SITEMAP_NS}loc") if loc.text]
+
+    def _fallback(self, reason: str) -> List[str]:
+        logger.warning(f"Sitemap {self.sitemap_url} {reason}; ingesting {self.fallback_url} only")
+        self.listing_complete = False
+        return [self.fallback_url]
+
+    def list_urls(self) -> List[str]:
+        """
+        Return the page URLs to ingest, in sitemap order.
+
+        Raises:
+            RuntimeError: If the sitemap lists no pages under ``url_prefix``
+                and there is no fallback URL
+        """
+        try:
+            urls = self._sitemap_urls(self.sitemap_url)
+        except (httpx.HTTPError, ElementTree.ParseError) as e:
+            if not self.fallback_url:
+                raise
+            return self._fallback(f"unavailable ({e})")
+
+        if self.url_prefix:
+            urls = [url for url in urls if url.startswith(self.url_prefix)]
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            # An empty listing is a misconfiguration, not a site without pages
+            if not self.fallback_url:
+                raise RuntimeError(f"Sitemap {self.sitemap_url} lists no pages under {self.url_prefix or '/'}")
+            return self._fallback(f"lists no pages under {self.url_prefix or '/'}")
+        self.listing_complete = True
+        if len(urls) > self.max_pages:
+            logger.warning(f"Sitemap lists {len(urls)} pages; ingesting the first {self.max_pages}")
+            urls = urls[:self.max_pages]
+        return urls
+
+    def fetch(self, url: str, state: Optional[PageState] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch one page unless it is unchanged.
+
+        Args:
+            url: Page URL
+            state: The page's previous state, used for conditional headers
+
+        Returns:
+            None if the server reports the page unchanged (``304``), a dict
+            with ``document``, ``etag`` and ``last_modified`` otherwise, or
+            a dict with ``gone=True`` if the page no longer exists
+        """
+        headers = {}
+        if state:
+            if state.get("etag"):
+                headers["If-None-Match"] = state["etag"]
+            if state.get("last_modified"):
+                headers["If-Modified-Since"] = state["last_modified"]
+
+        response = self._client.get(url, headers=headers)
+        if response.status_code == 304:
+            return None
+        if response.status_code in (404, 410):
+            return {"gone": True}
+        response.raise_for_status()
+
+        soup = BeautifulSoup(response.text, "html.parser")
+        metadata = {"source": url}
+        if soup.title and soup.title.string:
+            metadata["title"] = soup.title.string.strip()
+        return {
+            "document": Document(page_content=soup.get_text(), metadata=metadata),
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified")
+        }
+
+    def close(self) -> None:
+        """Close the HTTP client."""
+        self._client.close()
+
+
+class StaticSource:
+    """
+    In-memory pages, for tests, benchmarks and offline builds.
+
+    Unchanged pages are detected by content hash only.
+
+    Args:
+        documents: Pages, each with its URL in ``metadata["source"]``
+    """
+
+    concurrency = 1
+
+    def __init__(self, documents: Sequence[Document]):
+        self._documents = {doc.metadata["source"]: doc for doc in documents}
+
+    def list_urls(self) -> List[str]:
+        """Return the page URLs."""
+        return list(self._documents)
+
+    def fetch(self, url: str, state: Optional[PageState] = None) -> Optional[Dict[str, Any]]:
+        """Return the page (see ``SitemapSource.fetch``)."""
+        if url not in self._documents:
+            return {"gone": True}
+        return {"document": self._documents[url], "etag": None, "last_modified": None}
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+def ingest(
+    source: Any,
+    split: Callable[[List[Document]], List[Document]],
+    embeddings: Embeddings,
+    vectorstore: Optional[FAISS] = None,
+    pages: Optional[Dict[str, PageState]] = None
+) -> Tuple[Optional[FAISS], Dict[str, PageState], Dict[str, int]]:
+    """
+    Bring a vector store up to date with a page source.
+
+    Only pages that are new or whose content hash changed are split and
+    embedded; the chunks of changed and removed pages are deleted from the
+    vector store first. A page that fails to download keeps its previous
+    chunks, so a flaky fetch never shrinks the index. Pages missing from
+    the listing are only removed when the source reports the listing
+    complete (``listing_complete``); after a sitemap error they are kept.
+
+    Args:
+        source: ``SitemapSource`` or ``StaticSource``
+        split: Function splitting page documents into chunks
+        embeddings: Embeddings for new chunks (used when ``vectorstore`` is None)
+        vectorstore: Writable vector store holding ``pages``; None to build from scratch
+        pages: Page state of ``vectorstore`` by URL
+
+    Returns:
+        Tuple of (vector store, new page state, stats). The stats count
+        ``added``, ``changed``, ``removed``, ``unchanged`` and ``failed``
+        pages and the ``chunks_embedded``.
+    """
+    pages = dict(pages or {})
+    if vectorstore is None:
+        pages = {}
+    stats = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0, "failed": 0, "chunks_embedded": 0}
+
+    urls = source.list_urls()
+    listed = set(urls)
+    complete = getattr(source, "listing_complete", True)
+
+    def fetch(url: str):
+        try:
+            return url, source.fetch(url, pages.get(url)), None
+        except Exception as e:
+            return url, None, e
+
+    with ThreadPoolExecutor(max_workers=getattr(source, "concurrency", 1)) as executor:
+        results = list(executor.map(fetch, urls))
+
+    to_delete: List[str] = []
+    to_add: List[Tuple[str, Dict[str, Any], str]] = []
+
+    unlisted = set(pages) - listed
+    if not complete and unlisted:
+        logger.warning(f"Page listing is incomplete; keeping {len(unlisted)} unlisted pages")
+        unlisted = set()
+    for url in unlisted:
+        to_delete.extend(pages.pop(url)["chunk_ids"])
+        stats["removed"] += 1
+
+    for url, result, error in results:
+        previous = pages.get(url)
+        if error is not None:
+            logger.warning(f"Failed to fetch {url}: {error}")
+            stats["failed"] += 1
+            continue
+        if result is None:
+            stats["unchanged"] += 1
+            continue
+        if result.get("gone"):
+            if previous:
+                to_delete.extend(pages.pop(url)["chunk_ids"])
+                stats["removed"] += 1
+            continue
+
+        content_hash = hash_text(result["document"].page_content)
+        if previous and previous["content_hash"] == content_hash:
+            # New validators but identical text: nothing to re-embed
+            previous.update(etag=result["etag"], last_modified=result["last_modified"])
+            stats["unchanged"] += 1
+            continue
+        if previous:
+            to_delete.extend(previous["chunk_ids"])
+            stats["changed"] += 1
+        else:
+            stats["added"] += 1
+        to_add.append((url, result, content_hash))
+
+    if to_delete and vectorstore is not None:
+        vectorstore.delete(ids=to_delete)
+
+    chunks: List[Document] = []
+    ids: List[str] = []
+    for url, result, content_hash in to_add:
+        page_chunks = split([result["document"]])
+        page_ids = chunk_ids_for(url, len(page_chunks))
+        chunks.extend(page_chunks)
+        ids.extend(page_ids)
+        pages[url] = {
+            "etag": result["etag"],
+            "last_modified": result["last_modified"],
+            "content_hash": content_hash,
+            "chunk_ids": page_ids
+        }
+
+    if chunks:
+        if vectorstore is None:
+            vectorstore = FAISS.from_documents(chunks, embeddings, ids=ids)
+        else:
+            vectorstore.add_documents(chunks, ids=ids)
+    stats["chunks_embedded"] = len(chunks)
+
+    logger.info(
+        "Ingested {pages} pages: {added} added, {changed} changed, {removed} removed, "
+        "{unchanged} unchanged, {failed} failed; {chunks_embedded} chunks embedded".format(pages=len(urls), **stats)
+    )
+    return vectorstore, pages, stats
@@ -0,0 +1,133 @@
+"""In-memory BM25 keyword index and reciprocal rank fusion."""
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from langchain_community.vectorstores import FAISS
+
+_WORD = re.compile(r"[A-Za-z0-9_]+")
+_CAMEL = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+# Words too common to help ranking; skipping them keeps query cost low
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how i if in is it of on or "
+    "the this to was what when where which who why will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Identifiers are kept whole and also split into their parts, so
+    ``create_react_agent`` and ``RunTree`` match both the exact name and
+    the words inside it.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Terms in order of appearance (repeated terms repeat)
+    """
+    terms: List[str] = []
+    for word in _WORD.findall(text):
+        lowered = word.lower()
+        if lowered in STOPWORDS:
+            continue
+        terms.append(lowered)
+        parts = [part.lower() for piece in word.split("_") for part in _CAMEL.findall(piece)]
+        if len(parts) > 1:
+            terms.extend(part for part in parts if part not in STOPWORDS)
+    return terms
+
+
+class BM25Index:
+    """
+    Okapi BM25 inverted index over a fixed set of documents.
+
+    Args:
+        documents: Pairs of (document id, text)
+        k1: Term frequency saturation
+        b: Document length normalization
+    """
+
+    def __init__(self, documents: Iterable[Tuple[str, str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._ids: List[str] = []
+        self._lengths: List[int] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+
+        for doc_id, text in documents:
+            terms = tokenize(text)
+            position = len(self._ids)
+            self._ids.append(doc_id)
+            self._lengths.append(len(terms))
+            for term, count in Counter(terms).items():
+                self._postings[term].append((position, count))
+
+        self._postings = dict(self._postings)
+        self._avg_length = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+
+    @classmethod
+    def from_vectorstore(cls, vectorstore: FAISS, **kwargs) -> "BM25Index":
+        """Index the chunks of a FAISS vector store under their docstore ids."""
+        docstore = vectorstore.docstore
+        return cls(
+            ((doc_id, docstore.search(doc_id).page_content) for doc_id in vectorstore.index_to_docstore_id.values()),
+            **kwargs
+        )
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """
+        Return the ``k`` best matching documents.
+
+        Args:
+            query: Search text
+            k: Number of results
+
+        Returns:
+            (document id, BM25 score) pairs, best first; documents sharing no
+            term with the query are never returned
+        """
+        n = len(self._ids)
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for position, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[position] / self._avg_length)
+                scores[position] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self._ids[position], score) for position, score in best]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[str]:
+    """
+    Merge ranked lists of ids by reciprocal rank fusion.
+
+    Each id scores ``sum(1 / (k + rank))`` over the lists it appears in, so
+    ids ranked well by several retrievers rise to the top without comparing
+    their incompatible raw scores.
+
+    Args:
+        rankings: Ranked id lists, best first
+        k: Rank damping constant (60 in the original paper)
+
+    Returns:
+        All ids, best fused score first
+    """
+    scores: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] += 1.0 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
@@ -0,0 +1,171 @@
+"""Serving vector store that can be replaced while searches are running."""
+
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict, Field
+from .dedupe import remove_overlaps
+from .keyword import BM25Index, reciprocal_rank_fusion
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexVersion:
+    """One stored index version loaded for serving."""
+
+    key: str
+    vectorstore: FAISS
+    # BM25 index over the same chunks, for hybrid retrieval
+    keyword_index: Optional[BM25Index] = None
+
+
+class LiveVectorStore:
+    """
+    The index version currently serving searches, swappable at runtime.
+
+    Every search leases the version that is live when it starts and keeps
+    using it until it finishes. ``swap`` only changes which version new
+    searches get, so an update never disturbs a search in flight; the
+    previous version is released once its last lease ends.
+
+    Args:
+        version: The initial index version
+        embeddings: Embeddings the index versions are built with
+    """
+
+    def __init__(self, version: IndexVersion, embeddings: Embeddings):
+        self.embeddings = embeddings
+        self._version = version
+        self._leases: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.swaps = 0
+
+    @property
+    def key(self) -> str:
+        """Version key of the live index."""
+        return self._version.key
+
+    @property
+    def vectorstore(self) -> FAISS:
+        """The live vector store (use ``lease`` for searches)."""
+        return self._version.vectorstore
+
+    @contextmanager
+    def lease(self) -> Iterator[IndexVersion]:
+        """Hold the live index version for the duration of one search."""
+        with self._lock:
+            version = self._version
+            self._leases[version.key] = self._leases.get(version.key, 0) + 1
+        try:
+            yield version
+        finally:
+            key = version.key
+            with self._lock:
+                self._leases[key] -= 1
+                released = not self._leases[key] and key != self._version.key
+                if not self._leases[key]:
+                    del self._leases[key]
+            if released:
+                logger.info(f"Released index version {key} after its last search finished")
+
+    def swap(self, version: IndexVersion) -> str:
+        """
+        Make ``version`` the live index for all new searches.
+
+        Args:
+            version: The new index version
+
+        Returns:
+            Version key of the replaced index
+        """
+        with self._lock:
+            previous = self._version.key
+            self._version = version
+            self.swaps += 1
+            in_flight = self._leases.get(previous, 0)
+
+        logger.info(
+            f"Swapped index version {previous} for {version.key} "
+            f"({version.vectorstore.index.ntotal} vectors, {in_flight} searches still on the old version)"
+        )
+        return previous
+
+    def in_use(self) -> List[str]:
+        """Return the keys of the live version and of every version still being searched."""
+        with self._lock:
+            return list(dict.fromkeys([self._version.key, *self._leases]))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the swap count, active searches and size of the live index."""
+        with self._lock:
+            return {
+                "swaps": self.swaps,
+                "active_searches": sum(self._leases.values()),
+                "versions_in_use": len({self._version.key, *self._leases}),
+                "vectors": self._version.vectorstore.index.ntotal
+            }
+
+
+class LiveRetriever(BaseRetriever):
+    """
+    Search over whichever index version is live when the search starts.
+
+    In ``dense`` mode this is plain vector similarity search. In ``hybrid``
+    mode the ``fetch_k`` best vector matches and the ``fetch_k`` best BM25
+    keyword matches are merged by reciprocal rank fusion, so chunks that
+    contain the exact API names or error strings of the query are found even
+    when their embeddings are not the closest. Either way the ``k`` best
+    chunks are returned; a ``score_threshold`` drops vector matches whose
+    relevance score (0 to 1, higher is more similar) is below it. With
+    ``dedupe``, text the chunks repeat from each other (chunk overlap,
+    duplicate chunks) is removed so it is not sent to the model twice.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    live: LiveVectorStore
+    k: int = 4
+    score_threshold: Optional[float] = None
+    mode: str = "dense"
+    fetch_k: int = 20
+    rrf_k: int = 60
+    dedupe: bool = True
+    search_kwargs: Dict[str, Any] = Field(default_factory=dict)
+
+    def _dense(self, vectorstore: FAISS, query: str, k: int) -> List[Document]:
+        if self.score_threshold is None:
+            return vectorstore.similarity_search(query, k=k, **self.search_kwargs)
+        results = vectorstore.similarity_search_with_relevance_scores(
+            query, k=k, score_threshold=self.score_threshold, **self.search_kwargs
+        )
+        return [doc for doc, _ in results]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        documents = self._search(query)
+        return remove_overlaps(documents) if self.dedupe else documents
+
+    def _search(self, query: str) -> List[Document]:
+        with self.live.lease() as version:
+            if self.mode != "hybrid" or version.keyword_index is None:
+                return self._dense(version.vectorstore, query, self.k)
+
+            fetch_k = max(self.fetch_k, self.k)
+            dense = self._dense(version.vectorstore, query, fetch_k)
+            keyword = [doc_id for doc_id, _ in version.keyword_index.search(query, fetch_k)]
+            documents = {doc.id: doc for doc in dense}
+            fused = reciprocal_rank_fusion([[doc.id for doc in dense], keyword], k=self.rrf_k)
+            return [
+                documents.get(doc_id) or version.vectorstore.docstore.search(doc_id)
+                for doc_id in fused[:self.k]
+            ]
@@ -0,0 +1,89 @@
+"""Periodic background refresh of the live vector index."""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class IndexRefresher:
+    """
+    Run an index refresh every ``interval`` seconds off the request path.
+
+    The refresh (crawl, embed, save and swap) is blocking work, so it runs on
+    a dedicated single thread: it never occupies the tool thread pool, never
+    blocks the event loop and two refreshes never overlap. A failed refresh
+    is logged and retried at the next interval while the current index keeps
+    serving.
+
+    Args:
+        refresh: Callable updating the index; returns True if it swapped in a new version
+        interval: Seconds between refreshes
+    """
+
+    def __init__(self, refresh: Callable[[], bool], interval: float):
+        self.refresh = refresh
+        self.interval = interval
+        self.runs = 0
+        self.updates = 0
+        self.failures = 0
+        self.last_success: Optional[float] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="index-refresh")
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh_now(self) -> bool:
+        """
+        Refresh the index once.
+
+        Returns:
+            True if a new index version was swapped in
+        """
+        self.runs += 1
+        start = time.perf_counter()
+        try:
+            updated = await asyncio.get_running_loop().run_in_executor(self._executor, self.refresh)
+        except Exception:
+            self.failures += 1
+            raise
+        self.last_success = time.time()
+        if updated:
+            self.updates += 1
+        logger.info(f"Index refresh finished in {time.perf_counter() - start:.1f}s ({'updated' if updated else 'no changes'})")
+        return updated
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh_now()
+            except Exception as e:
+                logger.error(f"Index refresh failed; keeping the current index: {e}", exc_info=True)
+
+    def start(self) -> None:
+        """Start refreshing in the background on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Index refresh scheduled every {self.interval}s")
+
+    async def stop(self) -> None:
+        """Stop refreshing; a refresh already running is left to finish in its thread."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return refresh counters and the time of the last successful refresh."""
+        return {
+            "refresh_runs": self.runs,
+            "refresh_updates": self.updates,
+            "refresh_failures": self.failures,
+            "last_refresh_timestamp": self.last_success or 0
+        }
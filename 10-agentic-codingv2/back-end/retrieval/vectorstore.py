@@ -0,0 +1,370 @@
+"""Loading and building the LangSmith documentation vector store."""
+
+import logging
+import threading
+from typing import List, Optional, Sequence
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from cache.embedding_cache import QueryEmbeddingCache, SQLiteEmbeddingStore
+from config.settings import settings
+from .embedding_backends import create_backend_embeddings, embedding_model_id
+from .embedding_pipeline import EmbeddingPipeline
+from .ann import build_search_index, describe_index, set_search_params
+from .index_store import VECTOR_FIELDS, IndexStore, compute_index_key
+from .ingestion import SitemapSource, hash_pages, ingest
+from .keyword import BM25Index
+from .live import IndexVersion, LiveVectorStore
+
+logger = logging.getLogger(__name__)
+
+# The process-wide serving index, created by get_live_vectorstore()
+_live_vectorstore: Optional[LiveVectorStore] = None
+_live_lock = threading.Lock()
+
+# The process-wide query embedding cache, created by get_query_cache()
+_query_cache: Optional[QueryEmbeddingCache] = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> Optional[QueryEmbeddingCache]:
+    """
+    Return the query embedding cache shared by every embeddings instance.
+
+    Returns:
+        The cache (persisted in EMBEDDING_CACHE_PATH, up to
+        QUERY_EMBEDDING_CACHE_MAX_STORED vectors, when
+        QUERY_EMBEDDING_CACHE_PERSIST is enabled), or None when
+        QUERY_EMBEDDING_CACHE_SIZE is 0
+    """
+    global _query_cache
+    if settings.QUERY_EMBEDDING_CACHE_SIZE <= 0:
+        return None
+    if _query_cache is None:
+        with _query_cache_lock:
+            if _query_cache is None:
+                store = None
+                if settings.QUERY_EMBEDDING_CACHE_PERSIST and settings.EMBEDDING_CACHE_PATH:
+                    store = SQLiteEmbeddingStore(
+                        settings.EMBEDDING_CACHE_PATH,
+                        max_queries=settings.QUERY_EMBEDDING_CACHE_MAX_STORED
+                    )
+                _query_cache = QueryEmbeddingCache(settings.QUERY_EMBEDDING_CACHE_SIZE, store=store)
+    return _query_cache
+
+
+def create_embeddings() -> Embeddings:
+    """
+    Create the embeddings used for indexing and querying documents.
+
+    Returns:
+        Embeddings of the EMBEDDING_BACKEND (OpenAI, an in-process local model
+        or fake vectors) configured with the model from settings, wrapped in
+        an EmbeddingPipeline that batches, parallelizes and caches document
+        embedding (cached on disk unless EMBEDDING_CACHE_PATH is empty) and
+        serves repeated queries from the shared query embedding cache
+    """
+    store = SQLiteEmbeddingStore(settings.EMBEDDING_CACHE_PATH) if settings.EMBEDDING_CACHE_PATH else None
+    return EmbeddingPipeline(
+        create_backend_embeddings(),
+        model=embedding_model_id(),
+        store=store,
+        query_cache=get_query_cache(),
+        max_batch_tokens=settings.EMBEDDING_BATCH_MAX_TOKENS,
+        max_batch_texts=settings.EMBEDDING_BATCH_MAX_TEXTS,
+        # A local model already uses every core for each batch
+        concurrency=settings.EMBEDDING_CONCURRENCY if settings.EMBEDDING_BACKEND == "openai" else 1,
+        max_retries=settings.EMBEDDING_MAX_RETRIES,
+        exact_tokens=settings.EMBEDDING_BACKEND == "openai"
+    )
+
+
+def create_page_source() -> SitemapSource:
+    """
+    Create the source of LangSmith documentation pages.
+
+    Returns:
+        SitemapSource over LANGSMITH_SITEMAP_URL, restricted to pages under
+        LANGSMITH_DOCS_URL and falling back to that single page
+    """
+    return SitemapSource(
+        settings.LANGSMITH_SITEMAP_URL,
+        fallback_url=settings.LANGSMITH_DOCS_URL,
+        url_prefix=settings.LANGSMITH_DOCS_URL,
+        max_pages=settings.INGEST_MAX_PAGES,
+        timeout=settings.INGEST_TIMEOUT,
+        concurrency=settings.INGEST_CONCURRENCY
+    )
+
+
+def split_documents(docs: List[Document]) -> List[Document]:
+    """
+    Split source documents into chunks using the configured chunk settings.
+
+    Args:
+        docs: Source documents
+
+    Returns:
+        Document chunks ready for embedding
+    """
+    return RecursiveCharacterTextSplitter(
+        chunk_size=settings.CHUNK_SIZE,
+        chunk_overlap=settings.CHUNK_OVERLAP
+    ).split_documents(docs)
+
+
+def _index_params() -> dict:
+    """Return the build parameters of the configured search index type."""
+    return {
+        "flat": {},
+        "ivf": {"nlist": settings.INDEX_IVF_NLIST},
+        "hnsw": {"hnsw_m": settings.INDEX_HNSW_M},
+        "ivfpq": {"nlist": settings.INDEX_IVF_NLIST, "pq_m": settings.INDEX_PQ_M}
+    }.get(settings.INDEX_TYPE, {})
+
+
+def _index_config() -> dict:
+    """Return the build configuration recorded in every index manifest."""
+    return {
+        "source": settings.LANGSMITH_SITEMAP_URL or settings.LANGSMITH_DOCS_URL,
+        "chunk_size": settings.CHUNK_SIZE,
+        "chunk_overlap": settings.CHUNK_OVERLAP,
+        "embedding_model": embedding_model_id(),
+        "index_type": settings.INDEX_TYPE,
+        "index_params": _index_params()
+    }
+
+
+def _load_for_search(store: IndexStore, key: str, embeddings: Embeddings) -> FAISS:
+    """Load a stored version for serving, with the configured query-time parameters."""
+    vectorstore = store.load(key, embeddings, mmap=settings.INDEX_MMAP)
+    applied = set_search_params(vectorstore.index, settings.INDEX_NPROBE, settings.INDEX_EF_SEARCH)
+    params = ", ".join(f"{name}={value}" for name, value in applied.items())
+    logger.info(f"Serving index version {key} with {describe_index(vectorstore.index)}" + (f" ({params})" if params else ""))
+    return vectorstore
+
+
+def _load_version(store: IndexStore, key: str, embeddings: Embeddings) -> IndexVersion:
+    """Load a stored version for the live retriever, with its keyword index in hybrid mode."""
+    vectorstore = _load_for_search(store, key, embeddings)
+    keyword_index = None
+    if settings.RETRIEVER_MODE == "hybrid":
+        keyword_index = BM25Index.from_vectorstore(vectorstore)
+        logger.info(f"Built BM25 keyword index over {len(keyword_index)} chunks")
+    return IndexVersion(key, vectorstore, keyword_index)
+
+
+def build_index(
+    store: IndexStore,
+    embeddings: Embeddings,
+    force: bool = False,
+    protect: Sequence[str] = ()
+) -> str:
+    """
+    Crawl the source and make sure an index for its current content is stored.
+
+    The newest stored version for the current configuration is loaded and
+    updated incrementally: only pages that are new or changed since it was
+    built are fetched in full, split and embedded, and the chunks of changed
+    or removed pages are deleted from it. The result is stored as a new
+    version; if no page changed, the existing version is kept. Updates work
+    on the exact vectors; the configured search index (INDEX_TYPE) is then
+    rebuilt and trained from them, so approximate index types never need
+    in-place deletes.
+
+    Args:
+        store: Index store to build into
+        embeddings: Embeddings used to embed the chunks
+        force: Ignore stored versions and re-embed every page
+        protect: Keys of versions still in use, never pruned
+
+    Returns:
+        Key of the stored index version
+    """
+    config = _index_config()
+
+    base_key, vectorstore, pages = None, None, None
+    # Any version with the same vectors will do, whatever its search index
+    manifest = store.find(fields=VECTOR_FIELDS, **config)
+    if manifest is not None and not force:
+        base_key = manifest["key"]
+        pages = store.load_pages(base_key)
+        if pages is None:
+            logger.info(f"Index version {base_key} has no page state; rebuilding from scratch")
+        else:
+            # A private, writable copy of the exact vectors; the stored version stays untouched
+            vectorstore = store.load(base_key, embeddings, mmap=False, exact=True)
+
+    source = create_page_source()
+    try:
+        vectorstore, pages, stats = ingest(source, split_documents, embeddings, vectorstore, pages)
+    finally:
+        source.close()
+
+    if vectorstore is None or not pages:
+        raise RuntimeError("No documentation pages could be ingested")
+
+    same_search_index = manifest is not None and all(
+        manifest.get(field) == config[field] for field in ("index_type", "index_params")
+    )
+    if base_key is not None and same_search_index and not any(
+        stats[change] for change in ("added", "changed", "removed")
+    ):
+        logger.info(f"Index version {base_key} is up to date")
+        return base_key
+
+    key = compute_index_key(
+        hash_pages(pages),
+        config["chunk_size"],
+        config["chunk_overlap"],
+        config["embedding_model"],
+        config["index_type"],
+        config["index_params"]
+    )
+    if store.exists(key) and not force:
+        logger.info(f"Index version {key} is up to date")
+        return key
+
+    search_index = build_search_index(vectorstore.index, config["index_type"], **config["index_params"])
+    store.save(
+        key,
+        vectorstore,
+        dict(
+            config,
+            chunks=vectorstore.index.ntotal,
+            pages=len(pages),
+            search_index=describe_index(search_index),
+            base=base_key,
+            ingest=stats
+        ),
+        pages=pages,
+        search_index=search_index
+    )
+    store.prune(settings.INDEX_KEEP_VERSIONS, protect=[key, *protect])
+    return key
+
+
+def _current_index_key(store: IndexStore, embeddings: Embeddings) -> str:
+    """
+    Return the key of the stored index to serve, building one if needed.
+
+    INDEX_VERSION is served when stored. If it has been pruned since, the
+    newest stored version with the current configuration is served instead,
+    so a worker restarted long after the pin was set still starts.
+    """
+    if settings.INDEX_VERSION:
+        if store.exists(settings.INDEX_VERSION):
+            logger.info(f"Loading pinned index version {settings.INDEX_VERSION}")
+            return settings.INDEX_VERSION
+        manifest = store.find(**_index_config())
+        if manifest is None:
+            raise RuntimeError(f"INDEX_VERSION {settings.INDEX_VERSION} is not stored in {store.root_dir}")
+        logger.warning(
+            f"INDEX_VERSION {settings.INDEX_VERSION} is no longer stored; "
+            f"loading the newest matching version {manifest['key']}"
+        )
+        return manifest["key"]
+    manifest = store.find(**_index_config())
+    if manifest is not None and not settings.INDEX_VERIFY_SOURCE:
+        key = manifest["key"]
+        logger.info(f"Loading stored index version {key} from {store.path_for(key)}")
+        return key
+    return build_index(store, embeddings)
+
+
+def prepare_index(embeddings: Optional[Embeddings] = None) -> str:
+    """
+    Make sure the index to serve is stored, without loading it for search.
+
+    Builds (or, with INDEX_VERIFY_SOURCE, updates) the index exactly as
+    ``get_live_vectorstore`` would, then reads its files into the page cache.
+    ``serve.py`` runs this once before starting the API workers, which then
+    only memory-map the prepared version.
+
+    Args:
+        embeddings: Embeddings to use; defaults to ``create_embeddings()``
+
+    Returns:
+        Key of the stored index version
+    """
+    embeddings = embeddings or create_embeddings()
+    store = IndexStore(settings.INDEX_DIR)
+    key = _current_index_key(store, embeddings)
+    store.preload(key)
+    return key
+
+
+def load_or_build_vectorstore(embeddings: Optional[Embeddings] = None) -> FAISS:
+    """
+    Return the LangSmith documentation vector store, building it only if needed.
+
+    A stored index built with the current configuration is loaded directly
+    (memory-mapped when INDEX_MMAP is enabled) without touching the network.
+    When INDEX_VERIFY_SOURCE is enabled, or no matching index exists, the
+    docs are re-checked and only new or changed pages are embedded.
+
+    Args:
+        embeddings: Embeddings to use; defaults to ``create_embeddings()``
+
+    Returns:
+        FAISS vector store over the LangSmith documentation
+    """
+    embeddings = embeddings or create_embeddings()
+    store = IndexStore(settings.INDEX_DIR)
+    key = _current_index_key(store, embeddings)
+    return _load_for_search(store, key, embeddings)
+
+
+def get_live_vectorstore() -> LiveVectorStore:
+    """
+    Return this process's serving index, loading it on first use.
+
+    The retriever tool searches through it and ``refresh_live_vectorstore``
+    swaps new versions into it, so every tool built in the process sees
+    updates without being recreated.
+
+    Returns:
+        The shared LiveVectorStore
+    """
+    global _live_vectorstore
+    if _live_vectorstore is None:
+        with _live_lock:
+            if _live_vectorstore is None:
+                embeddings = create_embeddings()
+                store = IndexStore(settings.INDEX_DIR)
+                key = _current_index_key(store, embeddings)
+                _live_vectorstore = LiveVectorStore(_load_version(store, key, embeddings), embeddings)
+    return _live_vectorstore
+
+
+def refresh_live_vectorstore(live: Optional[LiveVectorStore] = None) -> bool:
+    """
+    Update the stored index from the docs and swap it into the live index.
+
+    Runs ``build_index`` (incremental unless nothing is stored yet), never
+    pruning a version that is live or still being searched, then loads the
+    resulting version (and its keyword index) and swaps it in if it differs
+    from the live one. With INDEX_REFRESH_MODE ``follow`` nothing is built:
+    the newest stored version matching the configuration is swapped in, so
+    API workers pick up versions built by another process (``serve.py`` or
+    ``build_index.py``).
+
+    Args:
+        live: Live index to update; defaults to ``get_live_vectorstore()``
+
+    Returns:
+        True if a new index version was swapped in
+    """
+    live = live or get_live_vectorstore()
+    store = IndexStore(settings.INDEX_DIR)
+    if settings.INDEX_REFRESH_MODE == "follow":
+        manifest = store.find(**_index_config())
+        key = manifest["key"] if manifest is not None else live.key
+    else:
+        key = build_index(store, live.embeddings, protect=live.in_use())
+    if key == live.key:
+        return False
+    live.swap(_load_version(store, key, live.embeddings))
+    return True
@@ -0,0 +1,112 @@
+"""
+Agentic RAG - Production Server
+
+Starts the API in API_WORKERS uvicorn worker processes that share one
+on-disk index. The index is built or verified once, here, before any worker
+starts; every worker then memory-maps the same prepared version read-only,
+so the vectors occupy the page cache once however many workers run, and no
+worker crawls or embeds at startup. With INDEX_REFRESH_INTERVAL set, this
+process also performs the refreshes and the workers follow the versions it
+stores.
+
+    python serve.py [--workers N] [--host HOST] [--port PORT] [--no-preload]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+
+import uvicorn
+
+from config.settings import settings
+from retrieval import IndexStore, build_index, create_embeddings, prepare_index
+
+logger = logging.getLogger("serve")
+
+
+def export_setting(name: str, value: str) -> None:
+    """Set a setting in this process and for the worker processes it starts."""
+    os.environ[name] = value
+    # A single worker runs in this process, where settings are already loaded
+    setattr(settings, name, value == "true" if isinstance(getattr(settings, name), bool) else value)
+
+
+def refresh_forever(stop: threading.Event, interval: float, pinned: str) -> None:
+    """
+    Update the stored index every ``interval`` seconds until ``stop`` is set.
+
+    The ``pinned`` version the workers were started with is never pruned,
+    so a worker respawned by uvicorn can always load it.
+    """
+    store = IndexStore(settings.INDEX_DIR)
+    embeddings = create_embeddings()
+    while not stop.wait(interval):
+        try:
+            key = build_index(store, embeddings, protect=[pinned])
+            logger.info(f"Index refresh finished; newest version is {key}")
+        except Exception as e:
+            logger.error(f"Index refresh failed; workers keep their current index: {e}", exc_info=True)
+
+
+def main() -> int:
+    """Parse arguments, prepare the index and run the workers. Returns the process exit code."""
+    parser = argparse.ArgumentParser(description="Run the Agentic RAG API with several worker processes")
+    parser.add_argument("--workers", type=int, default=settings.API_WORKERS, help=f"Worker processes (default: {settings.API_WORKERS})")
+    parser.add_argument("--host", default=settings.API_HOST, help=f"Bind address (default: {settings.API_HOST})")
+    parser.add_argument("--port", type=int, default=settings.API_PORT, help=f"Port (default: {settings.API_PORT})")
+    parser.add_argument(
+        "--no-preload",
+        action="store_true",
+        help="Let every worker load (and if needed build) the index itself"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    workers = max(1, args.workers)
+    if workers > 1 and settings.CHECKPOINTER == "memory":
+        logger.warning(
+            "CHECKPOINTER=memory keeps conversation threads per worker, so a thread's turns "
+            "may land on a worker without its history; use CHECKPOINTER=sqlite"
+        )
+
+    stop = threading.Event()
+    if not args.no_preload:
+        try:
+            settings.validate()
+            key = prepare_index()
+        except Exception as e:
+            logger.error(f"Index preparation failed: {e}", exc_info=True)
+            return 1
+
+        # Every worker serves exactly the prepared version, memory-mapped
+        export_setting("INDEX_VERSION", key)
+        export_setting("INDEX_MMAP", "true")
+        export_setting("INDEX_VERIFY_SOURCE", "false")
+
+        # One process builds new versions; the workers only swap them in
+        if workers > 1 and settings.INDEX_REFRESH_INTERVAL > 0 and settings.INDEX_REFRESH_MODE == "build":
+            export_setting("INDEX_REFRESH_MODE", "follow")
+            threading.Thread(
+                target=refresh_forever,
+                args=(stop, settings.INDEX_REFRESH_INTERVAL, key),
+                name="index-refresh",
+                daemon=True
+            ).start()
+            logger.info(f"Index refresh runs in the server process every {settings.INDEX_REFRESH_INTERVAL:g}s")
+
+    logger.info(f"Starting {workers} API worker(s) on {args.host}:{args.port}")
+    try:
+        uvicorn.run("app:app", host=args.host, port=args.port, workers=workers)
+    finally:
+        stop.set()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+"""Shared test setup: offline settings for modules that read them at import."""
+
+import os
+
+# Settings are read from the environment when config.settings is imported
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("EMBEDDING_BACKEND", "fake")
+os.environ.setdefault("EMBEDDING_CACHE_PATH", "")
@@ -0,0 +1,196 @@
+"""Tests for admission control, token-bucket rate limiting and stream shedding."""
+
+import asyncio
+import json
+
+import pytest
+
+import admission.rate_limit
+from admission import AdmissionController, MemoryBucketStore, Overloaded, RateLimiter, SQLiteBucketStore, retry_after_header
+from api.dependencies import app_state
+from api.models import QueryRequest
+from api.routers.query import stream_query_events
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_work_within_capacity_is_admitted_at_once():
+    async def run():
+        controller = AdmissionController(2, max_queue=0, max_wait=1)
+        first = await controller.acquire(1)
+        second = await controller.acquire(1)
+        return first, second, controller.stats()
+
+    first, second, stats = asyncio.run(run())
+    assert (first, second) == (1, 1)
+    assert stats["in_use"] == 2 and stats["admitted"] == 2
+
+
+def test_full_queue_rejects_with_retry_after():
+    async def run():
+        controller = AdmissionController(1, max_queue=1, max_wait=5)
+        await controller.acquire(1)
+        waiter = asyncio.create_task(controller.acquire(1))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded) as rejected:
+            await controller.acquire(1)
+        with pytest.raises(Overloaded):
+            controller.check()
+        waiter.cancel()
+        return rejected.value, controller
+
+    error, controller = asyncio.run(run())
+    assert error.retry_after > 0
+    assert controller.rejected == 2 and controller.queued == 0
+
+
+def test_wait_beyond_max_wait_is_shed():
+    async def run():
+        controller = AdmissionController(1, max_queue=4, max_wait=0.05)
+        await controller.acquire(1)
+        with pytest.raises(Overloaded, match="No capacity"):
+            await controller.acquire(1)
+        return controller
+
+    controller = asyncio.run(run())
+    assert controller.timed_out == 1 and controller.queued == 0
+
+
+def test_waiters_are_admitted_in_fifo_order():
+    async def run():
+        controller = AdmissionController(2, max_queue=4, max_wait=0)
+        order = []
+
+        async def job(name, cost):
+            async with controller.slot(cost):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        await controller.acquire(2)
+        tasks = [asyncio.create_task(job("heavy", 2)), asyncio.create_task(job("light", 1))]
+        await asyncio.sleep(0)
+        controller.release(2)
+        await asyncio.gather(*tasks)
+        return order, controller.in_use
+
+    order, in_use = asyncio.run(run())
+    assert order == ["heavy", "light"]
+    assert in_use == 0
+
+
+def test_cost_is_capped_at_capacity():
+    async def run():
+        controller = AdmissionController(2, max_queue=0, max_wait=0)
+        return await controller.acquire(10)
+
+    assert asyncio.run(run()) == 2
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(admission.rate_limit.time, "monotonic", clock)
+    monkeypatch.setattr(admission.rate_limit.time, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def bucket_store(request, tmp_path):
+    store = MemoryBucketStore() if request.param == "memory" else SQLiteBucketStore(str(tmp_path / "buckets.sqlite"))
+    yield store
+    asyncio.run(store.close())
+
+
+def test_bucket_allows_a_burst_then_limits(bucket_store, clock):
+    limiter = RateLimiter(bucket_store, rate=1.0, capacity=3)
+
+    async def run():
+        return [await limiter.acquire("client") for _ in range(4)]
+
+    assert asyncio.run(run()) == [0, 0, 0, pytest.approx(1.0)]
+    assert limiter.stats()["limited"] == 1
+
+
+def test_bucket_refills_over_time_and_per_client(bucket_store, clock):
+    limiter = RateLimiter(bucket_store, rate=1.0, capacity=2)
+
+    async def run():
+        await limiter.acquire("client", 2)
+        limited = await limiter.acquire("client")
+        other = await limiter.acquire("other")
+        clock.now += 1.5
+        refilled = await limiter.acquire("client")
+        return limited, other, refilled
+
+    limited, other, refilled = asyncio.run(run())
+    assert limited > 0
+    assert other == 0 and refilled == 0
+
+
+def test_expensive_requests_spend_more_tokens(bucket_store, clock):
+    limiter = RateLimiter(bucket_store, rate=2.0, capacity=4)
+
+    async def run():
+        return await limiter.acquire("client", 3), await limiter.acquire("client", 3)
+
+    first, second = asyncio.run(run())
+    assert first == 0
+    assert second == pytest.approx(1.0)
+
+
+def test_store_failure_lets_requests_through():
+    class BrokenStore:
+        async def take(self, *args):
+            raise ConnectionError("store down")
+
+    limiter = RateLimiter(BrokenStore(), rate=1.0, capacity=1)
+    assert asyncio.run(limiter.acquire("client")) == 0
+    assert limiter.stats()["store_errors"] == 1
+
+
+def test_retry_after_header_is_whole_seconds():
+    assert retry_after_header(0.2) == "1"
+    assert retry_after_header(2.1) == "3"
+
+
+class RejectingAdmission:
+    """Stands in for the worker's admission controller."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+    def slot(self, cost: float = 1.0):
+        raise self.error
+
+
+def stream_events(monkeypatch, error: Exception):
+    monkeypatch.setattr(app_state, "admission", RejectingAdmission(error))
+    monkeypatch.setattr(app_state, "answer_cache", None)
+
+    async def run():
+        return [message async for message in stream_query_events(None, QueryRequest(question="What is LangSmith?"))]
+
+    messages = asyncio.run(run())
+    assert len(messages) == 1
+    lines = dict(line.split(": ", 1) for line in messages[0].strip().splitlines())
+    return lines["event"], json.loads(lines["data"])
+
+
+def test_stream_reports_overload_as_an_error_event(monkeypatch):
+    event, data = stream_events(monkeypatch, Overloaded("No capacity within 1s", retry_after=2.5))
+
+    assert event == "error"
+    assert data == {"message": "No capacity within 1s", "retry_after": 2.5}
+
+
+def test_stream_reports_other_slot_failures_as_an_error_event(monkeypatch):
+    event, data = stream_events(monkeypatch, OSError("disk I/O error"))
+
+    assert event == "error"
+    assert "retry" in data["message"] and "disk" not in data["message"]
@@ -0,0 +1,64 @@
+"""Tests for the exact and semantic answer cache."""
+
+import asyncio
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from cache import AnswerCache, normalize_question
+
+PARAMS = {"model": "gpt-4o-mini", "temperature": 0.0, "max_tokens": 1000}
+
+
+class KeywordEmbeddings(Embeddings):
+    """Embeds a text by which of a few keywords it contains."""
+
+    KEYWORDS = ("langsmith", "faiss", "weather")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [1.0 if word in text else 0.0 for word in self.KEYWORDS] + [0.01]
+
+
+def test_normalize_question_ignores_case_whitespace_and_punctuation():
+    assert normalize_question("  What is   LangSmith? ") == normalize_question("what is langsmith")
+
+
+def test_exact_hit_requires_same_parameters():
+    async def run():
+        cache = AnswerCache(max_entries=10, ttl=None)
+        await cache.aset("What is LangSmith?", PARAMS, {"answer": "a"})
+        hit = await cache.aget("what is langsmith", PARAMS)
+        other = await cache.aget("What is LangSmith?", dict(PARAMS, temperature=0.7))
+        return hit, other, cache.stats()
+
+    hit, other, stats = asyncio.run(run())
+    assert hit == {"answer": "a"}
+    assert other is None
+    assert (stats["exact_hits"], stats["misses"]) == (1, 1)
+
+
+def test_semantic_hit_above_threshold_only():
+    async def run():
+        cache = AnswerCache(max_entries=10, ttl=None, embeddings=KeywordEmbeddings(), similarity_threshold=0.9)
+        await cache.aset("tell me about langsmith", PARAMS, {"answer": "a"})
+        similar = await cache.aget("explain langsmith please", PARAMS)
+        unrelated = await cache.aget("what is the weather", PARAMS)
+        return similar, unrelated, cache.stats()
+
+    similar, unrelated, stats = asyncio.run(run())
+    assert similar == {"answer": "a"}
+    assert unrelated is None
+    assert stats["semantic_hits"] == 1
+
+
+def test_evicted_answers_leave_the_semantic_tier():
+    async def run():
+        cache = AnswerCache(max_entries=1, ttl=None, embeddings=KeywordEmbeddings())
+        await cache.aset("tell me about langsmith", PARAMS, {"answer": "a"})
+        await cache.aset("tell me about faiss", PARAMS, {"answer": "b"})
+        return await cache.aget("explain langsmith please", PARAMS)
+
+    assert asyncio.run(run()) is None
@@ -0,0 +1,91 @@
+"""Tests for batch query deduplication and per-item error reporting."""
+
+import asyncio
+import json
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from admission import AdmissionController
+from api.dependencies import app_state
+from api.models import BatchQueryRequest, QueryRequest
+from api.routers.query import batch_item_key, stream_batch_results
+
+
+class FakeAgent:
+    """Answers every question by echoing it, failing on request."""
+
+    def __init__(self, fail_on: str = ""):
+        self.fail_on = fail_on
+        self.questions = []
+
+    async def ainvoke(self, state, config=None):
+        question = state["messages"][-1].content
+        self.questions.append(question)
+        await asyncio.sleep(0)
+        if self.fail_on and self.fail_on in question:
+            raise RuntimeError("tool exploded")
+        return {"messages": [*state["messages"], AIMessage(content=f"Answer to {question}")]}
+
+
+@pytest.fixture(autouse=True)
+def worker_state(monkeypatch):
+    monkeypatch.setattr(app_state, "admission", AdmissionController(4, max_queue=16, max_wait=5))
+    monkeypatch.setattr(app_state, "answer_cache", None)
+
+
+def run_batch(agent, items, **kwargs):
+    batch = BatchQueryRequest(items=[QueryRequest(**item) for item in items], **kwargs)
+
+    async def run():
+        return [json.loads(line) async for line in stream_batch_results(agent, batch)]
+
+    return sorted(asyncio.run(run()), key=lambda result: result["index"])
+
+
+def test_item_key_normalizes_the_question_and_includes_parameters():
+    same = batch_item_key(QueryRequest(question="What is LangSmith?"))
+
+    assert batch_item_key(QueryRequest(question="  what is   LANGSMITH ")) == same
+    assert batch_item_key(QueryRequest(question="What is LangSmith?", temperature=0.9)) != same
+
+
+def test_identical_items_are_answered_once():
+    agent = FakeAgent()
+
+    results = run_batch(agent, [
+        {"question": "What is LangSmith?"},
+        {"question": "what is langsmith"},
+        {"question": "What is LangGraph?"}
+    ])
+
+    assert len(agent.questions) == 2
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert results[0]["answer"] == results[1]["answer"] == "Answer to What is LangSmith?"
+    assert [result["cached"] for result in results] == [False, True, False]
+    assert results[1]["question"] == "what is langsmith"
+
+
+def test_items_with_different_parameters_are_answered_separately():
+    agent = FakeAgent()
+
+    run_batch(agent, [
+        {"question": "What is LangSmith?"},
+        {"question": "What is LangSmith?", "max_tokens": 500}
+    ])
+
+    assert len(agent.questions) == 2
+
+
+def test_failed_item_is_reported_without_stopping_the_batch():
+    agent = FakeAgent(fail_on="broken")
+
+    results = run_batch(agent, [
+        {"question": "A broken question"},
+        {"question": "a broken question"},
+        {"question": "A fine question"}
+    ], max_concurrency=1)
+
+    assert [bool(result.get("error")) for result in results] == [True, True, False]
+    assert "tool exploded" in results[0]["error"]
+    assert results[2]["answer"] == "Answer to A fine question"
@@ -0,0 +1,112 @@
+"""Tests for token-budget packing of tool results and chunk dedupe."""
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+import agents.context
+from agents.context import allocate, count_tokens, pack_tool_messages, truncate_to_tokens
+from retrieval.dedupe import remove_overlaps
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    # Length-based counts: deterministic and no tokenizer download
+    monkeypatch.setattr(agents.context, "_encoding", None)
+    monkeypatch.setattr(agents.context, "_encoding_loaded", True)
+
+
+def tool_result(text: str, call_id: str) -> ToolMessage:
+    return ToolMessage(content=text, tool_call_id=call_id)
+
+
+def test_allocate_gives_small_observations_their_size():
+    assert allocate([10, 500, 500], 610) == [10, 300, 300]
+    assert allocate([10, 20], 100) == [10, 20]
+    assert allocate([], 100) == []
+
+
+def test_allocate_never_exceeds_budget():
+    sizes = [7, 130, 45, 1000, 3]
+    allowed = allocate(sizes, 200)
+    assert sum(allowed) <= 200
+    assert all(a <= s for a, s in zip(allowed, sizes))
+
+
+def test_truncate_keeps_leading_paragraphs_and_marks_the_cut():
+    paragraphs = [f"paragraph {i} " + "word " * 40 for i in range(10)]
+    text = "\n\n".join(paragraphs)
+
+    cut = truncate_to_tokens(text, 120)
+
+    assert count_tokens(cut) <= 120
+    assert cut.startswith(paragraphs[0])
+    assert "paragraph 9" not in cut
+    assert cut.rstrip().endswith("more tokens omitted]")
+
+
+def test_truncate_cuts_a_single_oversized_paragraph():
+    cut = truncate_to_tokens("x" * 4000, 100)
+    assert count_tokens(cut) <= 100 and cut.startswith("xxx")
+
+
+def test_truncate_leaves_fitting_text_alone():
+    assert truncate_to_tokens("short text", 100) == "short text"
+
+
+def test_pack_only_touches_the_current_turn():
+    old = tool_result("old " * 2000, "old")
+    messages = [
+        HumanMessage(content="first question"),
+        AIMessage(content="", tool_calls=[{"name": "search", "args": {}, "id": "old"}]),
+        old,
+        AIMessage(content="first answer"),
+        HumanMessage(content="second question"),
+        AIMessage(content="", tool_calls=[{"name": "search", "args": {}, "id": "a"}]),
+        tool_result("a " * 2000, "a"),
+        tool_result("b " * 20, "b")
+    ]
+
+    packed = pack_tool_messages(messages, 300)
+
+    assert packed[2] is old
+    assert count_tokens(packed[6].content) + count_tokens(packed[7].content) <= 300
+    assert packed[7].content == messages[7].content
+    # The stored messages are not modified
+    assert messages[6].content == "a " * 2000
+
+
+def test_pack_returns_messages_unchanged_within_budget():
+    messages = [HumanMessage(content="q"), tool_result("small", "a")]
+    assert pack_tool_messages(messages, 100) is messages
+
+
+def chunk(text: str, source: str = "https://docs/a") -> Document:
+    return Document(page_content=text, metadata={"source": source})
+
+
+def test_remove_overlaps_drops_duplicates_and_contained_chunks():
+    long_text = " ".join(["LangSmith traces every run of your application."] * 3)
+    documents = [
+        chunk(long_text),
+        chunk(long_text, source="https://docs/b"),
+        chunk(long_text[10:80]),
+        chunk("an unrelated chunk of the same page that is long enough")
+    ]
+
+    kept = remove_overlaps(documents)
+
+    assert [d.page_content for d in kept] == [long_text, "an unrelated chunk of the same page that is long enough"]
+
+
+def test_remove_overlaps_cuts_shared_text_between_neighbours():
+    page = " ".join(f"sentence {i} of the page." for i in range(30))
+    first, second = page[:400], page[300:]
+    documents = [chunk(first), chunk(second)]
+
+    kept = remove_overlaps(documents)
+
+    assert kept[0].page_content == first
+    assert kept[1].page_content == page[400:].strip()
+    # The stored documents are left as they were
+    assert documents[1].page_content == second
@@ -0,0 +1,104 @@
+"""Tests for the on-disk embedding store and the query embedding cache."""
+
+import asyncio
+import itertools
+import sqlite3
+
+import pytest
+
+import cache.embedding_cache
+from cache.embedding_cache import QUERY_PRUNE_INTERVAL, QueryEmbeddingCache, SQLiteEmbeddingStore, embedding_key
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteEmbeddingStore(str(tmp_path / "embeddings.sqlite"), max_queries=10)
+    yield store
+    store.close()
+
+
+def test_document_vectors_round_trip(store):
+    key = embedding_key("text-embedding-3-small", None, "hello")
+    store.set_many({key: [0.5, -1.0]})
+
+    assert store.get_many([key, "missing"]) == {key: [0.5, -1.0]}
+
+
+def test_query_keys_normalize_whitespace_but_keep_case():
+    key = QueryEmbeddingCache.make_key("model", 256, "What is  LangSmith?")
+
+    assert key.startswith("query:")
+    assert QueryEmbeddingCache.make_key("model", 256, " What is LangSmith? ") == key
+    assert QueryEmbeddingCache.make_key("model", 256, "what is langsmith?") != key
+    assert QueryEmbeddingCache.make_key("model", 512, "What is LangSmith?") != key
+
+
+def test_query_vectors_are_pruned_to_the_newest(store, monkeypatch):
+    clock = itertools.count(1000)
+    monkeypatch.setattr(cache.embedding_cache.time, "time", lambda: next(clock))
+
+    for n in range(QUERY_PRUNE_INTERVAL):
+        store.set_query(f"query:{n}", [float(n)])
+
+    assert store.get_query(f"query:{QUERY_PRUNE_INTERVAL - 1}") == [float(QUERY_PRUNE_INTERVAL - 1)]
+    assert store.get_query(f"query:{QUERY_PRUNE_INTERVAL - 11}") is None
+    with sqlite3.connect(store.path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0] == 10
+
+
+def test_legacy_query_rows_are_dropped_from_the_document_table(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        conn.execute("INSERT INTO embeddings VALUES ('query:model:default:abc', x'00')")
+        conn.execute("INSERT INTO embeddings VALUES ('model:default:abc', x'00')")
+    conn.close()
+
+    store = SQLiteEmbeddingStore(path)
+    try:
+        with sqlite3.connect(path) as conn:
+            keys = [row[0] for row in conn.execute("SELECT key FROM embeddings")]
+        conn.close()
+    finally:
+        store.close()
+    assert keys == ["model:default:abc"]
+
+
+def test_cache_falls_back_to_the_store(store):
+    writer = QueryEmbeddingCache(4, store)
+    writer.set("query:a", [1.0, 2.0])
+
+    reader = QueryEmbeddingCache(4, store)
+    assert reader.get("query:a") == [1.0, 2.0]
+    assert reader.get("query:a") == [1.0, 2.0]
+    assert reader.get("query:b") is None
+
+    stats = reader.stats()
+    assert (stats["store_hits"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_cached_vectors_are_copies():
+    query_cache = QueryEmbeddingCache(4)
+    query_cache.set("query:a", [1.0])
+
+    query_cache.get("query:a").append(2.0)
+
+    assert query_cache.get("query:a") == [1.0]
+
+
+def test_async_lookups_embed_once(store):
+    calls = []
+
+    async def embed():
+        calls.append(1)
+        return [3.0]
+
+    async def run():
+        query_cache = QueryEmbeddingCache(4, store)
+        first = await query_cache.aget_or_embed("query:c", embed)
+        second = await query_cache.aget_or_embed("query:c", embed)
+        stored = await QueryEmbeddingCache(4, store).aget("query:c")
+        return first, second, stored
+
+    assert asyncio.run(run()) == ([3.0], [3.0], [3.0])
+    assert len(calls) == 1
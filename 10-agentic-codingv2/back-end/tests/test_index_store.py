@@ -0,0 +1,90 @@
+"""Tests for the versioned on-disk index store."""
+
+import itertools
+
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+import retrieval.index_store
+from retrieval.index_store import VECTOR_FIELDS, IndexStore, compute_index_key
+
+CONFIG = {
+    "source": "https://docs.example.com",
+    "chunk_size": 500,
+    "chunk_overlap": 50,
+    "embedding_model": "fake",
+    "index_type": "flat",
+    "index_params": {}
+}
+
+
+@pytest.fixture
+def embeddings():
+    return DeterministicFakeEmbedding(size=8)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # Distinct, increasing creation times however fast versions are saved
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(retrieval.index_store.time, "time", lambda: float(next(ticks)))
+    return IndexStore(str(tmp_path / "index"))
+
+
+def save_version(store, embeddings, key, **overrides):
+    vectorstore = FAISS.from_texts([f"text of {key}", "shared text"], embeddings)
+    return store.save(key, vectorstore, dict(CONFIG, **overrides), pages={"https://a": {"hash": key}})
+
+
+def test_key_changes_with_every_input():
+    base = compute_index_key("h", 500, 50, "m")
+    variants = [
+        compute_index_key("h2", 500, 50, "m"),
+        compute_index_key("h", 400, 50, "m"),
+        compute_index_key("h", 500, 0, "m"),
+        compute_index_key("h", 500, 50, "m2"),
+        compute_index_key("h", 500, 50, "m", "hnsw"),
+        compute_index_key("h", 500, 50, "m", "ivf", {"nlist": 64})
+    ]
+    assert base == compute_index_key("h", 500, 50, "m")
+    assert base not in variants and len(set(variants)) == len(variants)
+
+
+def test_save_and_load_round_trip(store, embeddings):
+    save_version(store, embeddings, "v1")
+
+    for mmap in (True, False):
+        vectorstore = store.load("v1", embeddings, mmap=mmap)
+        assert vectorstore.index.ntotal == 2
+        assert vectorstore.similarity_search("text of v1", k=1)[0].page_content == "text of v1"
+    assert store.load_pages("v1") == {"https://a": {"hash": "v1"}}
+
+
+def test_find_returns_newest_matching_version(store, embeddings):
+    save_version(store, embeddings, "old")
+    save_version(store, embeddings, "new")
+    save_version(store, embeddings, "other", chunk_size=100)
+    save_version(store, embeddings, "hnsw", index_type="hnsw")
+
+    assert store.find(**CONFIG)["key"] == "new"
+    assert store.find(**dict(CONFIG, chunk_size=100))["key"] == "other"
+    # Reusable vectors ignore the search index type
+    assert store.find(fields=VECTOR_FIELDS, **CONFIG)["key"] == "hnsw"
+    assert store.find(**dict(CONFIG, embedding_model="unknown")) is None
+
+
+def test_prune_keeps_newest_versions(store, embeddings):
+    for key in ("v1", "v2", "v3", "v4"):
+        save_version(store, embeddings, key)
+
+    assert sorted(store.prune(2)) == ["v1", "v2"]
+    assert [m["key"] for m in store.manifests()] == ["v4", "v3"]
+
+
+def test_prune_never_deletes_protected_versions(store, embeddings):
+    for key in ("pinned", "v2", "v3", "v4"):
+        save_version(store, embeddings, key)
+
+    assert store.prune(1, protect=["pinned"]) == ["v3", "v2"]
+    assert store.exists("pinned") and store.exists("v4")
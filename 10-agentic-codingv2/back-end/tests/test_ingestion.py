@@ -0,0 +1,155 @@
+"""Tests for incremental sitemap ingestion."""
+
+from typing import Dict, List, Set
+
+import httpx
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from retrieval.ingestion import SitemapSource, ingest
+
+BASE = "https://docs.example.com"
+
+
+class FakeSite:
+    """A documentation site served through ``httpx.MockTransport``."""
+
+    def __init__(self, pages: Dict[str, str]):
+        self.pages = dict(pages)
+        self.sitemap_status = 200
+        self.sitemap_urls: List[str] = []
+        self.failing: Set[str] = set()
+        self.requests: List[httpx.Request] = []
+
+    def etag(self, path: str) -> str:
+        return f'"{abs(hash(self.pages[path]))}"'
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if path == "/sitemap.xml":
+            if self.sitemap_status != 200:
+                return httpx.Response(self.sitemap_status)
+            urls = self.sitemap_urls or [BASE + p for p in self.pages]
+            locs = "".join(f"<url><loc>{url}</loc></url>" for url in urls)
+            return httpx.Response(200, text=f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locs}</urlset>')
+        if path in self.failing:
+            return httpx.Response(503)
+        if path not in self.pages:
+            return httpx.Response(404)
+        if request.headers.get("if-none-match") == self.etag(path):
+            return httpx.Response(304)
+        html = f"<html><head><title>{path}</title></head><body>{self.pages[path]}</body></html>"
+        return httpx.Response(200, text=html, headers={"ETag": self.etag(path)})
+
+    def source(self, **kwargs) -> SitemapSource:
+        source = SitemapSource(f"{BASE}/sitemap.xml", **kwargs)
+        source._client.close()
+        source._client = httpx.Client(transport=httpx.MockTransport(self.handler))
+        return source
+
+
+def split(documents):
+    return documents
+
+
+@pytest.fixture
+def embeddings():
+    return DeterministicFakeEmbedding(size=8)
+
+
+@pytest.fixture
+def site():
+    return FakeSite({"/a": "alpha page", "/b": "beta page"})
+
+
+def run(site, embeddings, vectorstore=None, pages=None, **kwargs):
+    source = site.source(**kwargs)
+    try:
+        return ingest(source, split, embeddings, vectorstore, pages)
+    finally:
+        source.close()
+
+
+def stored_sources(vectorstore) -> List[str]:
+    return sorted(doc.metadata["source"] for doc in vectorstore.docstore._dict.values())
+
+
+def test_first_run_ingests_every_page(site, embeddings):
+    vectorstore, pages, stats = run(site, embeddings)
+
+    assert stats["added"] == 2 and stats["chunks_embedded"] == 2
+    assert stored_sources(vectorstore) == [f"{BASE}/a", f"{BASE}/b"]
+    assert pages[f"{BASE}/a"]["etag"] == site.etag("/a")
+
+
+def test_unchanged_pages_are_revalidated_not_downloaded(site, embeddings):
+    vectorstore, pages, _ = run(site, embeddings)
+    site.requests.clear()
+
+    _, _, stats = run(site, embeddings, vectorstore, pages)
+
+    page_requests = [r for r in site.requests if r.url.path != "/sitemap.xml"]
+    assert all(r.headers.get("if-none-match") for r in page_requests)
+    assert stats["unchanged"] == 2 and stats["chunks_embedded"] == 0
+
+
+def test_changed_added_and_removed_pages(site, embeddings):
+    vectorstore, pages, _ = run(site, embeddings)
+    site.pages["/a"] = "alpha page, rewritten"
+    site.pages["/c"] = "gamma page"
+    del site.pages["/b"]
+
+    vectorstore, pages, stats = run(site, embeddings, vectorstore, pages)
+
+    assert (stats["changed"], stats["added"], stats["removed"]) == (1, 1, 1)
+    assert stored_sources(vectorstore) == [f"{BASE}/a", f"{BASE}/c"]
+    assert sorted(pages) == [f"{BASE}/a", f"{BASE}/c"]
+
+
+def test_failed_fetch_keeps_previous_chunks(site, embeddings):
+    vectorstore, pages, _ = run(site, embeddings)
+    site.pages["/a"] = "alpha page, rewritten"
+    site.failing.add("/a")
+
+    vectorstore, pages, stats = run(site, embeddings, vectorstore, pages)
+
+    assert stats["failed"] == 1
+    assert stored_sources(vectorstore) == [f"{BASE}/a", f"{BASE}/b"]
+    assert "alpha page" in vectorstore.docstore._dict[pages[f"{BASE}/a"]["chunk_ids"][0]].page_content
+
+
+def test_unavailable_sitemap_keeps_unlisted_pages(site, embeddings):
+    vectorstore, pages, _ = run(site, embeddings, fallback_url=f"{BASE}/a")
+    site.sitemap_status = 500
+
+    vectorstore, pages, stats = run(site, embeddings, vectorstore, pages, fallback_url=f"{BASE}/a")
+
+    assert stats["removed"] == 0
+    assert stored_sources(vectorstore) == [f"{BASE}/a", f"{BASE}/b"]
+
+
+def test_unavailable_sitemap_without_fallback_raises(site):
+    site.sitemap_status = 500
+    source = site.source()
+    with pytest.raises(httpx.HTTPStatusError):
+        source.list_urls()
+
+
+def test_sitemap_without_pages_under_prefix_falls_back(site):
+    site.sitemap_urls = ["https://elsewhere.example.com/a"]
+
+    source = site.source(fallback_url=f"{BASE}/a", url_prefix=BASE)
+    assert source.list_urls() == [f"{BASE}/a"]
+    assert source.listing_complete is False
+
+    with pytest.raises(RuntimeError, match="lists no pages"):
+        site.source(url_prefix=BASE).list_urls()
+
+
+def test_listing_is_filtered_deduplicated_and_capped(site):
+    site.sitemap_urls = [f"{BASE}/a", f"{BASE}/a", "https://elsewhere.example.com/x", f"{BASE}/b", f"{BASE}/c"]
+
+    source = site.source(url_prefix=BASE, max_pages=2)
+    assert source.list_urls() == [f"{BASE}/a", f"{BASE}/b"]
+    assert source.listing_complete is True
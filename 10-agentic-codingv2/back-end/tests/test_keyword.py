@@ -0,0 +1,78 @@
+"""Tests for the BM25 keyword index, rank fusion and hybrid retrieval."""
+
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from retrieval.keyword import BM25Index, reciprocal_rank_fusion, tokenize
+from retrieval.live import IndexVersion, LiveRetriever, LiveVectorStore
+
+TEXTS = {
+    "tracing": "Enable tracing by setting the LANGSMITH_TRACING environment variable.",
+    "agents": "Use create_react_agent to build an agent that calls tools in a loop.",
+    "runs": "A RunTree records the inputs and outputs of every step of a run.",
+    "datasets": "Datasets hold examples you evaluate your application against."
+}
+
+
+def test_identifiers_are_kept_whole_and_split():
+    assert tokenize("How do I use create_react_agent?") == ["use", "create_react_agent", "create", "react", "agent"]
+    assert tokenize("the RunTree") == ["runtree", "run", "tree"]
+
+
+def test_bm25_ranks_documents_sharing_rare_terms_first():
+    index = BM25Index(TEXTS.items())
+
+    results = index.search("What does a RunTree record?", k=2)
+
+    assert results[0][0] == "runs"
+    assert all(score > 0 for _, score in results)
+
+
+def test_bm25_never_returns_documents_without_a_query_term():
+    index = BM25Index(TEXTS.items())
+
+    assert index.search("the of a", k=4) == []
+    assert [doc_id for doc_id, _ in index.search("datasets", k=4)] == ["datasets"]
+
+
+def test_fusion_favours_ids_ranked_well_by_both_lists():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d", "a"]])
+
+    assert fused[0] == "b"
+    assert set(fused) == {"a", "b", "c", "d"}
+    assert fused.index("a") < fused.index("c")
+
+
+def test_damping_constant_weighs_agreement_against_top_ranks():
+    rankings = [["x", "a", "b", "y"], ["c", "d", "e", "y"]]
+
+    # 1/(1+1) beats 2/(1+4), but 2/(60+4) beats 1/(60+1)
+    assert reciprocal_rank_fusion(rankings, k=1)[0] == "x"
+    assert reciprocal_rank_fusion(rankings, k=60)[0] == "y"
+
+
+@pytest.fixture
+def live():
+    vectorstore = FAISS.from_texts(
+        list(TEXTS.values()), DeterministicFakeEmbedding(size=8), ids=list(TEXTS)
+    )
+    version = IndexVersion("v1", vectorstore, BM25Index.from_vectorstore(vectorstore))
+    return LiveVectorStore(version, vectorstore.embeddings)
+
+
+def test_hybrid_search_finds_exact_identifiers(live):
+    retriever = LiveRetriever(live=live, k=1, mode="hybrid", fetch_k=4)
+
+    documents = retriever.invoke("create_react_agent")
+
+    assert [doc.id for doc in documents] == ["agents"]
+
+
+def test_dense_mode_ignores_the_keyword_index(live):
+    retriever = LiveRetriever(live=live, k=2, mode="dense")
+
+    documents = retriever.invoke("create_react_agent")
+
+    dense = live.vectorstore.similarity_search("create_react_agent", k=2)
+    assert [doc.id for doc in documents] == [doc.id for doc in dense]
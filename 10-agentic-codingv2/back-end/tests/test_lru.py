@@ -0,0 +1,84 @@
+"""Tests for the TTL/LRU cache."""
+
+import pytest
+
+import cache.lru
+from cache.lru import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache.lru.time, "monotonic", clock)
+    return clock
+
+
+def test_evicts_least_recently_used():
+    lru = TTLCache(2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+
+    assert "b" not in lru
+    assert lru.get("a") == 1 and lru.get("c") == 3
+    assert lru.stats()["evictions"] == 1
+
+
+def test_peek_does_not_refresh_recency():
+    lru = TTLCache(2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.peek("a") == 1
+    lru.set("c", 3)
+
+    assert "a" not in lru
+
+
+def test_entries_expire_after_ttl(clock):
+    lru = TTLCache(10, ttl=5)
+    lru.set("a", 1)
+    lru.set("b", 2, ttl=60)
+    clock.now += 10
+
+    assert lru.get("a") is None
+    assert lru.get("b") == 2
+    assert lru.stats()["expirations"] == 1
+
+
+def test_non_positive_ttl_never_expires(clock):
+    lru = TTLCache(10, ttl=0)
+    lru.set("a", 1)
+    clock.now += 10 ** 6
+
+    assert lru.get("a") == 1
+
+
+def test_on_evict_sees_every_removal():
+    removed = []
+    lru = TTLCache(1, on_evict=lambda key, value: removed.append((key, value)))
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.delete("b")
+    lru.set("c", 3)
+    lru.clear()
+
+    assert removed == [("a", 1), ("b", 2), ("c", 3)]
+
+
+def test_hit_and_miss_counters():
+    lru = TTLCache(10)
+    lru.set("a", 1)
+    lru.get("a")
+    lru.get("missing")
+
+    stats = lru.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
@@ -0,0 +1,142 @@
+"""Tests for conversation history compaction and the bounded checkpointer."""
+
+import asyncio
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.base import empty_checkpoint
+
+from agents.memory import SUMMARY_PREFIX, BoundedMemorySaver, create_history_compactor, trim_history
+
+
+def turn(n: int, words: int = 40) -> list:
+    """One question answered after a tool call."""
+    filler = " ".join(["word"] * words)
+    call = {"name": "search", "args": {"query": f"q{n}"}, "id": f"call-{n}"}
+    return [
+        HumanMessage(content=f"Question {n}: {filler}"),
+        AIMessage(content="", tool_calls=[call]),
+        ToolMessage(content=f"Result {n}: {filler}", tool_call_id=f"call-{n}"),
+        AIMessage(content=f"Answer {n}: {filler}")
+    ]
+
+
+def conversation(turns: int) -> list:
+    messages = [message for n in range(turns) for message in turn(n)]
+    return messages + [HumanMessage(content="Current question")]
+
+
+def test_history_within_budget_is_unchanged():
+    messages = conversation(2)
+    assert trim_history(messages, 10_000) is messages
+
+
+def test_trimming_keeps_the_newest_whole_turns():
+    messages = conversation(4)
+    budget = count_tokens_approximately(messages[-9:]) + 5
+
+    kept = trim_history(messages, budget)
+
+    assert kept == messages[-9:]
+    assert isinstance(kept[0], HumanMessage) and kept[0].content.startswith("Question 2")
+
+
+def test_trimming_always_keeps_the_current_turn():
+    messages = conversation(3)
+    assert trim_history(messages, 1) == messages[-1:]
+
+
+def test_trimming_keeps_a_leading_summary_that_fits():
+    summary = SystemMessage(content=SUMMARY_PREFIX + "Earlier talk.")
+    messages = [summary] + conversation(3)
+    budget = count_tokens_approximately([summary] + messages[-5:]) + 5
+
+    kept = trim_history(messages, budget)
+
+    assert kept == [summary] + messages[-5:]
+
+
+def test_compactor_passes_short_history_through():
+    messages = conversation(1)
+    hook = create_history_compactor(10_000, "trim")
+
+    assert hook.invoke({"messages": messages}) == {"llm_input_messages": messages}
+
+
+def test_trim_compactor_leaves_the_stored_thread_alone():
+    messages = conversation(4)
+    hook = create_history_compactor(count_tokens_approximately(messages[-5:]) + 5, "trim")
+
+    result = hook.invoke({"messages": messages})
+
+    assert "messages" not in result
+    assert result["llm_input_messages"] == messages[-5:]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_summarize_replaces_earlier_turns_with_a_summary(use_async):
+    messages = conversation(4)
+    hook = create_history_compactor(100, "summarize", FakeListChatModel(responses=["They asked four questions."]))
+
+    state = {"messages": messages}
+    result = asyncio.run(hook.ainvoke(state)) if use_async else hook.invoke(state)
+
+    summary, current = result["llm_input_messages"]
+    assert summary.content == SUMMARY_PREFIX + "They asked four questions."
+    assert current is messages[-1]
+    assert isinstance(result["messages"][0], RemoveMessage)
+    assert result["messages"][1:] == result["llm_input_messages"]
+
+
+def test_failed_summary_falls_back_to_trimming():
+    def fail(prompt):
+        raise RuntimeError("model unavailable")
+
+    messages = conversation(4)
+    budget = count_tokens_approximately(messages[-5:]) + 5
+    hook = create_history_compactor(budget, "summarize", RunnableLambda(fail))
+
+    result = hook.invoke({"messages": messages})
+
+    assert "messages" not in result
+    assert result["llm_input_messages"] == messages[-5:]
+
+
+def test_invalid_compactor_settings_are_rejected():
+    with pytest.raises(ValueError, match="Unknown history compaction"):
+        create_history_compactor(100, "forget")
+    with pytest.raises(ValueError, match="requires an llm"):
+        create_history_compactor(100, "summarize")
+
+
+def save(saver: BoundedMemorySaver, thread_id: str) -> None:
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    saver.put(config, empty_checkpoint(), {}, {})
+
+
+def stored(saver: BoundedMemorySaver, thread_id: str) -> bool:
+    return saver.get_tuple({"configurable": {"thread_id": thread_id}}) is not None
+
+
+def test_saver_deletes_the_least_recently_used_thread():
+    saver = BoundedMemorySaver(2)
+    save(saver, "a")
+    save(saver, "b")
+    assert stored(saver, "a")
+    save(saver, "c")
+
+    assert stored(saver, "a") and stored(saver, "c")
+    assert not stored(saver, "b")
+    assert saver.evictions == 1
+
+
+def test_saver_keeps_checkpoints_of_a_tracked_thread():
+    saver = BoundedMemorySaver(2)
+    save(saver, "a")
+    save(saver, "a")
+
+    assert len(list(saver.list({"configurable": {"thread_id": "a"}}))) == 2
+    assert saver.evictions == 0
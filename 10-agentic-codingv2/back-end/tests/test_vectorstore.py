@@ -0,0 +1,78 @@
+"""Tests for building, pruning and pinning served index versions."""
+
+import itertools
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+import retrieval.index_store
+import retrieval.vectorstore as vectorstore
+from config.settings import settings
+from retrieval import IndexStore, StaticSource
+
+
+def page(n: int) -> Document:
+    return Document(page_content=f"Page {n} explains feature {n}. " * 20, metadata={"source": f"https://docs.example.com/{n}"})
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    documents = [page(0), page(1)]
+    monkeypatch.setattr(vectorstore, "create_page_source", lambda: StaticSource(list(documents)))
+    return documents
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(retrieval.index_store.time, "time", lambda: float(next(ticks)))
+    monkeypatch.setattr(settings, "INDEX_KEEP_VERSIONS", 1)
+    monkeypatch.setattr(settings, "INDEX_VERSION", "")
+    return IndexStore(str(tmp_path / "index"))
+
+
+@pytest.fixture
+def embeddings():
+    return DeterministicFakeEmbedding(size=16)
+
+
+def test_unchanged_pages_reuse_the_stored_version(store, embeddings, pages):
+    first = vectorstore.build_index(store, embeddings)
+    assert vectorstore.build_index(store, embeddings) == first
+
+    pages.append(page(2))
+    assert vectorstore.build_index(store, embeddings) != first
+
+
+def test_refresh_never_prunes_a_protected_version(store, embeddings, pages):
+    pinned = vectorstore.build_index(store, embeddings)
+    for n in (2, 3):
+        pages.append(page(n))
+        latest = vectorstore.build_index(store, embeddings, protect=[pinned])
+
+    assert store.exists(pinned) and store.exists(latest)
+    assert len(store.manifests()) == 2
+
+
+def test_missing_pinned_version_falls_back_to_newest_match(store, embeddings, pages, monkeypatch):
+    pinned = vectorstore.build_index(store, embeddings)
+    pages.append(page(2))
+    latest = vectorstore.build_index(store, embeddings)
+    assert not store.exists(pinned)
+
+    monkeypatch.setattr(settings, "INDEX_VERSION", pinned)
+    assert vectorstore._current_index_key(store, embeddings) == latest
+
+
+def test_pinned_version_is_served_while_stored(store, embeddings, pages, monkeypatch):
+    pinned = vectorstore.build_index(store, embeddings)
+    monkeypatch.setattr(settings, "INDEX_VERSION", pinned)
+    assert vectorstore._current_index_key(store, embeddings) == pinned
+
+
+
+def test_missing_pinned_version_without_a_match_raises(tmp_path, embeddings, monkeypatch):
+    monkeypatch.setattr(settings, "INDEX_VERSION", "missing")
+    with pytest.raises(RuntimeError, match="not stored"):
+        vectorstore._current_index_key(IndexStore(str(tmp_path / "empty")), embeddings)
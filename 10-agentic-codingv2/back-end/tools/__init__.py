@@ -2,10 +2,14 @@ from .google_search import create_google_search_tool
 from .wikipedia import create_wikipedia_tool
 from .arxiv import create_arxiv_tool
 from .retriever import create_retriever_tool
+from .registry import ToolRegistry, create_tool_registry, tool_timeouts
 
 __all__ = [
     'create_google_search_tool',
     'create_wikipedia_tool',
     'create_arxiv_tool',
-    'create_retriever_tool'
+    'create_retriever_tool',
+    'ToolRegistry',
+    'create_tool_registry',
+    'tool_timeouts'
 ]
@@ -0,0 +1,35 @@
+"""Bounded thread pool for sync-only tools."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from config.settings import settings
+
+
+def install_tool_executor(
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+    max_workers: Optional[int] = None
+) -> ThreadPoolExecutor:
+    """
+    Install a bounded thread pool as the event loop's default executor.
+
+    Sync-only tools (Wikipedia, ArXiv, FAISS search) are offloaded by
+    LangChain to the loop's default executor when the agent runs
+    asynchronously, so bounding that executor bounds the number of
+    blocking tool calls in flight without ever blocking the event loop.
+
+    Args:
+        loop: Event loop to configure (defaults to the running loop)
+        max_workers: Pool size (defaults to TOOL_THREAD_POOL_SIZE)
+
+    Returns:
+        The installed executor; shut it down on application exit
+    """
+    loop = loop or asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers or settings.TOOL_THREAD_POOL_SIZE,
+        thread_name_prefix="tool-worker"
+    )
+    loop.set_default_executor(executor)
+    return executor
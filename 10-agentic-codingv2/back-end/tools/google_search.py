@@ -1,30 +1,45 @@
 """Google Search tool using Serper API."""
 
-from langchain_core.tools import tool
-from langchain_community.utilities import GoogleSerperAPIWrapper
+from langchain_core.tools import StructuredTool
+from .serper_client import get_serper_client
 
 
-@tool("GoogleSearch")
 def google_search(query_string: str) -> str:
     """
     Search the internet for information using Google Search.
-    
+
     Useful to search for any kinds of information and
     when you need to search the internet for any kinds of information, use this tool.
     Prefer this tool when you search for long queries.
     Should not be used for Article search or Topic Search.
     You should use this only when you need to get real-time information about a topic.
-    
+
     Args:
         query_string: The search query string
-        
+
     Returns:
         Search results as a string
     """
-    search = GoogleSerperAPIWrapper()
-    return search.run(query_string)
+    return get_serper_client().run(query_string)
+
+
+async def agoogle_search(query_string: str) -> str:
+    """Async variant of ``google_search`` that does not block the event loop."""
+    return await get_serper_client().arun(query_string)
 
 
 def create_google_search_tool():
-    """Create and return the Google Search tool."""
-    return google_search
+    """
+    Create and return the Google Search tool.
+
+    The tool supports both sync and native async invocation; all calls
+    share the worker's pooled Serper client.
+
+    Returns:
+        StructuredTool named GoogleSearch
+    """
+    return StructuredTool.from_function(
+        func=google_search,
+        coroutine=agoogle_search,
+        name="GoogleSearch"
+    )
@@ -0,0 +1,144 @@
+"""Registry that builds each agent tool once and shares it."""
+
+import logging
+from typing import Callable, Dict, List, Optional, Sequence
+
+from langchain_core.tools import BaseTool
+from cache import SQLiteResultStore, ToolResultCache, cached_tool
+from config.settings import settings
+from .arxiv import create_arxiv_tool
+from .google_search import create_google_search_tool
+from .retriever import create_retriever_tool
+from .wikipedia import create_wikipedia_tool
+
+logger = logging.getLogger(__name__)
+
+# Tool factories in the order the tools are handed to the agent
+DEFAULT_TOOL_FACTORIES: Sequence[Callable[[], BaseTool]] = (
+    create_arxiv_tool,
+    create_google_search_tool,
+    create_wikipedia_tool,
+    create_retriever_tool
+)
+
+
+class ToolRegistry:
+    """
+    Container for the agent's tool instances.
+
+    Every factory is called exactly once, so expensive tools such as the
+    retriever (and its vector index) exist once per process and are shared
+    by the agent and the API.
+    """
+
+    def __init__(self, tools: Sequence[BaseTool], tool_cache: Optional[ToolResultCache] = None):
+        self.tool_cache = tool_cache
+        self._tools: Dict[str, BaseTool] = {}
+        for tool in tools:
+            if tool.name in self._tools:
+                raise ValueError(f"Duplicate tool name: {tool.name}")
+            self._tools[tool.name] = tool
+
+    @property
+    def tools(self) -> List[BaseTool]:
+        """All registered tools, in registration order."""
+        return list(self._tools.values())
+
+    @property
+    def names(self) -> List[str]:
+        """Names of all registered tools."""
+        return list(self._tools.keys())
+
+    def get(self, name: str) -> BaseTool:
+        """
+        Look up a tool by name.
+
+        Raises:
+            KeyError: If no tool with that name is registered
+        """
+        return self._tools[name]
+
+    def describe(self) -> List[Dict[str, str]]:
+        """
+        Describe the registered tools.
+
+        The summary is the first paragraph of each tool's description,
+        i.e. the same text the model sees, without argument documentation.
+
+        Returns:
+            List of dictionaries with ``name`` and ``description`` keys
+        """
+        return [
+            {"name": tool.name, "description": _summarize(tool.description)}
+            for tool in self._tools.values()
+        ]
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools
+
+
+def _summarize(description: str) -> str:
+    """Return the first paragraph of a tool description on a single line."""
+    first_paragraph = description.strip().split("\n\n")[0]
+    return " ".join(first_paragraph.split())
+
+
+def tool_cache_ttls() -> Dict[str, int]:
+    """Return the result cache TTL (seconds) of each cacheable tool by name."""
+    return {
+        "GoogleSearch": settings.TOOL_CACHE_TTL_GOOGLE,
+        "WikipediaSearch": settings.TOOL_CACHE_TTL_WIKIPEDIA,
+        "arxiv": settings.TOOL_CACHE_TTL_ARXIV
+    }
+
+
+def tool_timeouts() -> Dict[str, float]:
+    """Return the execution timeout (seconds) of each tool by name."""
+    return {
+        "GoogleSearch": settings.TOOL_TIMEOUT_GOOGLE,
+        "WikipediaSearch": settings.TOOL_TIMEOUT_WIKIPEDIA,
+        "arxiv": settings.TOOL_TIMEOUT_ARXIV,
+        "langsmith_search": settings.TOOL_TIMEOUT_RETRIEVER
+    }
+
+
+def create_tool_cache() -> ToolResultCache:
+    """Create the tool result cache configured in settings."""
+    store = None
+    if settings.TOOL_CACHE_SQLITE_PATH:
+        store = SQLiteResultStore(settings.TOOL_CACHE_SQLITE_PATH)
+    return ToolResultCache(settings.TOOL_CACHE_MAX_ENTRIES, store=store)
+
+
+def create_tool_registry(
+    factories: Optional[Sequence[Callable[[], BaseTool]]] = None
+) -> ToolRegistry:
+    """
+    Build all agent tools once and return them in a registry.
+
+    When TOOL_CACHE_ENABLED is set, tools with a configured TTL are wrapped
+    so their results are served from a shared tool result cache.
+
+    Args:
+        factories: Tool factories to call; defaults to ``DEFAULT_TOOL_FACTORIES``
+
+    Returns:
+        ToolRegistry holding the created tools
+    """
+    tool_cache = create_tool_cache() if settings.TOOL_CACHE_ENABLED else None
+    ttls = tool_cache_ttls()
+
+    tools = []
+    for factory in factories or DEFAULT_TOOL_FACTORIES:
+        tool = factory()
+        ttl = ttls.get(tool.name, 0)
+        if tool_cache is not None and ttl > 0:
+            tool = cached_tool(tool, tool_cache, ttl)
+            logger.info(f"Created tool {tool.name} (results cached for {ttl}s)")
+        else:
+            logger.info(f"Created tool {tool.name}")
+        tools.append(tool)
+    return ToolRegistry(tools, tool_cache=tool_cache)
@@ -1,42 +1,40 @@
 """Document retriever tool for LangSmith documentation."""
 
-from langchain_community.document_loaders import WebBaseLoader
-from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.tools import create_retriever_tool as create_langchain_retriever_tool
 from config.settings import settings
+from retrieval import LiveRetriever, get_live_vectorstore
 
 
 def create_retriever_tool():
     """
     Create and return the document retriever tool for LangSmith documentation.
-    
-    This tool loads documents from the LangSmith documentation website,
-    splits them into chunks, creates a vector database, and returns a retriever tool.
-    
+
+    The vector database is loaded from the on-disk index store and is only
+    crawled and embedded when no index exists for the current configuration
+    (see ``build_index.py`` to prebuild it). Searches go through the
+    process's live index, so refreshed index versions are picked up without
+    recreating the tool. In the default hybrid mode, vector matches are fused
+    with BM25 keyword matches so exact API names and error strings are found.
+
     Returns:
         Retriever tool for searching LangSmith documentation
     """
-    # Load documents from LangSmith documentation
-    loader = WebBaseLoader(settings.LANGSMITH_DOCS_URL)
-    docs = loader.load()
-    
-    # Split documents into chunks
-    documents = RecursiveCharacterTextSplitter(
-        chunk_size=settings.CHUNK_SIZE,
-        chunk_overlap=settings.CHUNK_OVERLAP
-    ).split_documents(docs)
-    
-    # Create vector database
-    vectordatabase = FAISS.from_documents(documents, OpenAIEmbeddings())
-    retriever = vectordatabase.as_retriever()
-    
+    # Load (or build) the vector database; the retriever follows index swaps
+    retriever = LiveRetriever(
+        live=get_live_vectorstore(),
+        k=settings.RETRIEVER_K,
+        score_threshold=settings.RETRIEVER_SCORE_THRESHOLD or None,
+        mode=settings.RETRIEVER_MODE,
+        fetch_k=settings.RETRIEVER_FETCH_K,
+        rrf_k=settings.RETRIEVER_RRF_K,
+        dedupe=settings.RETRIEVER_DEDUPE
+    )
+
     # Create retriever tool
     retriever_tool = create_langchain_retriever_tool(
         retriever,
         "langsmith_search",
         "search for information about langsmith. for any questions related to langsmith, you must use this tool"
     )
-    
+
     return retriever_tool
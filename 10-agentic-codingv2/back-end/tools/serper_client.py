@@ -0,0 +1,269 @@
+"""Pooled HTTP client for the Serper Google Search API."""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+
+import httpx
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def parse_serper_results(results: Dict[str, Any], k: int) -> str:
+    """
+    Render Serper search results as text for the agent.
+
+    Mirrors ``GoogleSerperAPIWrapper.run`` so the model sees the same output:
+    a direct answer box wins, otherwise knowledge graph facts and organic
+    result snippets are joined.
+
+    Args:
+        results: Decoded JSON response of the search endpoint
+        k: Maximum number of organic results to include
+
+    Returns:
+        Search results as a single string
+    """
+    answer_box = results.get("answerBox") or {}
+    if answer_box.get("answer"):
+        return answer_box["answer"]
+    if answer_box.get("snippet"):
+        return answer_box["snippet"].replace("\n", " ")
+    if answer_box.get("snippetHighlighted"):
+        return " ".join(answer_box["snippetHighlighted"])
+
+    snippets: List[str] = []
+    kg = results.get("knowledgeGraph") or {}
+    if kg:
+        title = kg.get("title")
+        if kg.get("type"):
+            snippets.append(f"{title}: {kg['type']}.")
+        if kg.get("description"):
+            snippets.append(kg["description"])
+        for attribute, value in kg.get("attributes", {}).items():
+            snippets.append(f"{title} {attribute}: {value}.")
+
+    for result in results.get("organic", [])[:k]:
+        if "snippet" in result:
+            snippets.append(result["snippet"])
+        for attribute, value in result.get("attributes", {}).items():
+            snippets.append(f"{attribute}: {value}.")
+
+    if not snippets:
+        return "No good Google Search Result was found"
+    return " ".join(snippets)
+
+
+class SerperClient:
+    """
+    Long-lived Serper client with keep-alive connection pooling.
+
+    One client is shared by all search calls in a worker, so connections
+    and TLS sessions are reused instead of being set up per call. Transient
+    failures (timeouts, connection errors, 429 and 5xx responses) are
+    retried with exponential backoff and full jitter, honouring
+    ``Retry-After`` when the server sends it.
+
+    Async connection pools are bound to the event loop that created them,
+    so async calls get one pool per event loop; a pool goes away with its
+    loop, and ``aclose`` closes all of them.
+
+    Point ``base_url`` at a local stub (see ``tools/serper_stub.py``) to
+    test without network access; the key is then never checked.
+
+    Args:
+        api_key: Serper API key (required)
+        base_url: Base URL of the Serper API
+        timeout: Total timeout per attempt in seconds
+        connect_timeout: Connection timeout per attempt in seconds
+        max_connections: Maximum open connections in the pool
+        max_keepalive: Maximum idle keep-alive connections
+        max_retries: Retries after the first attempt
+        backoff: Base backoff delay in seconds
+        k: Number of results requested
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        timeout: float = 10.0,
+        connect_timeout: float = 3.0,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        max_retries: int = 2,
+        backoff: float = 0.25,
+        k: int = 10,
+        gl: str = "us",
+        hl: str = "en"
+    ):
+        if not api_key:
+            raise ValueError("SERPER_API_KEY is required for Google Search")
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.k = k
+        self.gl = gl
+        self.hl = hl
+        self._headers = {"X-API-KEY": api_key, "Content-Type": "application/json"}
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive
+        )
+        self._client: Optional[httpx.Client] = None
+        self._aclients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    base_url=self.base_url,
+                    headers=self._headers,
+                    timeout=self._timeout,
+                    limits=self._limits
+                )
+            return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._aclients.get(loop)
+            if client is None:
+                client = self._aclients[loop] = httpx.AsyncClient(
+                    base_url=self.base_url,
+                    headers=self._headers,
+                    timeout=self._timeout,
+                    limits=self._limits
+                )
+            return client
+
+    def _payload(self, query: str) -> Dict[str, Any]:
+        return {"q": query, "gl": self.gl, "hl": self.hl, "num": self.k}
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), 30.0)
+                except ValueError:
+                    pass
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+    @staticmethod
+    def _should_retry(error: Exception) -> bool:
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in RETRYABLE_STATUS_CODES
+        return isinstance(error, httpx.TransportError)
+
+    def search(self, query: str) -> Dict[str, Any]:
+        """
+        Run a search and return the decoded JSON response.
+
+        Raises:
+            httpx.HTTPError: If the request still fails after all retries
+        """
+        client = self._sync_client()
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = client.post("/search", json=self._payload(query))
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPError as e:
+                if attempt >= self.max_retries or not self._should_retry(e):
+                    raise
+                delay = self._retry_delay(attempt, response)
+                logger.warning(f"Serper request failed ({e!r}); retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+    async def asearch(self, query: str) -> Dict[str, Any]:
+        """
+        Async variant of ``search``.
+
+        Raises:
+            httpx.HTTPError: If the request still fails after all retries
+        """
+        client = self._async_client()
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = await client.post("/search", json=self._payload(query))
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPError as e:
+                if attempt >= self.max_retries or not self._should_retry(e):
+                    raise
+                delay = self._retry_delay(attempt, response)
+                logger.warning(f"Serper request failed ({e!r}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    def run(self, query: str) -> str:
+        """Search and render the results as text."""
+        return parse_serper_results(self.search(query), self.k)
+
+    async def arun(self, query: str) -> str:
+        """Search asynchronously and render the results as text."""
+        return parse_serper_results(await self.asearch(query), self.k)
+
+    async def aclose(self) -> None:
+        """Close pooled connections, each async pool on the event loop that owns it."""
+        current = asyncio.get_running_loop()
+        with self._lock:
+            aclients = list(self._aclients.items())
+            self._aclients.clear()
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+        for loop, client in aclients:
+            if loop is current:
+                await client.aclose()
+            elif not loop.is_closed():
+                try:
+                    asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+                except RuntimeError:
+                    # The loop closed meanwhile, taking its connections with it
+                    pass
+
+
+_client: Optional[SerperClient] = None
+_client_lock = threading.Lock()
+
+
+def get_serper_client() -> SerperClient:
+    """Return the worker-wide Serper client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = SerperClient(
+                api_key=settings.SERPER_API_KEY,
+                base_url=settings.SERPER_BASE_URL,
+                timeout=settings.SERPER_TIMEOUT,
+                connect_timeout=settings.SERPER_CONNECT_TIMEOUT,
+                max_connections=settings.SERPER_MAX_CONNECTIONS,
+                max_keepalive=settings.SERPER_MAX_KEEPALIVE,
+                max_retries=settings.SERPER_MAX_RETRIES,
+                backoff=settings.SERPER_RETRY_BACKOFF
+            )
+        return _client
+
+
+async def close_serper_client() -> None:
+    """Close the worker-wide Serper client, if it was created."""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,66 @@
+"""
+Local stand-in for the Serper API.
+
+Serves deterministic search results so the Google Search tool can be
+exercised without network access or an API key:
+
+    python -m tools.serper_stub --port 9191 --latency 0.2
+    SERPER_BASE_URL=http://localhost:9191 uvicorn app:app
+"""
+
+import argparse
+import asyncio
+
+from fastapi import FastAPI, Request
+
+
+def create_stub_app(latency: float = 0.0) -> FastAPI:
+    """
+    Create the stub Serper application.
+
+    Args:
+        latency: Artificial delay added to every response, in seconds
+
+    Returns:
+        FastAPI app implementing ``POST /search``
+    """
+    app = FastAPI(title="Serper stub")
+
+    @app.post("/search")
+    async def search(request: Request):
+        payload = await request.json()
+        query = payload.get("q", "")
+        num = int(payload.get("num", 10))
+        if latency > 0:
+            await asyncio.sleep(latency)
+        return {
+            "searchParameters": payload,
+            "organic": [
+                {
+                    "title": f"Result {i + 1} for {query}",
+                    "link": f"https://example.com/{i + 1}",
+                    "snippet": f"Stub search result {i + 1} about {query}.",
+                    "position": i + 1
+                }
+                for i in range(num)
+            ]
+        }
+
+    return app
+
+
+def main():
+    """Run the stub server."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local Serper API stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9191)
+    parser.add_argument("--latency", type=float, default=0.0, help="Artificial latency in seconds")
+    args = parser.parse_args()
+
+    uvicorn.run(create_stub_app(args.latency), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()